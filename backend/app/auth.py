@@ -1,31 +1,31 @@
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta, timezone
-import os
 from typing import Optional, Dict, Any
 
 from jose import jwt, JWTError
-from pydantic_settings import BaseSettings, SettingsConfigDict  
 from fastapi import Depends, HTTPException, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from app.database import get_db
+from starlette.concurrency import run_in_threadpool
+from app.cache import cache_get_json, cache_set_json, user_cache_key
+from app.config import settings
+from app.database import get_db, get_request_db, run_db
 from app.models.user import User    
 
-class Settings(BaseSettings):
-    SECRET_KEY: str = os.getenv("SECRET_KEY")
-    ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
-    UNSPLASH_ACCESS_KEY: str = ""
-
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        case_sensitive=True,
-        extra="ignore",
-    )
-
-settings = Settings()
 security = HTTPBearer()
 security_optional = HTTPBearer(auto_error=False)
 
+
+@dataclass(frozen=True)
+class AuthUser:
+    """Yetkilendirme için gereken, önbelleklenebilir kullanıcı bilgisi"""
+    id: int
+    username: str
+    role: str
+    is_approved: bool
+    is_banned: bool
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -36,45 +36,112 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
 def decode_access_token(token: str) -> Dict[str, Any]:
     return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Security(security),
-    db: Session = Depends(get_db)
-) -> User:
-    token = credentials.credentials
-
-
+def _user_id_from_token(token: str) -> int:
     try:
         payload = decode_access_token(token)
-        sub = payload.get("sub")
-        if not sub:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        user = db.get(User, int(sub))
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        if user.is_banned:
-            raise HTTPException(status_code=403, detail="User is banned")
-        if not user.is_approved:
-            raise HTTPException(status_code=403, detail="Account pending approval")
-        return user
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    sub = payload.get("sub")
+    if not sub:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return int(sub)
+
+def _check_user_status(user) -> None:
+    if user.is_banned:
+        raise HTTPException(status_code=403, detail="User is banned")
+    if not user.is_approved:
+        raise HTTPException(status_code=403, detail="Account pending approval")
+
+def _cached_auth_user(user_id: int) -> Optional[AuthUser]:
+    cached = cache_get_json(user_cache_key(user_id))
+    return AuthUser(**cached) if cached else None
+
+def _load_auth_user(db: Session, user_id: int) -> AuthUser:
+    """Kullanıcıyı veritabanından oku ve kısa süreliğine önbelleğe al"""
+    row = (
+        db.query(User.id, User.username, User.role, User.is_approved, User.is_banned)
+        .filter(User.id == user_id)
+        .first()
+    )
+    if not row:
+        raise HTTPException(status_code=401, detail="User not found")
+    user = AuthUser(**row._asdict())
+    cache_set_json(user_cache_key(user_id), asdict(user), settings.USER_CACHE_TTL)
+    return user
+
+def auth_user_from_token(db: Session, token: str) -> AuthUser:
+    """Token'ın sahibini (önbellekten ya da veritabanından) doğrula"""
+    user_id = _user_id_from_token(token)
+    user = _cached_auth_user(user_id) or _load_auth_user(db, user_id)
+    _check_user_status(user)
+    return user
+
+def ensure_admin(current_user: AuthUser) -> None:
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can perform this action")
+
+def _user_from_token(db: Session, token: str) -> User:
+    user = db.get(User, _user_id_from_token(token))
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    _check_user_status(user)
+    return user
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Security(security),
+    db: Session = Depends(get_db)
+) -> AuthUser:
+    return auth_user_from_token(db, credentials.credentials)
 
 def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Security(security_optional),
     db: Session = Depends(get_db)
-) -> Optional[User]:
+) -> Optional[AuthUser]:
     """Token varsa user döner, yoksa None döner (hata fırlatmaz)"""
     if not credentials:
         return None
     
     try:
-        payload = decode_access_token(credentials.credentials)
-        sub = payload.get("sub")
-        if not sub:
-            return None
-        user = db.get(User, int(sub))
-        if not user or user.is_banned or not user.is_approved:
-            return None
-        return user
-    except JWTError:
+        return get_current_user(credentials, db)
+    except HTTPException:
         return None
+
+def get_current_user_record(
+    credentials: HTTPAuthorizationCredentials = Security(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """Tüm kolonları gereken ya da kullanıcıyı güncelleyen route'lar için ORM nesnesi"""
+    return _user_from_token(db, credentials.credentials)
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Security(security),
+    db=Depends(get_request_db)
+) -> AuthUser:
+    """get_current_user'ın async route'lar için olan karşılığı"""
+    user_id = _user_id_from_token(credentials.credentials)
+    # Senkron Redis çağrısı event loop'u bloklamasın
+    user = await run_in_threadpool(_cached_auth_user, user_id) or await run_db(db, _load_auth_user, user_id)
+    _check_user_status(user)
+    return user
+
+
+async def get_current_user_optional_async(
+    credentials: Optional[HTTPAuthorizationCredentials] = Security(security_optional),
+    db=Depends(get_request_db)
+) -> Optional[AuthUser]:
+    """get_current_user_optional'ın async route'lar için olan karşılığı"""
+    if not credentials:
+        return None
+    try:
+        return await get_current_user_async(credentials, db)
+    except HTTPException:
+        return None
+
+
+async def get_current_user_record_async(
+    credentials: HTTPAuthorizationCredentials = Security(security),
+    db=Depends(get_request_db)
+) -> User:
+    """get_current_user_record'ın async route'lar için olan karşılığı"""
+    return await run_db(db, _user_from_token, credentials.credentials)
@@ -0,0 +1,58 @@
+"""blog_posts üzerindeki denormalize alanları (author_username, comment_count) doldur/onar.
+
+Kullanım: python -m app.backfill
+"""
+import logging
+
+from sqlalchemy import func, select, update
+
+from app.cache import invalidate_post_cache
+from app.database import SessionLocal
+from app.models.blog import BlogComment, BlogPost
+from app.models.user import User
+
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_post_counters() -> int:
+    """Kaynak tablolardan hesaplanan değerle uyuşmayan yazıları düzelt; düzeltilen yazı sayısını döndür"""
+    comment_count = (
+        select(func.count(BlogComment.id))
+        .where(BlogComment.post_id == BlogPost.id)
+        .scalar_subquery()
+    )
+    author_username = select(User.username).where(User.id == BlogPost.author_id).scalar_subquery()
+
+    db = SessionLocal()
+    try:
+        stale = db.execute(
+            select(BlogPost.id, BlogPost.slug).where(
+                (BlogPost.comment_count != comment_count)
+                | BlogPost.author_username.is_distinct_from(author_username)
+            )
+        ).all()
+        if not stale:
+            return 0
+        db.execute(
+            update(BlogPost)
+            .where(BlogPost.id.in_([post_id for post_id, _ in stale]))
+            .values(
+                comment_count=comment_count,
+                author_username=author_username,
+                # Onarım içerik güncellemesi sayılmaz
+                updated_at=BlogPost.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    invalidate_post_cache(*(slug for _, slug in stale))
+    return len(stale)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    logger.info("Repaired %d blog posts", backfill_post_counters())
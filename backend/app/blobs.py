@@ -0,0 +1,207 @@
+import asyncio
+import contextlib
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterator, Iterator, List, Optional, Set
+
+from sqlalchemy import delete, exists, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.cache import redis_client
+from app.config import settings
+from app.database import SessionLocal
+from app.images import VARIANTS, build_manifest
+from app.jobs import enqueue
+from app.models.blob import StoredBlob
+from app.models.blog import BlogPost
+from app.storage import get_storage
+
+
+logger = logging.getLogger(__name__)
+
+# Yüklemelerin işlenene kadar bekletildiği yerel dizin
+STAGING_DIR = Path("static/uploads/.staging")
+LOCK_PREFIX = "blob:lock:"
+_LOCK_POLL_SECONDS = 0.05
+
+
+class BlobLockTimeout(Exception):
+    pass
+
+
+def blob_prefix(sha256: str) -> str:
+    # Tek dizinde çok fazla dosya birikmesin diye ilk iki karaktere göre böl
+    return f"blobs/{sha256[:2]}"
+
+
+def blob_key(sha256: str, ext: str) -> str:
+    return f"{blob_prefix(sha256)}/{sha256}{ext}"
+
+
+def variant_key(sha256: str, variant: str) -> str:
+    return f"{blob_prefix(sha256)}/{sha256}-{variant}.webp"
+
+
+def blob_keys(blob: StoredBlob) -> List[str]:
+    """Blob'a ait depodaki tüm nesneler"""
+    if blob.kind == "image":
+        return [variant_key(blob.sha256, name) for name in VARIANTS]
+    return [blob_key(blob.sha256, blob.ext)]
+
+
+def blob_manifest(blob: StoredBlob) -> dict:
+    """Upload yanıtlarında dönen URL ve (görseller için) srcset bilgisi"""
+    storage = get_storage()
+    if blob.kind != "image":
+        return {
+            "blob_id": blob.id,
+            "url": storage.url(blob_key(blob.sha256, blob.ext)),
+            "size": blob.size,
+            "sha256": blob.sha256,
+        }
+
+    urls, srcset = build_manifest(blob.meta, storage.url(blob_prefix(blob.sha256)))
+    return {
+        "blob_id": blob.id,
+        "url": urls["full"],
+        "size": blob.size,
+        "sha256": blob.sha256,
+        "width": blob.meta["width"],
+        "height": blob.meta["height"],
+        "variants": {
+            name: {**info, "url": urls[name]}
+            for name, info in blob.meta["variants"].items()
+        },
+        "srcset": srcset,
+        "placeholder": blob.meta["placeholder"],
+    }
+
+
+def touch_blob(db: Session, sha256: str) -> Optional[StoredBlob]:
+    """Aynı içerik daha önce yüklendiyse kaydı döndür ve GC'den koru"""
+    blob = db.query(StoredBlob).filter(StoredBlob.sha256 == sha256).first()
+    if blob:
+        blob.last_uploaded_at = datetime.utcnow()
+        db.commit()
+        db.refresh(blob)
+    return blob
+
+
+def create_blob(db: Session, **fields) -> StoredBlob:
+    blob = StoredBlob(**fields)
+    db.add(blob)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Aynı içerik eşzamanlı olarak yüklendi; dosyalar aynı olduğundan mevcut kaydı kullan
+        db.rollback()
+        return touch_blob(db, fields["sha256"])
+    db.refresh(blob)
+    return blob
+
+
+def _try_lock(sha256: str, token: str) -> bool:
+    return bool(redis_client.set(LOCK_PREFIX + sha256, token, nx=True, ex=settings.BLOB_LOCK_TTL))
+
+
+def _unlock(sha256: str, token: str) -> None:
+    if redis_client.get(LOCK_PREFIX + sha256) == token:
+        redis_client.delete(LOCK_PREFIX + sha256)
+
+
+@contextlib.contextmanager
+def blob_lock(sha256: str) -> Iterator[None]:
+    """Aynı içeriğin depoya yazılmasını ve depodan silinmesini sıralar.
+
+    delete_blob_objects kayıt yok kontrolü ile silme arasında, yükleme ise
+    touch_blob ile create_blob arasında bu kilidi tutar; böylece silme işi
+    yeniden yüklenen nesneleri silemez.
+    """
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + settings.BLOB_LOCK_WAIT
+    while not _try_lock(sha256, token):
+        if time.monotonic() > deadline:
+            raise BlobLockTimeout(sha256)
+        time.sleep(_LOCK_POLL_SECONDS)
+    try:
+        yield
+    finally:
+        _unlock(sha256, token)
+
+
+@contextlib.asynccontextmanager
+async def blob_lock_async(sha256: str) -> AsyncIterator[None]:
+    """blob_lock'un async route'lar için olan karşılığı (Redis çağrıları threadpool'da)"""
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + settings.BLOB_LOCK_WAIT
+    while not await run_in_threadpool(_try_lock, sha256, token):
+        if time.monotonic() > deadline:
+            raise BlobLockTimeout(sha256)
+        await asyncio.sleep(_LOCK_POLL_SECONDS)
+    try:
+        yield
+    finally:
+        await run_in_threadpool(_unlock, sha256, token)
+
+
+def _linked_from_posts(db: Session, sha256s: List[str]) -> Set[str]:
+    """Yazılarda geçen özetler; aday başına ayrı tarama yerine tek sorgu"""
+    if not sha256s:
+        return set()
+    # Editörden eklenen görseller yalnızca HTML içinde ya da kapak olarak geçer
+    linked = exists().where(
+        or_(BlogPost.content.contains(StoredBlob.sha256), BlogPost.cover_image.contains(StoredBlob.sha256))
+    )
+    rows = db.execute(select(StoredBlob.sha256).where(StoredBlob.sha256.in_(sha256s), linked))
+    return {sha256 for (sha256,) in rows}
+
+
+def collect_garbage() -> int:
+    """Referanssız ve bekleme süresi dolmuş blob'ları diskten ve tablodan sil"""
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.BLOB_GC_GRACE_SECONDS)
+    removed = 0
+    db = SessionLocal()
+    try:
+        candidates = (
+            db.query(StoredBlob)
+            .filter(StoredBlob.ref_count <= 0, StoredBlob.last_uploaded_at < cutoff)
+            .all()
+        )
+        linked = _linked_from_posts(db, [blob.sha256 for blob in candidates])
+        for blob in candidates:
+            if blob.sha256 in linked:
+                continue
+            keys = blob_keys(blob)
+            # Koşulu silme anında tekrar kontrol et; arada referans alınmış olabilir
+            result = db.execute(
+                delete(StoredBlob).where(
+                    StoredBlob.id == blob.id,
+                    StoredBlob.ref_count <= 0,
+                    StoredBlob.last_uploaded_at < cutoff,
+                )
+            )
+            db.commit()
+            if result.rowcount:
+                # Nesne silme (S3 vb.) hata alırsa kuyrukta tekrar denenir
+                enqueue("delete_blob_objects", sha256=blob.sha256, keys=keys)
+                removed += 1
+    finally:
+        db.close()
+    return removed
+
+
+async def run_blob_gc() -> None:
+    """Arka planda periyodik olarak referanssız blob'ları temizle"""
+    while True:
+        await asyncio.sleep(settings.BLOB_GC_INTERVAL)
+        try:
+            removed = await asyncio.to_thread(collect_garbage)
+            if removed:
+                logger.info("Removed %d unreferenced blobs", removed)
+        except Exception:
+            logger.exception("Blob garbage collection failed")
@@ -0,0 +1,108 @@
+import json
+import logging
+import time
+from datetime import date, datetime
+from typing import Any, Optional
+
+import redis
+
+from app.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def _create_client() -> "redis.Redis":
+    """REDIS_URL'deki Redis'e bağlan; fakeredis yalnızca REDIS_FAKE açıkça verilmişse"""
+    if settings.REDIS_URL:
+        return redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    if not settings.REDIS_FAKE:
+        raise RuntimeError("REDIS_URL is not set; use REDIS_FAKE=true only for local development and tests")
+
+    import fakeredis
+
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+redis_client = _create_client()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def cache_get_json(key: str) -> Optional[Any]:
+    """Önbellekten JSON değeri oku; Redis hatasında cache miss gibi davran"""
+    try:
+        raw = redis_client.get(key)
+    except redis.RedisError:
+        logger.warning("Cache read failed for %s", key, exc_info=True)
+        return None
+    if raw is None:
+        return None
+    return json.loads(raw)
+
+
+def cache_set_json(key: str, value: Any, ttl: int) -> None:
+    try:
+        redis_client.set(key, json.dumps(value, default=_json_default), ex=ttl)
+    except redis.RedisError:
+        logger.warning("Cache write failed for %s", key, exc_info=True)
+
+
+def cache_delete(*keys: str) -> None:
+    keys = tuple(k for k in keys if k)
+    if not keys:
+        return
+    try:
+        redis_client.delete(*keys)
+    except redis.RedisError:
+        logger.warning("Cache delete failed for %s", keys, exc_info=True)
+
+
+def post_cache_key(slug: str) -> str:
+    return f"blog:post:{slug}"
+
+
+LIST_VERSION_KEY = "blog:list:version"
+
+
+def list_version() -> Optional[str]:
+    """Blog listesinin sürümü; yazı/yorum değiştikçe artar, liste ETag'i buradan türetilir.
+
+    Anahtar kaybolursa (flush/eviction) sürüm zamandan yeniden başlar; böylece
+    eski bir ETag farklı bir listeyle yeniden eşleşmez. Redis okunamazsa None döner,
+    çağıran ETag doğrulamasını atlamalı.
+    """
+    try:
+        redis_client.set(LIST_VERSION_KEY, time.time_ns(), nx=True)
+        return redis_client.get(LIST_VERSION_KEY)
+    except redis.RedisError:
+        logger.warning("Cache read failed for %s", LIST_VERSION_KEY, exc_info=True)
+        return None
+
+
+def bump_list_version() -> None:
+    try:
+        if not redis_client.set(LIST_VERSION_KEY, time.time_ns(), nx=True):
+            redis_client.incr(LIST_VERSION_KEY)
+    except redis.RedisError:
+        logger.warning("Cache write failed for %s", LIST_VERSION_KEY, exc_info=True)
+
+
+def invalidate_post_cache(*slugs: str) -> None:
+    """Verilen slug'lara ait önbellek kayıtlarını sil; listede görünen alanlar da
+    değiştiği için liste sürümü de artırılır"""
+    cache_delete(*(post_cache_key(slug) for slug in slugs if slug))
+    bump_list_version()
+
+
+def user_cache_key(user_id: int) -> str:
+    return f"auth:user:{user_id}"
+
+
+def invalidate_user_cache(*user_ids: int) -> None:
+    """Rol/onay/ban değişikliklerinden sonra kullanıcı önbelleğini temizle"""
+    cache_delete(*(user_cache_key(user_id) for user_id in user_ids))
@@ -0,0 +1,63 @@
+from typing import AsyncIterator, List, Protocol
+
+import google.generativeai as genai
+
+from app.metrics import track_upstream
+
+
+class ChatBackend(Protocol):
+    """Sohbet modelleri için ortak arayüz (testlerde sahte backend kullanılabilir)"""
+
+    model_name: str
+
+    async def generate(self, contents: List[dict], temperature: float) -> str:
+        ...
+
+    def stream(self, contents: List[dict], temperature: float) -> AsyncIterator[str]:
+        ...
+
+
+class GeminiBackend:
+    """Tek bir GenerativeModel örneğini yeniden kullanan async Gemini istemcisi"""
+
+    def __init__(self, api_key: str, model_name: str, system_instruction: str):
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self._model = genai.GenerativeModel(model_name, system_instruction=system_instruction)
+
+    async def generate(self, contents: List[dict], temperature: float) -> str:
+        with track_upstream("gemini", "generate"):
+            response = await self._model.generate_content_async(
+                contents,
+                generation_config=genai.types.GenerationConfig(temperature=temperature),
+            )
+            return response.text
+
+    async def stream(self, contents: List[dict], temperature: float) -> AsyncIterator[str]:
+        # Süre son parçaya kadar ölçülür
+        with track_upstream("gemini", "stream"):
+            response = await self._model.generate_content_async(
+                contents,
+                generation_config=genai.types.GenerationConfig(temperature=temperature),
+                stream=True,
+            )
+            async for chunk in response:
+                # Güvenlik filtresine takılan parçalarda text erişimi hata verir
+                if chunk.parts:
+                    yield chunk.text
+
+
+class FakeBackend:
+    """Ağ erişimi olmadan son kullanıcı mesajını yankılayan backend"""
+
+    model_name = "fake"
+
+    async def generate(self, contents: List[dict], temperature: float) -> str:
+        return "".join([piece async for piece in self.stream(contents, temperature)]).strip()
+
+    async def stream(self, contents: List[dict], temperature: float) -> AsyncIterator[str]:
+        last_user_text = next(
+            (c["parts"][0] for c in reversed(contents) if c["role"] == "user"), ""
+        )
+        for word in f"Echo: {last_user_text}".split(" "):
+            yield word + " "
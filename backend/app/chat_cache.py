@@ -0,0 +1,178 @@
+import hashlib
+import json
+import logging
+import re
+import time
+from typing import List, Optional
+
+import redis
+
+from app.cache import redis_client
+from app.config import settings
+from app.metrics import CHAT_CACHE_LOOKUPS, CHAT_CACHE_SAVED_SECONDS
+
+
+logger = logging.getLogger(__name__)
+
+ENTRY_PREFIX = "chat:cache:entry:"
+LRU_INDEX_KEY = "chat:cache:lru"
+LSH_PREFIX = "chat:cache:lsh:"
+
+# MinHash: 64 permütasyon, 16 bant x 4 satır
+_NUM_PERM = 64
+_BANDS = 16
+_ROWS = _NUM_PERM // _BANDS
+_MERSENNE_PRIME = (1 << 61) - 1
+_PERMUTATIONS = [
+    (
+        int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") % _MERSENNE_PRIME or 1,
+        int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big") % _MERSENNE_PRIME,
+    )
+    for i in range(_NUM_PERM)
+]
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def _temperature_bucket(temperature: Optional[float]) -> float:
+    return round((temperature or 0.0) * 4) / 4
+
+
+def _digest(payload) -> str:
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _context_hash(system_instruction: str, model: str, contents: List[dict], temperature: Optional[float]) -> str:
+    """Son kullanıcı mesajı hariç her şeyin hash'i (yakın eşleşmeler bu bağlam içinde aranır)"""
+    history = [(c["role"], [_normalize(p) for p in c["parts"]]) for c in contents[:-1]]
+    return _digest([_normalize(system_instruction), model, history, _temperature_bucket(temperature)])
+
+
+def _final_turn_text(contents: List[dict]) -> str:
+    return _normalize(" ".join(contents[-1]["parts"])) if contents else ""
+
+
+def _minhash(text: str) -> List[int]:
+    # Noktalama farkları yakın eşleşmeyi bozmasın
+    words = re.findall(r"\w+", text)
+    shingles = {" ".join(words[i:i + 2]) for i in range(max(len(words) - 1, 1))} or {text}
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big") for s in shingles]
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def _band_keys(context: str, signature: List[int]) -> List[str]:
+    keys = []
+    for band in range(_BANDS):
+        rows = signature[band * _ROWS:(band + 1) * _ROWS]
+        band_hash = hashlib.blake2b(repr(rows).encode(), digest_size=8).hexdigest()
+        keys.append(f"{LSH_PREFIX}{context}:{band}:{band_hash}")
+    return keys
+
+
+class ChatCacheKey:
+    """Bir sohbet isteğinin önbellek anahtarları"""
+
+    def __init__(self, system_instruction: str, model: str, contents: List[dict], temperature: Optional[float]):
+        self.context = _context_hash(system_instruction, model, contents, temperature)
+        self.final_text = _final_turn_text(contents)
+        self.exact = _digest([self.context, self.final_text])
+
+    @property
+    def entry_key(self) -> str:
+        return ENTRY_PREFIX + self.exact
+
+
+def _touch(entry_key: str) -> None:
+    redis_client.zadd(LRU_INDEX_KEY, {entry_key: time.time()})
+
+
+def _evict_overflow() -> None:
+    """LRU indeksi CHAT_CACHE_MAX_ENTRIES'i aşarsa en eski kayıtları sil"""
+    overflow = redis_client.zcard(LRU_INDEX_KEY) - settings.CHAT_CACHE_MAX_ENTRIES
+    if overflow > 0:
+        stale = [key for key, _ in redis_client.zpopmin(LRU_INDEX_KEY, overflow)]
+        if stale:
+            redis_client.delete(*stale)
+
+
+def _load(entry_key: str) -> Optional[dict]:
+    raw = redis_client.get(entry_key)
+    return json.loads(raw) if raw else None
+
+
+def _similarity(a: List[int], b: List[int]) -> float:
+    return sum(1 for x, y in zip(a, b) if x == y) / _NUM_PERM
+
+
+def lookup(key: ChatCacheKey) -> Optional[str]:
+    """Önbellekteki yanıtı döndür: önce tam eşleşme, açıksa yakın eşleşme.
+
+    Senkron Redis çağrıları yaptığından async kodda run_in_threadpool ile çağrılır.
+    """
+    if not settings.CHAT_CACHE_ENABLED:
+        return None
+    try:
+        entry = _load(key.entry_key)
+        result = "hit_exact"
+        if entry is None and settings.CHAT_CACHE_NEAR_DUPLICATES:
+            entry, entry_key = _near_duplicate(key)
+            result = "hit_near"
+        else:
+            entry_key = key.entry_key
+    except redis.RedisError:
+        logger.warning("Chat cache lookup failed", exc_info=True)
+        return None
+
+    if entry is None:
+        CHAT_CACHE_LOOKUPS.labels("miss").inc()
+        return None
+    CHAT_CACHE_LOOKUPS.labels(result).inc()
+    CHAT_CACHE_SAVED_SECONDS.inc(entry.get("latency", 0))
+    try:
+        _touch(entry_key)
+    except redis.RedisError:
+        pass
+    return entry["response"]
+
+
+def _near_duplicate(key: ChatCacheKey):
+    signature = _minhash(key.final_text)
+    # Bant üyeleri ve aday kayıtlar ikişer round trip ile okunur
+    pipe = redis_client.pipeline(transaction=False)
+    for band_key in _band_keys(key.context, signature):
+        pipe.smembers(band_key)
+    candidates = sorted(set().union(*pipe.execute()))
+    if not candidates:
+        return None, None
+    best, best_key, best_score = None, None, settings.CHAT_CACHE_SIMILARITY
+    for candidate_key, raw in zip(candidates, redis_client.mget(candidates)):
+        if raw is None:
+            continue
+        entry = json.loads(raw)
+        score = _similarity(signature, entry["signature"])
+        if score >= best_score:
+            best, best_key, best_score = entry, candidate_key, score
+    return best, best_key
+
+
+def store(key: ChatCacheKey, response: str, latency: float) -> None:
+    """Yanıtı kaydet; lookup gibi async kodda run_in_threadpool ile çağrılır"""
+    if not settings.CHAT_CACHE_ENABLED or not response:
+        return
+    ttl = settings.CHAT_CACHE_TTL
+    entry = {"response": response, "latency": latency}
+    try:
+        pipe = redis_client.pipeline()
+        if settings.CHAT_CACHE_NEAR_DUPLICATES:
+            entry["signature"] = _minhash(key.final_text)
+            for band_key in _band_keys(key.context, entry["signature"]):
+                pipe.sadd(band_key, key.entry_key)
+                pipe.expire(band_key, ttl)
+        pipe.set(key.entry_key, json.dumps(entry, ensure_ascii=False), ex=ttl)
+        pipe.zadd(LRU_INDEX_KEY, {key.entry_key: time.time()})
+        pipe.execute()
+        _evict_overflow()
+    except redis.RedisError:
+        logger.warning("Chat cache store failed", exc_info=True)
@@ -0,0 +1,116 @@
+import os
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    SECRET_KEY: str = os.getenv("SECRET_KEY")
+    ALGORITHM: str = "HS256"
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    UNSPLASH_ACCESS_KEY: str = ""
+    UNSPLASH_CACHE_TTL: int = 3600
+    GEMINI_API_KEY: str = ""
+    GEMINI_MODEL: str = "gemini-2.5-flash"
+    # "gemini" ya da ağ gerektirmeyen "fake"
+    CHAT_BACKEND: str = "gemini"
+    # Sunucu tarafı sohbet geçmişi: modele gönderilecek yaklaşık token bütçesi
+    CHAT_TOKEN_BUDGET: int = 6000
+    # Bütçe aşılınca eski turlar özetlensin mi (aksi halde sadece atılır)
+    CHAT_SUMMARIZE: bool = False
+    CHAT_CONVERSATION_TTL: int = 7 * 24 * 3600
+    # Gemini yanıt önbelleği (tam eşleşme, isteğe bağlı MinHash ile yakın eşleşme)
+    CHAT_CACHE_ENABLED: bool = True
+    CHAT_CACHE_TTL: int = 24 * 3600
+    CHAT_CACHE_MAX_ENTRIES: int = 5000
+    CHAT_CACHE_NEAR_DUPLICATES: bool = False
+    CHAT_CACHE_SIMILARITY: float = 0.8
+    # Aynı kullanıcı/IP'den tekrar görüntülemelerin sayılmadığı süre ve
+    # biriken görüntülenmelerin veritabanına yazılma aralığı (saniye)
+    VIEW_COOLDOWN_SECONDS: int = 3600
+    VIEW_FLUSH_INTERVAL: int = 10
+    # Postgres text search yapılandırması (ör. "simple", "turkish", "english")
+    SEARCH_TEXT_CONFIG: str = "simple"
+    # Yayınlanmış yazıların Redis'teki serialize edilmiş halinin ömrü (saniye)
+    POST_CACHE_TTL: int = 300
+    # get_current_user'ın Redis'te tuttuğu kullanıcı bilgisinin ömrü (saniye)
+    USER_CACHE_TTL: int = 60
+    # Anonim blog yanıtları için tarayıcı/CDN önbellek süresi (saniye)
+    BLOG_HTTP_MAX_AGE: int = 60
+
+    # Yükleme boyut sınırları (byte)
+    MAX_IMAGE_UPLOAD_BYTES: int = 10 * 1024 * 1024
+    MAX_FILE_UPLOAD_BYTES: int = 50 * 1024 * 1024
+    # Görsel varyantlarını üreten süreç havuzu
+    IMAGE_WORKERS: int = 2
+    # Referanssız blob'ların silinmeden önce bekleyeceği süre ve GC aralığı (saniye)
+    BLOB_GC_GRACE_SECONDS: int = 24 * 3600
+    BLOB_GC_INTERVAL: int = 3600
+    # Aynı içeriğin yüklenmesi ile depodan silinmesini sıralayan kilidin ömrü ve bekleme süresi
+    BLOB_LOCK_TTL: int = 300
+    BLOB_LOCK_WAIT: float = 30.0
+
+    # Yüklemelerin saklandığı yer: "local" (static/uploads) ya da "s3" (S3 uyumlu, ör. MinIO)
+    STORAGE_BACKEND: str = "local"
+    S3_BUCKET: Optional[str] = None
+    S3_ENDPOINT_URL: Optional[str] = None
+    S3_REGION: Optional[str] = None
+    S3_ACCESS_KEY_ID: Optional[str] = None
+    S3_SECRET_ACCESS_KEY: Optional[str] = None
+    # Nesnelerin dışarıya açık adresi (CDN ya da bucket URL'si)
+    S3_PUBLIC_URL: Optional[str] = None
+    PRESIGNED_UPLOAD_EXPIRES: int = 900
+
+    # /static: içerik adreslenmemiş dosyalar için önbellek süresi (saniye)
+    STATIC_CACHE_MAX_AGE: int = 3600
+    # "", "x-accel-redirect" (nginx) ya da "x-sendfile" (Apache/lighttpd)
+    STATIC_SENDFILE: str = ""
+    # nginx'te static dizinine işaret eden internal location
+    STATIC_ACCEL_PREFIX: str = "/_static"
+
+    # Yöneticiler X-Profile: 1 başlığı ya da ?profile=1 ile isteği profilleyebilir
+    PROFILING_ENABLED: bool = True
+    PROFILING_INTERVAL: float = 0.001
+    PROFILE_TTL: int = 3600
+    # Profilde saklanacak en fazla SQL ifadesi
+    PROFILE_MAX_STATEMENTS: int = 500
+
+    # bcrypt maliyet faktörü ve hash işlemleri için ayrılan süreç havuzu
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    # Bu sayıdan fazla bekleyen hash işi varsa 503 dönülür
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    DATABASE_URL: str = os.getenv("DATABASE_URL")
+    DATABASE_ASYNC: bool = False
+    REDIS_URL: Optional[str] = None
+    # REDIS_URL yokken süreç içi fakeredis kullan; yalnızca geliştirme ve testler için.
+    # Her süreç ayrı önbellek tuttuğundan invalidation ve iş kuyruğu süreçler arası çalışmaz
+    REDIS_FAKE: bool = False
+
+    # Arka plan işleri: None ise fakeredis kullanılırken API süreci içinde çalışır,
+    # aksi halde ayrı worker (python -m app.worker) gerekir
+    JOBS_IN_PROCESS: Optional[bool] = None
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_RETRY_BASE_DELAY: float = 5.0
+    JOB_RETRY_MAX_DELAY: float = 600.0
+    JOB_POLL_TIMEOUT: int = 1
+    # Worker nabzının ömrü; bu süre tazelenmezse worker'ın işleri kuyruğa geri konur
+    JOB_HEARTBEAT_TTL: int = 30
+
+    # Bağlantı havuzu (uvicorn worker başına)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Postgres statement_timeout (ms), 0 = sınırsız
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        extra="ignore",
+    )
+
+settings = Settings()
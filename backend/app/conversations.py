@@ -0,0 +1,103 @@
+import time
+import uuid
+from typing import List, Optional
+
+from app.cache import cache_get_json, cache_set_json
+from app.config import settings
+
+
+def estimate_tokens(text: str) -> int:
+    """Yaklaşık token sayısı (~4 karakter/token); her çağrıda count_tokens API'sine gitmemek için"""
+    return max(1, len(text) // 4)
+
+
+def new_conversation_id() -> str:
+    return uuid.uuid4().hex
+
+
+def _conversation_key(user_id: int, conversation_id: str) -> str:
+    return f"chat:conversation:{user_id}:{conversation_id}"
+
+
+def empty_conversation() -> dict:
+    return {
+        "summary": None,
+        "turns": [],
+        "stats": {
+            "calls": 0,
+            "prompt_tokens": 0,
+            "response_tokens": 0,
+            "total_latency_ms": 0,
+            "last_latency_ms": 0,
+            "compactions": 0,
+        },
+    }
+
+
+def load_conversation(user_id: int, conversation_id: str) -> Optional[dict]:
+    return cache_get_json(_conversation_key(user_id, conversation_id))
+
+
+def save_conversation(user_id: int, conversation_id: str, conversation: dict) -> None:
+    cache_set_json(_conversation_key(user_id, conversation_id), conversation, settings.CHAT_CONVERSATION_TTL)
+
+
+def make_turn(role: str, content: str) -> dict:
+    return {"role": role, "content": content, "tokens": estimate_tokens(content)}
+
+
+def trim_to_budget(turns: List[dict], budget: int) -> tuple:
+    """Bütçeyi aşan en eski turları ayır; pencere her zaman bir kullanıcı turuyla başlar.
+
+    (tutulan turlar, atılan turlar) döner. Son tur bütçeden büyük olsa bile tutulur.
+    """
+    kept = list(turns)
+    dropped = []
+    total = sum(t["tokens"] for t in kept)
+    while len(kept) > 1 and (total > budget or kept[0]["role"] != "user"):
+        turn = kept.pop(0)
+        total -= turn["tokens"]
+        dropped.append(turn)
+    return kept, dropped
+
+
+def compact(conversation: dict, budget: int) -> List[dict]:
+    """Konuşmayı token bütçesine indir, atılan turları döndür"""
+    summary_tokens = estimate_tokens(conversation["summary"]) if conversation["summary"] else 0
+    kept, dropped = trim_to_budget(conversation["turns"], budget - summary_tokens)
+    if dropped:
+        conversation["turns"] = kept
+        conversation["stats"]["compactions"] += 1
+    return dropped
+
+
+def to_contents(turns: List[dict], summary: Optional[str] = None) -> List[dict]:
+    """Turları generate_content'in kabul ettiği contents listesine çevir"""
+    contents = [{"role": t["role"], "parts": [t["content"]]} for t in turns]
+    if summary and contents:
+        # Özeti ayrı bir tur yerine ilk kullanıcı mesajına ek parça olarak ver
+        contents[0]["parts"].insert(0, f"(Önceki konuşmanın özeti: {summary})")
+    return contents
+
+
+def summary_prompt(previous_summary: Optional[str], dropped: List[dict]) -> List[dict]:
+    transcript = "\n".join(f"{t['role']}: {t['content']}" for t in dropped)
+    if previous_summary:
+        transcript = f"Önceki özet: {previous_summary}\n{transcript}"
+    return [{
+        "role": "user",
+        "parts": [
+            "Aşağıdaki konuşmayı sonraki yanıtlarda bağlam olarak kullanılacak şekilde "
+            "birkaç cümleyle, sadece olgulara dayanarak özetle:\n" + transcript
+        ],
+    }]
+
+
+def record_call(conversation: dict, prompt_tokens: int, response_text: str, started_at: float) -> None:
+    latency_ms = int((time.perf_counter() - started_at) * 1000)
+    stats = conversation["stats"]
+    stats["calls"] += 1
+    stats["prompt_tokens"] += prompt_tokens
+    stats["response_tokens"] += estimate_tokens(response_text)
+    stats["total_latency_ms"] += latency_ms
+    stats["last_latency_ms"] = latency_ms
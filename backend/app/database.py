@@ -1,15 +1,181 @@
-from sqlalchemy import create_engine
+import time
+from typing import Set
+
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-import os
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.schema import CreateIndex
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_TIMEOUTS,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_OVERFLOW,
+    record_statement,
+)
+
+
+class _InstrumentedPoolMixin:
+    """Havuzdan bağlantı alma süresini ve doluluk durumunu metriklere yaz"""
+
+    metrics_label = "sync"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.labels(self.metrics_label).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self.metrics_label).observe(time.perf_counter() - start)
+            self._record_usage()
+
+    def _do_return_conn(self, record):
+        try:
+            return super()._do_return_conn(record)
+        finally:
+            self._record_usage()
+
+    def _record_usage(self):
+        DB_POOL_CHECKED_OUT.labels(self.metrics_label).set(self.checkedout())
+        DB_POOL_OVERFLOW.labels(self.metrics_label).set(max(self.overflow(), 0))
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    metrics_label = "sync"
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+def _instrument_statements(engine) -> None:
+    """Her SQL ifadesinin süresini ölç; istek içindeyse isteğin toplamına ekle"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        record_statement(statement, time.perf_counter() - conn.info["query_start"].pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        # Hata veren ifadenin başlangıç zamanı yığında kalmasın
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
+
+def _engine_options(url, poolclass) -> dict:
+    """Settings'teki havuz ve timeout ayarlarını create_engine argümanlarına çevir"""
+    if url.get_backend_name() == "sqlite":
+        return {}
+    options = {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS and url.get_backend_name() == "postgresql":
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {
+                "server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+            }
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
 
+def get_async_url(url: str):
+    """Senkron sürücü URL'sini async karşılığına çevir"""
+    url = make_url(url)
+    if url.drivername in ("postgresql", "postgresql+psycopg2"):
+        return url.set(drivername="postgresql+asyncpg")
+    if url.drivername in ("sqlite", "sqlite+pysqlite"):
+        return url.set(drivername="sqlite+aiosqlite")
+    return url
 
-engine = create_engine(os.getenv("DATABASE_URL"))
+
+_sync_url = make_url(settings.DATABASE_URL)
+engine = create_engine(_sync_url, **_engine_options(_sync_url, InstrumentedQueuePool))
+_instrument_statements(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 
+if settings.DATABASE_ASYNC:
+    # Sık okunan route'lar için asyncpg/aiosqlite tabanlı async oturum
+    _async_url = get_async_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(_async_url, **_engine_options(_async_url, InstrumentedAsyncQueuePool))
+    _instrument_statements(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+else:
+    async_engine = None
+    AsyncSessionLocal = None
+
+
+def add_missing_columns(engine) -> Set[str]:
+    """Mevcut tablolara modele sonradan eklenen kolonları ekle.
+
+    create_all yalnızca eksik tabloları oluşturur; migration aracı olmadığından
+    yeni kolonlar burada ALTER TABLE ile eklenir. Eklenen kolonlar
+    "tablo.kolon" olarak döner; veri doldurması gerekenler için kullanılır.
+    """
+    added = set()
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+                if column.server_default is not None:
+                    ddl += f" DEFAULT {column.server_default.arg.text}"
+                elif not column.nullable:
+                    # Varsayılanı olmayan NOT NULL kolon dolu tabloya eklenemez
+                    continue
+                if not column.nullable:
+                    ddl += " NOT NULL"
+                conn.execute(text(ddl))
+                added.add(f"{table.name}.{column.name}")
+    return added
+
+
+def ensure_indexes(engine) -> None:
+    """Modeldeki indeksleri oluştur.
+
+    create_all mevcut tablolara sonradan eklenen indeksleri oluşturmaz. SQLite'ta
+    tanımı (ör. partial indeks koşulu) modelden farklı kalmış indeksler silinip
+    yeniden oluşturulur.
+    """
+    with engine.begin() as conn:
+        stored = {}
+        if engine.dialect.name == "sqlite":
+            rows = conn.execute(text("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"))
+            stored = {name: " ".join(sql.split()) for name, sql in rows}
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                ddl = " ".join(str(CreateIndex(index).compile(dialect=engine.dialect)).split())
+                if index.name in stored and stored[index.name] != ddl:
+                    index.drop(bind=conn)
+                index.create(bind=conn, checkfirst=True)
+
+
 def get_db():
     """Veritabanı oturumu dependency'si"""
     db = SessionLocal()
@@ -17,3 +183,47 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Async veritabanı oturumu dependency'si (DATABASE_ASYNC açıkken)"""
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database is disabled; set DATABASE_ASYNC=true")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_request_db():
+    """Yapılandırmaya göre async ya da senkron oturum döndür (run_db ile kullanılır)"""
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+
+
+async def release_db(db) -> None:
+    """Uzun süren bir await (ör. bcrypt) öncesi bağlantıyı havuza geri ver.
+
+    Oturum kapatıldıktan sonra da kullanılabilir; sonraki run_db yeni bir
+    bağlantı alır. Yüklenmiş nesneler detached kalır, kolonları okunabilir.
+    """
+    if isinstance(db, AsyncSession):
+        await db.close()
+    else:
+        await run_in_threadpool(db.close)
+
+
+async def run_db(db, fn, *args, **kwargs):
+    """Senkron ORM kodunu async route içinden çalıştır.
+
+    AsyncSession ile fn event loop'u bloklamadan run_sync içinde, senkron
+    Session ile threadpool'da çalışır; fn ilk argüman olarak Session alır.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
@@ -0,0 +1,42 @@
+import hashlib
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+from app.config import settings
+
+
+def make_etag(*parts) -> str:
+    """Doğrulayıcı parçalardan zayıf ETag üret (gövde byte'ı byte'ına aynı olmayabilir)"""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # If-None-Match için zayıf karşılaştırma
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+
+def is_not_modified(headers: Headers, etag: str) -> bool:
+    """If-None-Match ile 304 dönülebilir mi; Last-Modified gönderilmediği için
+    If-Modified-Since yok sayılır"""
+    if_none_match = headers.get("if-none-match")
+    return if_none_match is not None and etag_matches(if_none_match, etag)
+
+
+def cache_headers(etag: str, public: bool) -> dict:
+    """Anonim yanıtlar CDN'de kısa süre paylaşılabilir; diğerleri her seferinde doğrulanır"""
+    return {
+        "ETag": etag,
+        "Vary": "Authorization",
+        "Cache-Control": (
+            f"public, max-age={settings.BLOG_HTTP_MAX_AGE}" if public else "private, no-cache"
+        ),
+    }
+
+
+def not_modified_response(headers: dict) -> Response:
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,126 @@
+import asyncio
+import base64
+import io
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.config import settings
+
+
+# Varyant adı -> maksimum genişlik (büyütme yapılmaz)
+VARIANTS: Dict[str, int] = {"thumb": 320, "card": 800, "full": 1600}
+WEBP_QUALITY = 80
+LQIP_WIDTH = 16
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+class InvalidImageError(Exception):
+    pass
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.IMAGE_WORKERS)
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def variant_path(source: Path, variant: str) -> Path:
+    return source.with_name(f"{source.stem}-{variant}.webp")
+
+
+def _prepare(image: Image.Image) -> Image.Image:
+    # EXIF yönünü piksellere uygula; yeniden kodlamada EXIF (GPS vb.) taşınmaz
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "P") else "RGB")
+    return image
+
+
+def _resize(image: Image.Image, max_width: int) -> Image.Image:
+    if image.width <= max_width:
+        return image
+    height = round(image.height * max_width / image.width)
+    return image.resize((max_width, height), Image.LANCZOS)
+
+
+def _lqip(image: Image.Image) -> str:
+    """Küçük, bulanık WebP yer tutucu (data URI)"""
+    small = _resize(image, LQIP_WIDTH)
+    buffer = io.BytesIO()
+    small.save(buffer, "WEBP", quality=30)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def process_image(source: str, destination: Optional[str] = None) -> dict:
+    """Süreç havuzunda çalışır: WebP varyantlarını ve LQIP'i üretir.
+
+    Varyantlar destination (verilmezse source) yolunun adıyla yan yana yazılır.
+    """
+    source_path = Path(source)
+    target_base = Path(destination) if destination else source_path
+    try:
+        with Image.open(source_path) as opened:
+            image = _prepare(opened)
+    except (UnidentifiedImageError, OSError) as e:
+        raise InvalidImageError(str(e))
+
+    variants = {}
+    for name, max_width in VARIANTS.items():
+        resized = _resize(image, max_width)
+        target = variant_path(target_base, name)
+        tmp = target.with_name("." + target.name)
+        resized.save(tmp, "WEBP", quality=WEBP_QUALITY, method=4)
+        tmp.replace(target)
+        variants[name] = {
+            "name": target.name,
+            "width": resized.width,
+            "height": resized.height,
+            "size": target.stat().st_size,
+        }
+    return {
+        "width": image.width,
+        "height": image.height,
+        "variants": variants,
+        "placeholder": _lqip(image),
+    }
+
+
+def verify_image(source: Path, expected_format: str) -> None:
+    """Yeniden kodlanmadan saklanacak görselin gerçekten beklenen biçimde ve sağlam olduğunu doğrula"""
+    try:
+        with Image.open(source) as image:
+            if image.format != expected_format:
+                raise InvalidImageError(f"Expected {expected_format}, got {image.format}")
+            image.verify()
+    except (UnidentifiedImageError, OSError, SyntaxError) as e:
+        raise InvalidImageError(str(e))
+
+
+async def process_upload(source: Path, destination: Optional[Path] = None) -> dict:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(), process_image, str(source), str(destination) if destination else None
+    )
+
+
+def build_manifest(result: dict, url_prefix: str) -> Tuple[dict, str]:
+    """Varyant URL'leri ve srcset string'i"""
+    urls = {name: f"{url_prefix}/{v['name']}" for name, v in result["variants"].items()}
+    # Aynı genişlikte birden fazla varyant (küçük görseller) srcset'te tekrarlanmasın
+    seen = {}
+    for name, v in result["variants"].items():
+        seen.setdefault(v["width"], urls[name])
+    srcset = ", ".join(f"{url} {width}w" for width, url in sorted(seen.items()))
+    return urls, srcset
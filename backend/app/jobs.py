@@ -0,0 +1,193 @@
+import asyncio
+import json
+import logging
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+import redis
+
+from app.cache import redis_client
+from app.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "jobs:queue"
+# Tekrar denenecek işler, çalışma zamanına (unix ts) göre sıralı
+DELAYED_KEY = "jobs:delayed"
+DEAD_LETTER_KEY = "jobs:dead"
+# Her worker aldığı işi bitene kadar kendi listesinde tutar; worker çökerse
+# nabız anahtarı süresi dolar ve listedeki işler kuyruğa geri konur
+PROCESSING_PREFIX = "jobs:processing:"
+HEARTBEAT_PREFIX = "jobs:workers:"
+
+
+@dataclass(frozen=True)
+class JobType:
+    name: str
+    handler: Callable[..., None]
+    max_attempts: int
+
+
+_registry: Dict[str, JobType] = {}
+
+
+def job(name: str, max_attempts: int = 5):
+    """Fonksiyonu isimli iş tipi olarak kaydet; argümanlar JSON'a çevrilebilir olmalı"""
+
+    def decorator(fn: Callable[..., None]) -> Callable[..., None]:
+        _registry[name] = JobType(name, fn, max_attempts)
+        return fn
+
+    return decorator
+
+
+def enqueue(name: str, **payload) -> Optional[str]:
+    """İşi kuyruğa ekle ve hemen dön; Redis'e yazılamazsa hata loglanır, istek başarısız olmaz"""
+    if name not in _registry:
+        raise ValueError(f"Unknown job type: {name}")
+    job_id = uuid.uuid4().hex
+    message = {"id": job_id, "name": name, "payload": payload, "attempts": 0, "enqueued_at": time.time()}
+    try:
+        redis_client.lpush(QUEUE_KEY, json.dumps(message))
+    except redis.RedisError:
+        logger.exception("Could not enqueue job %s", name)
+        return None
+    return job_id
+
+
+def _backoff(attempts: int) -> float:
+    delay = min(settings.JOB_RETRY_BASE_DELAY * 2 ** (attempts - 1), settings.JOB_RETRY_MAX_DELAY)
+    # Aynı anda başarısız olan işler aynı anda tekrar denenmesin
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _promote_due_jobs() -> None:
+    """Zamanı gelen gecikmeli işleri ana kuyruğa taşı"""
+    due = redis_client.zrangebyscore(DELAYED_KEY, 0, time.time(), start=0, num=100)
+    for raw in due:
+        # zrem başarılıysa işi bu worker sahiplenmiştir
+        if redis_client.zrem(DELAYED_KEY, raw):
+            redis_client.lpush(QUEUE_KEY, raw)
+
+
+def _fail(message: dict, error: Exception) -> None:
+    message["attempts"] += 1
+    message["last_error"] = f"{type(error).__name__}: {error}"
+    job_type = _registry.get(message["name"])
+    if job_type is None or message["attempts"] >= job_type.max_attempts:
+        logger.error("Job %s (%s) moved to dead-letter list", message["id"], message["name"])
+        message["failed_at"] = time.time()
+        redis_client.lpush(DEAD_LETTER_KEY, json.dumps(message))
+        return
+    delay = _backoff(message["attempts"])
+    logger.warning("Job %s (%s) failed, retrying in %.1fs", message["id"], message["name"], delay)
+    redis_client.zadd(DELAYED_KEY, {json.dumps(message): time.time() + delay})
+
+
+def run_job(raw: str) -> None:
+    message = json.loads(raw)
+    job_type = _registry.get(message["name"])
+    try:
+        if job_type is None:
+            raise LookupError(f"Unknown job type: {message['name']}")
+        job_type.handler(**message["payload"])
+    except Exception as e:
+        _fail(message, e)
+
+
+def _next_job(processing_key: str, timeout: int) -> Optional[str]:
+    """Sıradaki işi atomik olarak worker'ın işlem listesine taşı"""
+    return redis_client.blmove(QUEUE_KEY, processing_key, timeout, "RIGHT", "LEFT")
+
+
+def _finish_job(processing_key: str, raw: str) -> None:
+    try:
+        run_job(raw)
+    finally:
+        # Başarılı, tekrar denemeye ya da dead-letter'a alınmış; artık işlemde değil
+        redis_client.lrem(processing_key, 1, raw)
+
+
+def _heartbeat(worker_id: str) -> None:
+    redis_client.set(HEARTBEAT_PREFIX + worker_id, 1, ex=settings.JOB_HEARTBEAT_TTL)
+
+
+def requeue_orphaned_jobs() -> int:
+    """Nabzı kesilmiş (çökmüş) worker'ların yarıda kalan işlerini kuyruğa geri koy"""
+    requeued = 0
+    for processing_key in redis_client.scan_iter(match=f"{PROCESSING_PREFIX}*"):
+        worker_id = processing_key[len(PROCESSING_PREFIX):]
+        if redis_client.exists(HEARTBEAT_PREFIX + worker_id):
+            continue
+        while redis_client.lmove(processing_key, QUEUE_KEY, "RIGHT", "LEFT") is not None:
+            requeued += 1
+    if requeued:
+        logger.warning("Requeued %d jobs from stopped workers", requeued)
+    return requeued
+
+
+async def _keep_alive(worker_id: str) -> None:
+    """Nabzı tazele ve diğer worker'lardan kalan işleri topla"""
+    interval = max(1.0, settings.JOB_HEARTBEAT_TTL / 3)
+    while True:
+        try:
+            await asyncio.to_thread(_heartbeat, worker_id)
+            await asyncio.to_thread(requeue_orphaned_jobs)
+        except redis.RedisError:
+            logger.exception("Job queue unavailable")
+        await asyncio.sleep(interval)
+
+
+async def run_worker(concurrency: int = 1) -> None:
+    """Kuyruktaki işleri işle; iptal edilene kadar çalışır.
+
+    İşler BLMOVE ile worker'a özel işlem listesine alınır ve iş bitince
+    listeden silinir; süreç iş ortasında ölürse iş kaybolmaz, başka bir
+    worker (ya da yeniden başlayan bu worker) onu kuyruğa geri koyar.
+    """
+    worker_id = uuid.uuid4().hex
+    processing_key = PROCESSING_PREFIX + worker_id
+    semaphore = asyncio.Semaphore(concurrency)
+    running = set()
+    # Nabız ilk iş alınmadan yazılır; aksi halde başka bir worker listeyi sahipsiz sanabilir
+    await asyncio.to_thread(_heartbeat, worker_id)
+    keep_alive = asyncio.create_task(_keep_alive(worker_id))
+    try:
+        while True:
+            # Boş slot yokken iş alınmaz; alınan her iş hemen çalışmaya başlar
+            await semaphore.acquire()
+            try:
+                await asyncio.to_thread(_promote_due_jobs)
+                raw = await asyncio.to_thread(_next_job, processing_key, settings.JOB_POLL_TIMEOUT)
+            except redis.RedisError:
+                semaphore.release()
+                logger.exception("Job queue unavailable")
+                await asyncio.sleep(settings.JOB_POLL_TIMEOUT)
+                continue
+            if raw is None:
+                semaphore.release()
+                continue
+            task = asyncio.create_task(asyncio.to_thread(_finish_job, processing_key, raw))
+            running.add(task)
+            task.add_done_callback(lambda t: (running.discard(t), semaphore.release()))
+    finally:
+        # Kapanırken yarıda kalan işlerin bitmesini bekle
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        keep_alive.cancel()
+        await asyncio.gather(keep_alive, return_exceptions=True)
+        try:
+            await asyncio.to_thread(redis_client.delete, HEARTBEAT_PREFIX + worker_id)
+        except redis.RedisError:
+            pass
+
+
+def runs_in_process() -> bool:
+    """Süreç içi fakeredis ile ayrı worker kuyruğa erişemez; işler API sürecinde çalışır"""
+    if settings.JOBS_IN_PROCESS is not None:
+        return settings.JOBS_IN_PROCESS
+    return settings.REDIS_FAKE and not settings.REDIS_URL
@@ -1,21 +1,67 @@
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
 from app.routers import auth, gemini, contact, admin, blog, upload, unsplash
-from app.database import engine, Base
+from app.config import settings
+from app.backfill import backfill_post_counters
+from app.database import engine, Base, add_missing_columns, ensure_indexes
+from app.metrics import make_metrics_app, mark_process_dead
+from app.middleware import BodySizeLimitMiddleware, MetricsMiddleware, ProfilingMiddleware
+from app.static_files import UploadStaticFiles
+from app import images, jobs, passwords, tasks  # noqa: F401 (tasks iş tiplerini kaydeder)
+from app.search import ensure_search_schema
+from app.view_counter import run_view_flusher
+from app.blobs import run_blob_gc
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
+import logging
 import os
 
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+app = FastAPI(default_response_class=ORJSONResponse)
+background_tasks = []
 
 
 @app.on_event("startup")
 def on_startup():
     Base.metadata.create_all(bind=engine)
+    added = add_missing_columns(engine)
+    # Yeni eklenen denormalize kolonlar mevcut yazılarda boş/0 kalmasın
+    if added & {"blog_posts.author_username", "blog_posts.comment_count"}:
+        logger.info("Backfilled %d blog posts", backfill_post_counters())
+    ensure_indexes(engine)
+    ensure_search_schema(engine)
     # Static dizinlerini oluştur
     os.makedirs("static/uploads/images", exist_ok=True)
     os.makedirs("static/uploads/files", exist_ok=True)
     os.makedirs("static/uploads/profile", exist_ok=True)
+    os.makedirs("static/uploads/blobs", exist_ok=True)
+
+
+@app.on_event("startup")
+async def start_background_tasks():
+    app.state.http_client = unsplash.create_http_client()
+    # Ayrı worker yoksa kuyruk ve periyodik bakım işleri API sürecinde çalışır
+    if jobs.runs_in_process():
+        background_tasks.append(asyncio.create_task(jobs.run_worker(settings.JOB_WORKER_CONCURRENCY)))
+        background_tasks.append(asyncio.create_task(run_view_flusher()))
+        background_tasks.append(asyncio.create_task(run_blob_gc()))
+
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
+    await app.state.http_client.aclose()
+    passwords.shutdown_executor()
+    images.shutdown_executor()
+    mark_process_dead()
+
+# CORS'un içinde kalsın ki 401/403 yanıtları ve X-Profile-Id tarayıcıya ulaşsın
+app.add_middleware(ProfilingMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -32,10 +78,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Before-Cursor", "X-Since-Cursor", "X-Profile-Id"],
 )
 
+# Yüklemeleri multipart ayrıştırılmadan önce sınırla (küçük bir form payı ile)
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    path_prefix="/upload",
+    max_body_size=max(settings.MAX_IMAGE_UPLOAD_BYTES, settings.MAX_FILE_UPLOAD_BYTES) + 64 * 1024,
+)
+
+# En dışta; CORS ve gövde sınırı dahil tüm isteği ölçer
+app.add_middleware(MetricsMiddleware)
+
 # Static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", UploadStaticFiles(directory="static"), name="static")
+app.mount("/metrics", make_metrics_app())
 
 app.include_router(auth.router)
 app.include_router(gemini.router)
@@ -0,0 +1,146 @@
+"""Prometheus metrikleri.
+
+Birden çok uvicorn/gunicorn worker'ı ile çalışırken PROMETHEUS_MULTIPROC_DIR
+ortam değişkeni (süreçler başlamadan önce boşaltılmış; bkz. docker-entrypoint.sh) bir dizine ayarlanmalı;
+/metrics o zaman tüm süreçlerin değerlerini birleştirir.
+"""
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import List, Optional
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, make_asgi_app, multiprocess
+
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the SQLAlchemy pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections currently open above pool_size",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that failed because the pool was exhausted",
+    ["pool"],
+)
+
+
+CHAT_CACHE_LOOKUPS = Counter(
+    "chat_cache_lookups_total",
+    "Gemini response cache lookups by result",
+    ["result"],
+)
+CHAT_CACHE_SAVED_SECONDS = Counter(
+    "chat_cache_saved_seconds_total",
+    "Upstream generation time avoided by serving cached responses",
+)
+
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving the request to sending the last response byte",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being handled",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+
+DB_STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "Execution time of individual SQL statements",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+DB_STATEMENTS_PER_REQUEST = Histogram(
+    "http_request_db_statements",
+    "SQL statements executed while handling a request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+DB_SECONDS_PER_REQUEST = Histogram(
+    "http_request_db_seconds",
+    "Total SQL execution time while handling a request",
+    ["route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+UPSTREAM_REQUEST_DURATION = Histogram(
+    "upstream_request_duration_seconds",
+    "Latency of calls to external services",
+    ["service", "operation", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60),
+)
+
+
+@dataclass
+class RequestStats:
+    """Bir istek boyunca çalışan SQL ifadelerinin sayısı ve toplam süresi"""
+
+    statements: int = 0
+    db_seconds: float = 0.0
+    # Profillenen isteklerde ifadelerin kendisi de (metin, süre) olarak tutulur
+    statement_log: Optional[List[tuple]] = None
+
+
+# Middleware her istek için yeni bir RequestStats koyar; threadpool ve
+# run_sync içindeki sorgular aynı nesneyi günceller
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+def record_statement(statement: str, duration: float) -> None:
+    DB_STATEMENT_DURATION.observe(duration)
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += duration
+        if stats.statement_log is not None:
+            stats.statement_log.append((statement, duration))
+
+
+@contextmanager
+def track_upstream(service: str, operation: str):
+    """Dış servis çağrısının süresini sonucuyla (ok/error) birlikte kaydet"""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        UPSTREAM_REQUEST_DURATION.labels(service, operation, outcome).observe(time.perf_counter() - start)
+
+
+def make_metrics_app():
+    """/metrics için ASGI uygulaması; çok süreçli modda tüm süreçleri birleştirir"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return make_asgi_app(registry)
+    return make_asgi_app()
+
+
+def mark_process_dead() -> None:
+    """Kapanan sürecin canlı gauge değerlerini çok süreçli dizinden temizle"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(os.getpid())
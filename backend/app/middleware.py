@@ -0,0 +1,223 @@
+import time
+import uuid
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.auth import AuthUser, auth_user_from_token
+from app.config import settings
+from app.database import SessionLocal
+from app.metrics import (
+    DB_SECONDS_PER_REQUEST,
+    DB_STATEMENTS_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+    RequestStats,
+    current_request_stats,
+)
+from app.profiling import create_profiler, profiling_requested, save_profile
+
+
+class BodySizeLimitMiddleware:
+    """Belirli path'lerde istek gövdesini okunurken sınırla.
+
+    Content-Length sınırı aşıyorsa gövde hiç okunmadan, chunked isteklerde
+    ise sınır aşıldığı anda 413 döner; böylece büyük dosyalar diske
+    spool edilmeden reddedilir.
+    """
+
+    def __init__(self, app: ASGIApp, path_prefix: str, max_body_size: int):
+        self.app = app
+        self.path_prefix = path_prefix
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None:
+            try:
+                declared = int(content_length)
+            except ValueError:
+                await self._reject(send, 400, b"Invalid Content-Length header")
+                return
+            if declared > self.max_body_size:
+                await self._reject(send)
+                return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    raise _BodyTooLarge()
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except _BodyTooLarge:
+            if not response_started:
+                await self._reject(send)
+
+    @staticmethod
+    async def _reject(send: Send, status: int = 413, detail: bytes = b"Uploaded file is too large") -> None:
+        body = b'{"detail":"' + detail + b'"}'
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class _BodyTooLarge(HTTPException):
+    # HTTPException olduğundan FastAPI gövde ayrıştırırken 400'e çevirmez
+    def __init__(self):
+        super().__init__(status_code=413, detail="Uploaded file is too large")
+
+
+def route_template(scope: Scope) -> str:
+    """İsteğin eşleştiği route şablonu ("/blog/{slug}"); ham path etiket sayısını patlatır"""
+    partial = None
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or "<unmatched>"
+
+
+class MetricsMiddleware:
+    """İstek sayısı, süresi, eşzamanlı istekler ve istek başına SQL metrikleri"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope)
+        status_code = 500
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, tracking_send)
+        finally:
+            HTTP_REQUEST_DURATION.labels(method, route).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+            in_progress.dec()
+            DB_STATEMENTS_PER_REQUEST.labels(route).observe(stats.statements)
+            DB_SECONDS_PER_REQUEST.labels(route).observe(stats.db_seconds)
+            current_request_stats.reset(token)
+
+
+def _profiling_admin(headers: Headers) -> Optional[AuthUser]:
+    """İsteği yapan yöneticiyse kullanıcıyı, değilse None döndür"""
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    db = SessionLocal()
+    try:
+        user = auth_user_from_token(db, token)
+    except HTTPException:
+        # Geçersiz token'a route'un kendisi yanıt verir
+        return None
+    finally:
+        db.close()
+    return user if user.role == "admin" else None
+
+
+class ProfilingMiddleware:
+    """X-Profile: 1 ya da ?profile=1 ile gelen yönetici isteklerini profille.
+
+    Profil kimliği X-Profile-Id başlığında döner; sonuç /admin/profiles/{id}
+    adresinden alınır. Threadpool'da çalışan kod örneklenmez, SQL süreleri
+    ise ayrıca kaydedilir.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.PROFILING_ENABLED or not profiling_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # Yönetici olmayanların profil isteği yok sayılır; istek normal işlenir
+        user = await run_in_threadpool(_profiling_admin, Headers(scope=scope))
+        profiler = create_profiler() if user is not None else None
+        if profiler is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+        status_code = 500
+        # MetricsMiddleware'in açtığı istatistik nesnesi varsa ona eklenir
+        stats = current_request_stats.get()
+        token = None
+        if stats is None:
+            stats = RequestStats()
+            token = current_request_stats.set(stats)
+        stats.statement_log = []
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, tracking_send)
+        finally:
+            profiler.stop()
+            meta = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route_template(scope),
+                "status": status_code,
+                "duration": round(time.perf_counter() - start, 6),
+                "user_id": user.id,
+            }
+            statement_log, stats.statement_log = stats.statement_log, None
+            if token is not None:
+                current_request_stats.reset(token)
+            await run_in_threadpool(save_profile, profile_id, meta, profiler.last_session, statement_log)
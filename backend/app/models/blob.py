@@ -0,0 +1,49 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, JSON, event, inspect, update
+from app.database import Base
+
+class StoredBlob(Base):
+    """SHA-256 özetiyle adreslenen yüklenmiş içerik"""
+    __tablename__ = "blobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    sha256 = Column(String(64), unique=True, nullable=False, index=True)
+    kind = Column(String, nullable=False)  # "image" (WebP varyantları) ya da "raw" (dosya olduğu gibi)
+    ext = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    meta = Column(JSON, nullable=True)  # görseller için boyutlar, varyantlar ve placeholder
+    # User.profile_blob_id referans sayısı; yazılardaki bağlantıları GC içerik taramasıyla bulur
+    ref_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    # Aynı içerik tekrar yüklendiğinde güncellenir; GC bekleme süresi buna göre hesaplanır
+    last_uploaded_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+def _adjust_ref_count(connection, blob_id, delta: int) -> None:
+    if blob_id is None:
+        return
+    connection.execute(
+        update(StoredBlob)
+        .where(StoredBlob.id == blob_id)
+        .values(ref_count=StoredBlob.ref_count + delta)
+    )
+
+
+def track_blob_reference(model, attr: str) -> None:
+    """model.attr kolonundaki blob referanslarını flush sırasında ref_count'a yansıt"""
+
+    @event.listens_for(model, "after_insert")
+    def _after_insert(mapper, connection, target):
+        _adjust_ref_count(connection, getattr(target, attr), 1)
+
+    @event.listens_for(model, "after_update")
+    def _after_update(mapper, connection, target):
+        history = inspect(target).attrs[attr].history
+        for old in history.deleted:
+            _adjust_ref_count(connection, old, -1)
+        for new in history.added:
+            _adjust_ref_count(connection, new, 1)
+
+    @event.listens_for(model, "after_delete")
+    def _after_delete(mapper, connection, target):
+        _adjust_ref_count(connection, getattr(target, attr), -1)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -16,6 +16,10 @@ class BlogPost(Base):
     is_approved = Column(Boolean, default=False)
     views = Column(Integer, default=0)
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Liste kartları için users/blog_comments'e join yapmadan okunan kopyalar;
+    # yorum ve kullanıcı adı değişikliklerinde güncellenir (app.backfill ile onarılır)
+    author_username = Column(String, nullable=True)
+    comment_count = Column(Integer, default=0, server_default=text("0"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -23,11 +27,26 @@ class BlogPost(Base):
     attachments = relationship("BlogAttachment", back_populates="post", cascade="all, delete-orphan")
     comments = relationship("BlogComment", back_populates="post", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Public liste için keyset pagination indeksi
+        Index(
+            "ix_blog_posts_public_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("is_published AND is_approved"),
+            # SQLite partial indeksi yalnızca sorguyla aynı biçimdeki koşulda kullanır;
+            # SQLAlchemy Boolean filtreyi SQLite'ta "= 1" olarak yazar
+            sqlite_where=text("is_published = 1 AND is_approved = 1"),
+        ),
+        # Yazarın kendi (onaysız/taslak) yazıları için
+        Index("ix_blog_posts_author_id_created_at", "author_id", "created_at"),
+    )
+
 class BlogAttachment(Base):
     __tablename__ = "blog_attachments"
     
     id = Column(Integer, primary_key=True, index=True)
-    post_id = Column(Integer, ForeignKey("blog_posts.id"), nullable=False)
+    post_id = Column(Integer, ForeignKey("blog_posts.id"), nullable=False, index=True)
     filename = Column(String, nullable=False)
     file_url = Column(String, nullable=False)
     file_type = Column(String)
@@ -41,10 +60,15 @@ class BlogComment(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     post_id = Column(Integer, ForeignKey("blog_posts.id"), nullable=False)
-    author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    author_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     post = relationship("BlogPost", back_populates="comments")
-    author = relationship("User")
\ No newline at end of file
+    author = relationship("User")
+
+    __table_args__ = (
+        # Yorum sayfaları için keyset pagination indeksi (post_id tek başına da bunu kullanır)
+        Index("ix_blog_comments_post_id_created_at_id", "post_id", "created_at", "id"),
+    )
\ No newline at end of file
@@ -1,6 +1,7 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
 from app.database import Base
+from app.models.blob import track_blob_reference
 from sqlalchemy.orm import relationship
 
 class User(Base):
@@ -15,6 +16,9 @@ class User(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     approved_at = Column(DateTime, nullable=True)
     profile_image = Column(String, nullable=True)
+    profile_blob_id = Column(Integer, ForeignKey("blobs.id"), nullable=True, index=True)
 
     blog_posts = relationship("BlogPost", back_populates="author")
-    
\ No newline at end of file
+
+
+track_blob_reference(User, "profile_blob_id")
@@ -0,0 +1,67 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import bcrypt
+from fastapi import HTTPException
+
+from app.config import settings
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_in_flight = 0
+
+
+def _hash(password: bytes, rounds: int) -> str:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds)).decode("utf-8")
+
+
+def _check(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def _run(fn, *args):
+    """bcrypt işini ayrı süreç havuzunda çalıştır; kuyruk doluysa 503 dön"""
+    global _in_flight
+    if _in_flight >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=503,
+            detail="Authentication service is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+    _in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_executor(), fn, *args)
+    finally:
+        _in_flight -= 1
+
+
+async def hash_password(password: str) -> str:
+    return await _run(_hash, password.encode("utf-8"), settings.BCRYPT_ROUNDS)
+
+
+async def verify_password(password: str, hashed: str) -> bool:
+    return await _run(_check, password.encode("utf-8"), hashed.encode("utf-8"))
+
+
+def needs_rehash(hashed: str) -> bool:
+    """Kayıtlı hash'in maliyet faktörü ayarlardakinden farklı mı"""
+    try:
+        return int(hashed.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
@@ -0,0 +1,89 @@
+"""Yöneticilerin işaretlediği istekler için profil kaydı (pyinstrument + SQL süreleri).
+
+Profiller Redis'te PROFILE_TTL süresince tutulur ve /admin/profiles/{id}
+üzerinden HTML ya da speedscope JSON olarak alınır.
+"""
+import json
+import logging
+import time
+from typing import Optional
+from urllib.parse import parse_qs
+
+import redis
+from starlette.datastructures import Headers
+from starlette.types import Scope
+
+from app.cache import redis_client
+from app.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY_PARAM = "profile"
+_TRUE_VALUES = {"1", "true", "yes"}
+
+
+def profile_key(profile_id: str) -> str:
+    return f"profile:{profile_id}"
+
+
+def profiling_requested(scope: Scope) -> bool:
+    """İstek X-Profile başlığı ya da ?profile=1 ile profil istiyor mu"""
+    value = Headers(scope=scope).get(PROFILE_HEADER)
+    if value is None and scope.get("query_string"):
+        values = parse_qs(scope["query_string"].decode("latin-1")).get(PROFILE_QUERY_PARAM)
+        value = values[-1] if values else None
+    return value is not None and value.lower() in _TRUE_VALUES
+
+
+def create_profiler():
+    """pyinstrument kurulu değilse None; istek profillenmeden işlenir"""
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        logger.warning("Profiling requested but pyinstrument is not installed")
+        return None
+    # async_mode: await edilen süre de isteğin profiline yazılır
+    return Profiler(interval=settings.PROFILING_INTERVAL, async_mode="enabled")
+
+
+def save_profile(profile_id: str, meta: dict, session, statement_log: list) -> None:
+    statements = [
+        {"statement": statement, "duration": round(duration, 6)}
+        for statement, duration in statement_log[: settings.PROFILE_MAX_STATEMENTS]
+    ]
+    data = {
+        **meta,
+        "id": profile_id,
+        "created_at": time.time(),
+        "sql": {
+            "count": len(statement_log),
+            "seconds": round(sum(duration for _, duration in statement_log), 6),
+            "statements": statements,
+        },
+        "session": session.to_json(),
+    }
+    try:
+        redis_client.set(profile_key(profile_id), json.dumps(data), ex=settings.PROFILE_TTL)
+    except redis.RedisError:
+        logger.exception("Could not store profile %s", profile_id)
+
+
+def load_profile(profile_id: str) -> Optional[dict]:
+    raw = redis_client.get(profile_key(profile_id))
+    return json.loads(raw) if raw else None
+
+
+def render_html(data: dict) -> str:
+    from pyinstrument.renderers import HTMLRenderer
+    from pyinstrument.session import Session
+
+    return HTMLRenderer().render(Session.from_json(data["session"]))
+
+
+def render_speedscope(data: dict) -> str:
+    from pyinstrument.renderers import SpeedscopeRenderer
+    from pyinstrument.session import Session
+
+    return SpeedscopeRenderer().render(Session.from_json(data["session"]))
@@ -2,24 +2,24 @@ import os
 from datetime import datetime
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import HTMLResponse, Response
 from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 
-from app.auth import get_current_user
+from app.auth import AuthUser, ensure_admin, get_current_user
+from app.cache import invalidate_user_cache
 from app.database import get_db
 from app.models.blog import BlogPost
 from app.models.user import User
+from app.profiling import load_profile, render_html, render_speedscope
 from app.schemas.admin import AdminSecretLogin, AdminUserOut, AdminActionResponse
 from app.schemas.blog import BlogPostOut
+from app.routers.blog import COMMENT_PREVIEW_LIMIT, comment_previews, serialize_post
 
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
-def ensure_admin(current_user: User) -> None:
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Only admins can perform this action")
-
 @router.post("/login")
 def admin_login(payload: AdminSecretLogin):
     expected_secret = os.getenv("ADMIN_PANEL_SECRET")
@@ -40,7 +40,7 @@ def admin_login(payload: AdminSecretLogin):
 def make_admin(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthUser = Depends(get_current_user)
 ):
     """Make a user an admin - only existing admins can do this"""
     ensure_admin(current_user)
@@ -54,6 +54,7 @@ def make_admin(
     if not target_user.approved_at:
         target_user.approved_at = datetime.utcnow()
     db.commit()
+    invalidate_user_cache(target_user.id)
     return {"message": f"User {target_user.username} is now an admin"}
 
 @router.post("/bootstrap-admin")
@@ -75,6 +76,7 @@ def bootstrap_admin(
     user.is_banned = False
     user.approved_at = datetime.utcnow()
     db.commit()
+    invalidate_user_cache(user.id)
     return {"message": f"User {user.username} is now the first admin"}
 
 
@@ -82,7 +84,7 @@ def bootstrap_admin(
 def list_users(
     status: Optional[str] = Query(None, regex="^(pending|banned|active)$"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     ensure_admin(current_user)
 
@@ -121,7 +123,7 @@ def list_users(
 def approve_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     ensure_admin(current_user)
 
@@ -136,6 +138,7 @@ def approve_user(
     target_user.is_banned = False
     target_user.approved_at = datetime.utcnow()
     db.commit()
+    invalidate_user_cache(target_user.id)
     return AdminActionResponse(message=f"{target_user.username} approved successfully")
 
 
@@ -143,7 +146,7 @@ def approve_user(
 def ban_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     ensure_admin(current_user)
 
@@ -159,6 +162,7 @@ def ban_user(
 
     target_user.is_banned = True
     db.commit()
+    invalidate_user_cache(target_user.id)
     return AdminActionResponse(message=f"{target_user.username} has been banned")
 
 
@@ -166,7 +170,7 @@ def ban_user(
 def unban_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     ensure_admin(current_user)
 
@@ -179,6 +183,7 @@ def unban_user(
 
     target_user.is_banned = False
     db.commit()
+    invalidate_user_cache(target_user.id)
     return AdminActionResponse(message=f"{target_user.username} ban removed")
 
 
@@ -186,7 +191,7 @@ def unban_user(
 def get_user_blogs(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     ensure_admin(current_user)
 
@@ -196,9 +201,38 @@ def get_user_blogs(
 
     posts = (
         db.query(BlogPost)
+        .options(
+            joinedload(BlogPost.author),
+            selectinload(BlogPost.attachments),
+        )
         .filter(BlogPost.author_id == user_id)
         .order_by(BlogPost.created_at.desc())
         .all()
     )
-    return posts
+    comments = comment_previews(db, [post.id for post in posts], COMMENT_PREVIEW_LIMIT)
+    return [serialize_post(post, comments[post.id]) for post in posts]
+
+
 
+@router.get("/profiles/{profile_id}")
+def get_profile(
+    profile_id: str,
+    format: str = Query("html", pattern="^(html|speedscope|json)$"),
+    current_user: AuthUser = Depends(get_current_user),
+):
+    """X-Profile ile alınmış profil: HTML, speedscope JSON ya da SQL dökümü (json)"""
+    ensure_admin(current_user)
+
+    data = load_profile(profile_id)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Profile not found or expired")
+
+    if format == "json":
+        return {key: value for key, value in data.items() if key != "session"}
+    if format == "speedscope":
+        return Response(
+            render_speedscope(data),
+            media_type="application/json",
+            headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.speedscope.json"'},
+        )
+    return HTMLResponse(render_html(data))
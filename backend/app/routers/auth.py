@@ -1,29 +1,39 @@
 from datetime import datetime
-import bcrypt
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.auth import create_access_token, get_current_user
-from app.database import get_db
+from app.auth import create_access_token, get_current_user_record_async
+from app.cache import bump_list_version, invalidate_user_cache
+from app.database import get_request_db, release_db, run_db
+from app.jobs import enqueue
+from app.models.blog import BlogComment, BlogPost
 from app.models.user import User
-from app.schemas.user import UserCreate, UserLogin, UserOut, PasswordChangeRequest, EmailChangeRequest
+from app.passwords import hash_password, needs_rehash, verify_password
+from app.schemas.user import UserCreate, UserLogin, UserOut, PasswordChangeRequest, EmailChangeRequest, UsernameChangeRequest
 
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-@router.post("/register")
-def register(user: UserCreate, db: Session = Depends(get_db)):
+# bcrypt işleri süreç havuzunda çalıştığından bu route'lar async;
+# veritabanı işleri run_db ile event loop dışında yapılır. bcrypt beklenirken
+# bağlantı release_db ile havuza geri verilir; aksi halde bir login fırtınası
+# havuzu tüketip ilgisiz istekleri de bekletir
+
+def _ensure_available(db: Session, username: str, email: str) -> None:
     existing_user = db.query(User).filter(
-        (User.username == user.username) | (User.email == user.email)
+        (User.username == username) | (User.email == email)
     ).first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Username or email already registered")
-    
+
+def _create_user(db: Session, user: UserCreate, hashed: str) -> User:
+    _ensure_available(db, user.username, user.email)
     user_count = db.query(User).count()
     is_first_user = user_count == 0
     role = "admin" if is_first_user else "user"
-    hashed = bcrypt.hashpw(user.password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
     db_user = User(
         username=user.username,
         email=user.email,
@@ -37,51 +47,121 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     db.refresh(db_user)
     return db_user
 
+def _get_user_by_username(db: Session, username: str):
+    return db.query(User).filter(User.username == username).first()
+
+def _set_password_hash(db: Session, user_id: int, hashed: str) -> None:
+    db.query(User).filter(User.id == user_id).update({User.hashed_password: hashed})
+    db.commit()
+
+def _check_email_available(db: Session, email: str, user_id: int) -> None:
+    existing = db.query(User).filter(User.email == email).first()
+    if existing and existing.id != user_id:
+        raise HTTPException(status_code=400, detail="Email already in use")
+
+def _change_username(db: Session, user: User, new_username: str) -> list:
+    """Kullanıcı adını ve yazılardaki kopyasını aynı transaction'da değiştir.
+
+    Önbelleği temizlenmesi gereken slug'ları döndürür: kullanıcının yazıları ve
+    yorum önizlemelerinde adı geçen yazılar.
+    """
+    existing = db.query(User.id).filter(User.username == new_username).first()
+    if existing and existing.id != user.id:
+        raise HTTPException(status_code=400, detail="Username already registered")
+    user.username = new_username
+    db.add(user)
+    # Yazar adı içerik güncellemesi sayılmaz; onupdate updated_at'i ilerletmesin
+    db.query(BlogPost).filter(BlogPost.author_id == user.id).update(
+        {BlogPost.author_username: new_username, BlogPost.updated_at: BlogPost.updated_at},
+        synchronize_session=False,
+    )
+    commented = db.query(BlogComment.post_id).filter(BlogComment.author_id == user.id)
+    slugs = [
+        slug
+        for (slug,) in db.query(BlogPost.slug).filter(
+            or_(BlogPost.author_id == user.id, BlogPost.id.in_(commented))
+        )
+    ]
+    db.commit()
+    db.refresh(user)
+    return slugs
+
+def _save(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+@router.post("/register")
+async def register(user: UserCreate, db=Depends(get_request_db)):
+    # Boşuna hash hesaplamamak için önce kontrol et (kayıtta tekrar kontrol edilir)
+    await run_db(db, _ensure_available, user.username, user.email)
+    await release_db(db)
+    hashed = await hash_password(user.password)
+    return await run_db(db, _create_user, user, hashed)
+
 @router.post("/login")
-def login(user: UserLogin, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.username == user.username).first()
+async def login(user: UserLogin, db=Depends(get_request_db)):
+    db_user = await run_db(db, _get_user_by_username, user.username)
     if not db_user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    if not bcrypt.checkpw(user.password.encode("utf-8"), db_user.hashed_password.encode("utf-8")):
+    await release_db(db)
+    if not await verify_password(user.password, db_user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     if db_user.is_banned:
         raise HTTPException(status_code=403, detail="Your account has been banned")
     if not db_user.is_approved:
         raise HTTPException(status_code=403, detail="Hesabınız yönetici onayı bekliyor")
+    # Maliyet faktörü değiştiyse şifreyi yeni ayarlarla tekrar hash'le
+    if needs_rehash(db_user.hashed_password):
+        new_hash = await hash_password(user.password)
+        await run_db(db, _set_password_hash, db_user.id, new_hash)
     access_token = create_access_token(data={"sub": str(db_user.id)})
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserOut)
-def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: User = Depends(get_current_user_record_async)):
     return current_user
 
 @router.put("/change-password")
-def change_password(
+async def change_password(
     payload: PasswordChangeRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db=Depends(get_request_db),
+    current_user: User = Depends(get_current_user_record_async),
 ):
-    if not bcrypt.checkpw(payload.current_password.encode("utf-8"), current_user.hashed_password.encode("utf-8")):
+    await release_db(db)
+    if not await verify_password(payload.current_password, current_user.hashed_password):
         raise HTTPException(status_code=401, detail="Current password is incorrect")
-    new_hash = bcrypt.hashpw(payload.new_password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
-    current_user.hashed_password = new_hash
-    db.add(current_user)
-    db.commit()
+    new_hash = await hash_password(payload.new_password)
+    await run_db(db, _set_password_hash, current_user.id, new_hash)
     return {"message": "Password updated"}
 
 @router.put("/change-email", response_model=UserOut)
-def change_email(
+async def change_email(
     payload: EmailChangeRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db=Depends(get_request_db),
+    current_user: User = Depends(get_current_user_record_async),
 ):
-    if not bcrypt.checkpw(payload.current_password.encode("utf-8"), current_user.hashed_password.encode("utf-8")):
+    await release_db(db)
+    if not await verify_password(payload.current_password, current_user.hashed_password):
         raise HTTPException(status_code=401, detail="Current password is incorrect")
-    existing = db.query(User).filter(User.email == payload.new_email).first()
-    if existing and existing.id != current_user.id:
-        raise HTTPException(status_code=400, detail="Email already in use")
+    await run_db(db, _check_email_available, payload.new_email, current_user.id)
     current_user.email = payload.new_email
-    db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
+    return await run_db(db, _save, current_user)
+
+@router.put("/change-username", response_model=UserOut)
+async def change_username(
+    payload: UsernameChangeRequest,
+    db=Depends(get_request_db),
+    current_user: User = Depends(get_current_user_record_async),
+):
+    await release_db(db)
+    if not await verify_password(payload.current_password, current_user.hashed_password):
+        raise HTTPException(status_code=401, detail="Current password is incorrect")
+    slugs = await run_db(db, _change_username, current_user, payload.new_username)
+    await run_in_threadpool(invalidate_user_cache, current_user.id)
+    # Liste ETag'i hemen değişsin; slug önbellekleri kuyruktaki işte temizlenir
+    await run_in_threadpool(bump_list_version)
+    # Yazar çok yazıya sahip olabilir; önbellek temizliği isteği bekletmesin
+    await run_in_threadpool(enqueue, "purge_post_cache", slugs=slugs)
     return current_user
@@ -1,20 +1,155 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from sqlalchemy.orm import Session, joinedload
-from typing import Dict, List, Optional
-from app.database import get_db
-from app.auth import get_current_user, get_current_user_optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import List, Optional, Tuple
+from app.database import get_db, get_request_db, run_db
+from app.cache import bump_list_version, cache_get_json, cache_set_json, invalidate_post_cache, list_version, post_cache_key
+from app.config import settings
+from app.auth import AuthUser, get_current_user, get_current_user_optional, get_current_user_optional_async
+from app.http_cache import cache_headers, is_not_modified, make_etag, not_modified_response
+from app.search import apply_search, render_snippet
+from app.view_counter import pending_views, register_view
 from app.models.user import User
 from app.models.blog import BlogPost, BlogAttachment, BlogComment
-from app.schemas.blog import BlogPostCreate, BlogPostUpdate, BlogPostOut, BlogPostListItem, BlogTagOut, BlogCommentCreate, BlogCommentOut
+from app.schemas.blog import BlogPostCreate, BlogPostUpdate, BlogPostOut, BlogPostListItem, BlogSearchResult, BlogTagOut, BlogCommentCreate, BlogCommentOut
+import base64
 import re
-from datetime import datetime, timedelta
-from sqlalchemy import or_, and_
+from datetime import datetime
+from sqlalchemy import func, or_, and_, tuple_
 
 router = APIRouter(prefix="/blog", tags=["blog"])
 
-# A simple in-memory tracker to avoid counting duplicate views from the same user/IP
-VIEW_COOLDOWN = timedelta(hours=1)
-recent_views: Dict[str, datetime] = {}
+# Yazı yanıtına gömülen en yeni yorum sayısı; tamamı için /{post_id}/comments
+COMMENT_PREVIEW_LIMIT = 20
+
+def encode_cursor(created_at: datetime, post_id: int) -> str:
+    """(created_at, id) ikilisini opak bir cursor'a çevir"""
+    raw = f"{created_at.isoformat()}|{post_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, post_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|")
+        return datetime.fromisoformat(created_at), int(post_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(400, "Invalid cursor")
+
+def apply_visibility(query, current_user: Optional[AuthUser]):
+    """Admin değilse sadece onaylı ve yayınlanmış postları (ve kullanıcının kendi postlarını) göster"""
+    if not current_user:
+          query = query.filter(
+              BlogPost.is_published == True,
+              BlogPost.is_approved == True
+          )
+    elif current_user.role != "admin":
+          query = query.filter(
+              or_(
+                  and_(
+                      BlogPost.is_published == True,
+                      BlogPost.is_approved == True
+                  ),
+                  BlogPost.author_id == current_user.id
+              )
+          )
+    return query
+
+def visibility_scope(current_user: Optional[AuthUser]) -> str:
+    """apply_visibility'nin hangi yazı kümesini döndürdüğünü belirten anahtar"""
+    if not current_user:
+        return "public"
+    if current_user.role == "admin":
+        return "admin"
+    return f"user:{current_user.id}"
+
+def post_validators(post_dict: dict) -> tuple:
+    """Tek yazı için ETag parçaları (views hariç)"""
+    comments = post_dict["comments"]
+    return (
+        post_dict["id"],
+        _as_datetime(post_dict["updated_at"]).isoformat(),
+        post_dict["author_username"],
+        len(post_dict["attachments"]),
+        post_dict["comment_count"],
+        max((c["id"] for c in comments), default=0),
+        # Yorum yapan kullanıcı adını değiştirirse önizleme değişir
+        ",".join(sorted({c["author_username"] or "" for c in comments})),
+    )
+
+def _as_datetime(value) -> datetime:
+    # Redis'ten gelen dict'lerde tarihler ISO string
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+def list_item_query(db: Session):
+    """Liste kartları content'i kullanmaz; yazar adı ve yorum sayısı blog_posts'ta tutulduğundan join gerekmez"""
+    return db.query(
+        BlogPost.id,
+        BlogPost.title,
+        BlogPost.slug,
+        BlogPost.excerpt,
+        BlogPost.cover_image,
+        BlogPost.is_published,
+        BlogPost.is_approved,
+        BlogPost.views,
+        BlogPost.author_id,
+        BlogPost.created_at,
+        BlogPost.author_username,
+        BlogPost.comment_count,
+    )
+
+def adjust_comment_count(db: Session, post_id: int, delta: int) -> None:
+    """blog_posts.comment_count'u yorum ekleme/silme ile aynı transaction'da güncelle"""
+    db.query(BlogPost).filter(BlogPost.id == post_id).update(
+        {
+            BlogPost.comment_count: BlogPost.comment_count + delta,
+            # Yorumlar yazının içerik güncellemesi sayılmaz
+            BlogPost.updated_at: BlogPost.updated_at,
+        },
+        synchronize_session=False,
+    )
+
+def serialize_post(post: BlogPost, comments: list) -> dict:
+    """BlogPostOut şemasına uygun, JSON'a çevrilebilir dict oluştur
+
+    comments: yazının tüm yorumları değil, comment_rows ile çekilmiş en yeni yorumlar.
+    """
+    return {
+        "id": post.id,
+        "title": post.title,
+        "slug": post.slug,
+        "content": post.content,
+        "excerpt": post.excerpt,
+        "cover_image": post.cover_image,
+        "is_published": post.is_published,
+        "is_approved": post.is_approved,
+        "views": post.views,
+        "author_id": post.author_id,
+        "author_username": post.author.username if post.author else None,
+        "comment_count": post.comment_count or 0,
+        "created_at": post.created_at,
+        "updated_at": post.updated_at,
+        "attachments": [
+            {
+                "id": a.id,
+                "filename": a.filename,
+                "file_url": a.file_url,
+                "file_type": a.file_type,
+                "file_size": a.file_size,
+                "uploaded_at": a.uploaded_at,
+            }
+            for a in post.attachments
+        ],
+        "comments": comments,
+    }
+
+def trusted_response(content, headers: Optional[dict] = None) -> ORJSONResponse:
+    """Sorgudan/serialize_post'tan şemayla birebir aynı alanlarla gelen veriyi doğrudan döndür.
+
+    Response nesnesi döndüğünde FastAPI response_model doğrulamasını atlar;
+    response_model route'ta yalnızca OpenAPI şeması için kalır.
+    """
+    return ORJSONResponse(content, headers=headers)
 
 def create_slug(title: str) -> str:
     """Başlıktan URL-friendly slug oluştur"""
@@ -28,7 +163,7 @@ def create_slug(title: str) -> str:
 def create_blog_post(
     post: BlogPostCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthUser = Depends(get_current_user)
 ):
     """Yeni blog yazısı oluştur (tüm kullanıcılar)"""
     slug = create_slug(post.title)
@@ -48,11 +183,13 @@ def create_blog_post(
         cover_image=post.cover_image,
         is_published=post.is_published,
         is_approved=is_approved,
-        author_id=current_user.id
+        author_id=current_user.id,
+        author_username=current_user.username,
     )
     db.add(db_post)
     db.commit()
     db.refresh(db_post)
+    bump_list_version()
     
     # Etiketleri ekle
     # for tag_id in post.tag_ids:
@@ -63,66 +200,129 @@ def create_blog_post(
     
     return db_post
 
+def fetch_post_list(db: Session, current_user: Optional[AuthUser], skip: int, limit: int, cursor_key: Optional[tuple]) -> list:
+    query = list_item_query(db)
+    
+    query = apply_visibility(query, current_user)
+    
+    # if tag:
+    #     query = query.join(BlogPost.tags).filter(BlogTag.slug == tag)
+    
+    query = query.order_by(BlogPost.created_at.desc(), BlogPost.id.desc())
+    if cursor_key:
+        query = query.filter(tuple_(BlogPost.created_at, BlogPost.id) < tuple_(*cursor_key))
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
 @router.get("/", response_model=List[BlogPostListItem])
-def list_blog_posts(
+async def list_blog_posts(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Önceki sayfanın X-Next-Cursor değeri"),
     # tag: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user_optional)
+    db=Depends(get_request_db),
+    current_user: Optional[AuthUser] = Depends(get_current_user_optional_async)
 ):
-    """Blog listesi (public: sadece onaylı ve yayınlanmış, admin: hepsi)"""
-    query = db.query(BlogPost)
-    
-    # Admin değilse sadece onaylı ve yayınlanmış postları göster
-    if not current_user:
-          query = query.filter(
-              BlogPost.is_published == True,
-              BlogPost.is_approved == True
-          )
-    elif current_user.role != "admin":
-          query = query.filter(
-              or_(
-                  and_(
-                      BlogPost.is_published == True,
-                      BlogPost.is_approved == True
-                  ),
-                  BlogPost.author_id == current_user.id
-              )
-          )
+    """Blog listesi (public: sadece onaylı ve yayınlanmış, admin: hepsi)
+
+    Sonraki sayfanın cursor'ı X-Next-Cursor header'ında döner. cursor verilirse
+    skip yok sayılır ve sayfa derinliğinden bağımsız keyset sorgusu kullanılır.
+    Liste değişmediyse yazılar hiç sorgulanmadan 304 döner.
+    """
+    cursor_key = decode_cursor(cursor) if cursor else None
+    # ETag tablo taraması yerine yazı/yorum değişikliklerinde artan sürümden türetilir;
+    # görüntülenme flush'ı sürümü artırmaz, sayaçlar ETag'e girmez
+    version = await run_in_threadpool(list_version)
+    scope = visibility_scope(current_user)
+    if version is None:
+        # Sürüm okunamadıysa doğrulanamayan yanıt önbelleğe alınmasın
+        headers = {"Vary": "Authorization", "Cache-Control": "no-store"}
+    else:
+        headers = cache_headers(make_etag("list", scope, version), public=scope == "public")
+        if is_not_modified(request.headers, headers["ETag"]):
+            return not_modified_response(headers)
+
+    rows = await run_db(db, fetch_post_list, current_user, skip, limit, cursor_key)
+    if len(rows) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    # Redis istemcisi senkron; event loop'u bloklamamak için threadpool'da çağrılır
+    pending = await run_in_threadpool(pending_views, [row.id for row in rows])
+    result = []
+    for row in rows:
+        post_dict = row._asdict()
+        post_dict["views"] = (row.views or 0) + pending.get(row.id, 0)
+        result.append(post_dict)
     
-    # if tag:
-    #     query = query.join(BlogPost.tags).filter(BlogTag.slug == tag)
+    return trusted_response(result, headers)
+
+@router.get("/search", response_model=List[BlogSearchResult])
+def search_blog_posts(
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: Optional[AuthUser] = Depends(get_current_user_optional)
+):
+    """Başlık, özet ve içerikte tam metin arama (alaka sırasına göre)"""
+    q = q.strip()
+    if not q:
+        raise HTTPException(400, "Search query cannot be empty")
     
-    query = query.order_by(BlogPost.created_at.desc())
-    posts = query.offset(skip).limit(limit).all()
+    query = apply_visibility(list_item_query(db), current_user)
+    query = apply_search(query, q, db.get_bind().dialect.name)
+    rows = query.offset(skip).limit(limit).all()
+    pending = pending_views(row.id for row in rows)
     result = []
-    for post in posts:
-        post_dict = {
-            "id": post.id,
-            "title": post.title,
-            "slug": post.slug,
-            "excerpt": post.excerpt,
-            "cover_image": post.cover_image,
-            "is_published": post.is_published,
-            "is_approved": post.is_approved,
-            "views": post.views,
-            "author_id": post.author_id,
-            "author_username": post.author.username if post.author else None,
-            "created_at": post.created_at,
-        }
+    for row in rows:
+        post_dict = row._asdict()
+        post_dict["views"] = (row.views or 0) + pending.get(row.id, 0)
+        post_dict["snippet"] = render_snippet(row.snippet)
         result.append(post_dict)
     
-    return result
+    return trusted_response(result)
+
+def fetch_views(db: Session, post_ids: List[int], current_user: Optional[AuthUser]) -> dict:
+    query = apply_visibility(db.query(BlogPost.id, BlogPost.views), current_user)
+    return {post_id: views or 0 for post_id, views in query.filter(BlogPost.id.in_(post_ids))}
+
+@router.get("/views")
+async def get_view_counts(
+    response: Response,
+    ids: List[int] = Query(..., max_length=100),
+    db=Depends(get_request_db),
+    current_user: Optional[AuthUser] = Depends(get_current_user_optional_async)
+):
+    """Güncel görüntülenme sayıları; önbelleklenen yazı/liste yanıtlarından bağımsız"""
+    views = await run_db(db, fetch_views, ids, current_user)
+    pending = await run_in_threadpool(pending_views, list(views.keys()))
+    for post_id, count in pending.items():
+        views[post_id] += count
+    response.headers["Cache-Control"] = "no-store"
+    return views
+
+@router.post("/{post_id}/view")
+async def record_view(
+    post_id: int,
+    request: Request,
+    db=Depends(get_request_db),
+    current_user: Optional[AuthUser] = Depends(get_current_user_optional_async)
+):
+    """CDN'den sunulan sayfalar için görüntülenme bildirimi"""
+    if not await run_db(db, fetch_views, [post_id], current_user):
+        raise HTTPException(404, "Blog post not found")
+    viewer_identifier = str(current_user.id) if current_user else (request.client.host if request.client else "anonymous")
+    return {"counted": await run_in_threadpool(register_view, post_id, viewer_identifier)}
 
 @router.get("/id/{post_id}", response_model=BlogPostOut)
 def get_blog_post_by_id(
     post_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthUser = Depends(get_current_user)
 ):
     """Blog yazısını ID ile getir (yazar ve admin için)"""
-    post = db.query(BlogPost).options(joinedload(BlogPost.author), joinedload(BlogPost.comments).joinedload(BlogComment.author)).filter(BlogPost.id == post_id).first()
+    post = db.query(BlogPost).options(joinedload(BlogPost.author), selectinload(BlogPost.attachments)).filter(BlogPost.id == post_id).first()
     if not post:
         raise HTTPException(404, "Blog post not found")
     
@@ -130,92 +330,63 @@ def get_blog_post_by_id(
     if current_user.role != "admin" and post.author_id != current_user.id:
         raise HTTPException(403, "You don't have permission to access this post")
     
-    post_dict = {
-        "id": post.id,
-        "title": post.title,
-        "slug": post.slug,
-        "content": post.content,
-        "excerpt": post.excerpt,
-        "cover_image": post.cover_image,
-        "is_published": post.is_published,
-        "is_approved": post.is_approved,
-        "views": post.views,
-        "author_id": post.author_id,
-        "author_username": post.author.username if post.author else None,
-        "created_at": post.created_at,
-        "updated_at": post.updated_at,
-        "attachments": post.attachments,
-        "comments": [
-        {
-            "id": c.id,
-            "post_id": c.post_id,
-            "content": c.content,
-            "author_id": c.author_id,
-            "author_username": c.author.username if c.author else None,
-            "created_at": c.created_at,
-        }
-        for c in post.comments
-    ],
-    }
-    return post_dict
+    comments, _ = comment_rows(db, post.id, COMMENT_PREVIEW_LIMIT)
+    return trusted_response(serialize_post(post, comments))
+
+def load_post_by_slug(db: Session, slug: str) -> Optional[dict]:
+    post = db.query(BlogPost).options(joinedload(BlogPost.author), selectinload(BlogPost.attachments)).filter(BlogPost.slug == slug).first()
+    if not post:
+        return None
+    comments, _ = comment_rows(db, post.id, COMMENT_PREVIEW_LIMIT)
+    return serialize_post(post, comments)
 
 @router.get("/{slug}", response_model=BlogPostOut)
-def get_blog_post(
+async def get_blog_post(
     slug: str,
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user_optional)
+    db=Depends(get_request_db),
+    current_user: Optional[AuthUser] = Depends(get_current_user_optional_async)
 ):
-    """Tek blog yazısı (slug ile)"""
-    post = db.query(BlogPost).options(joinedload(BlogPost.author), joinedload(BlogPost.comments).joinedload(BlogComment.author)).filter(BlogPost.slug == slug).first()
-    if not post:
-        raise HTTPException(404, "Blog post not found")
+    """Tek blog yazısı (slug ile)
+
+    ETag görüntülenme sayısını içermez; güncel sayılar için /blog/views.
+    """
+    cache_key = post_cache_key(slug)
+    # Redis istemcisi senkron; event loop'u bloklamamak için threadpool'da çağrılır
+    post_dict = await run_in_threadpool(cache_get_json, cache_key)
+    views = None
+    if post_dict is None:
+        post_dict = await run_db(db, load_post_by_slug, slug)
+        if not post_dict:
+            raise HTTPException(404, "Blog post not found")
+        # views önbelleğe girmez; görüntülenme flush'ı önbelleği silmek zorunda kalmaz
+        views = post_dict.pop("views")
+        # Sadece herkese açık yazılar önbelleğe alınır
+        if post_dict["is_published"] and post_dict["is_approved"]:
+            await run_in_threadpool(cache_set_json, cache_key, post_dict, settings.POST_CACHE_TTL)
     
     # Onaysız veya yayınlanmamış ise sadece yazar veya admin görebilir
-    if not post.is_published or not post.is_approved:
+    if not post_dict["is_published"] or not post_dict["is_approved"]:
         if not current_user:
             raise HTTPException(403, "This post is not available")
-        if current_user.role != "admin" and post.author_id != current_user.id:
+        if current_user.role != "admin" and post_dict["author_id"] != current_user.id:
             raise HTTPException(403, "This post is not available")
     
     viewer_identifier = str(current_user.id) if current_user else (request.client.host if request.client else "anonymous")
-    view_key = f"{post.id}:{viewer_identifier}"
-    now = datetime.utcnow()
-    last_view = recent_views.get(view_key)
-    if not last_view or now - last_view > VIEW_COOLDOWN:
-        post.views += 1
-        db.commit()
-        recent_views[view_key] = now
-    
-    post_dict = {
-        "id": post.id,
-        "title": post.title,
-        "slug": post.slug,
-        "content": post.content,
-        "excerpt": post.excerpt,
-        "cover_image": post.cover_image,
-        "is_published": post.is_published,
-        "is_approved": post.is_approved,
-        "views": post.views,
-        "author_id": post.author_id,
-        "author_username": post.author.username if post.author else None,
-        "created_at": post.created_at,
-        "updated_at": post.updated_at,
-        "attachments": post.attachments,
-        "comments": [
-        {
-            "id": c.id,
-            "post_id": c.post_id,
-            "content": c.content,
-            "author_id": c.author_id,
-            "author_username": c.author.username if c.author else None,
-            "created_at": c.created_at,
-        }
-        for c in post.comments
-    ],
-    }
-    
-    return post_dict
+    await run_in_threadpool(register_view, post_dict["id"], viewer_identifier)
+
+    # Liste gibi yalnızca ETag; yorum silmek hiçbir zaman damgasını ilerletmez
+    is_public = post_dict["is_published"] and post_dict["is_approved"]
+    headers = cache_headers(make_etag("post", *post_validators(post_dict)), public=is_public and not current_user)
+    if is_not_modified(request.headers, headers["ETag"]):
+        return not_modified_response(headers)
+
+    # Veritabanındaki sayıya henüz flush edilmemiş görüntülenmeleri ekle
+    if views is None:
+        views = (await run_db(db, fetch_views, [post_dict["id"]], current_user)).get(post_dict["id"])
+    pending = await run_in_threadpool(pending_views, [post_dict["id"]])
+    post_dict["views"] = (views or 0) + pending.get(post_dict["id"], 0)
+    return trusted_response(post_dict, headers)
     
 
 @router.put("/{post_id}", response_model=BlogPostOut)
@@ -223,7 +394,7 @@ def update_blog_post(
     post_id: int,
     post_update: BlogPostUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthUser = Depends(get_current_user)
 ):
     """Blog yazısını güncelle (yazar veya admin)"""
     db_post = db.get(BlogPost, post_id)
@@ -240,6 +411,7 @@ def update_blog_post(
     if current_user.role != "admin" and "is_approved" in update_data:
         update_data.pop("is_approved")
     
+    old_slug = db_post.slug
     if "title" in update_data:
         db_post.slug = create_slug(update_data["title"])
     
@@ -262,13 +434,14 @@ def update_blog_post(
     db_post.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(db_post)
+    invalidate_post_cache(old_slug, db_post.slug)
     return db_post
 
 @router.delete("/{post_id}")
 def delete_blog_post(
     post_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthUser = Depends(get_current_user)
 ):
     """Blog yazısını sil (yazar veya admin)"""
     db_post = db.get(BlogPost, post_id)
@@ -279,15 +452,17 @@ def delete_blog_post(
     if current_user.role != "admin" and db_post.author_id != current_user.id:
         raise HTTPException(403, "You don't have permission to delete this post")
     
+    slug = db_post.slug
     db.delete(db_post)
     db.commit()
+    invalidate_post_cache(slug)
     return {"message": "Blog post deleted"}
 
 @router.post("/{post_id}/approve")
 def approve_blog_post(
     post_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthUser = Depends(get_current_user)
 ):
     """Blog yazısını onayla (sadece admin)"""
     if current_user.role != "admin":
@@ -299,13 +474,14 @@ def approve_blog_post(
     
     db_post.is_approved = True
     db.commit()
+    invalidate_post_cache(db_post.slug)
     return {"message": "Blog post approved"}
 
 @router.post("/{post_id}/unapprove")
 def unapprove_blog_post(
     post_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthUser = Depends(get_current_user)
 ):
     """Blog yazısının onayını kaldır (sadece admin)"""
     if current_user.role != "admin":
@@ -317,6 +493,7 @@ def unapprove_blog_post(
     
     db_post.is_approved = False
     db.commit()
+    invalidate_post_cache(db_post.slug)
     return {"message": "Blog post approval removed"}
 
 # Tag yönetimi (Kaldırıldı/Devre dışı bırakıldı)
@@ -351,7 +528,7 @@ def create_comment(
     post_id: int,
     comment: BlogCommentCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthUser = Depends(get_current_user)
 
 ):
     """Yeni yorum oluştur"""
@@ -365,8 +542,10 @@ def create_comment(
         author_id=current_user.id,
     )
     db.add(db_comment)
+    adjust_comment_count(db, post_id, 1)
     db.commit()
     db.refresh(db_comment)
+    invalidate_post_cache(db_post.slug)
     return {
     "id": db_comment.id,
     "post_id": db_comment.post_id,
@@ -376,26 +555,94 @@ def create_comment(
     "created_at": db_comment.created_at,
 }
 
+def comment_query(db: Session):
+    return db.query(
+        BlogComment.id,
+        BlogComment.post_id,
+        BlogComment.content,
+        BlogComment.author_id,
+        User.username.label("author_username"),
+        BlogComment.created_at,
+    ).outerjoin(User, User.id == BlogComment.author_id)
+
+def comment_rows(
+    db: Session,
+    post_id: int,
+    limit: int,
+    before: Optional[tuple] = None,
+    since: Optional[tuple] = None,
+) -> Tuple[list, bool]:
+    """(post_id, created_at, id) indeksi üzerinden eskiden yeniye sıralı bir yorum sayfası.
+
+    since verilirse cursor'dan sonraki ilk limit yorum, aksi halde cursor'dan
+    (ya da en sondan) önceki en yeni limit yorum döner. İkinci değer o yönde
+    daha fazla yorum olup olmadığını belirtir.
+    """
+    key = tuple_(BlogComment.created_at, BlogComment.id)
+    query = comment_query(db).filter(BlogComment.post_id == post_id)
+    if since:
+        rows = query.filter(key > tuple_(*since)).order_by(BlogComment.created_at, BlogComment.id).limit(limit + 1).all()
+    else:
+        if before:
+            query = query.filter(key < tuple_(*before))
+        rows = query.order_by(BlogComment.created_at.desc(), BlogComment.id.desc()).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not since:
+        rows.reverse()
+    return [row._asdict() for row in rows], has_more
+
+def comment_previews(db: Session, post_ids: List[int], limit: int) -> dict:
+    """Birden çok yazının en yeni limit yorumunu tek sorguda çek (post_id -> eskiden yeniye liste)"""
+    rank = func.row_number().over(
+        partition_by=BlogComment.post_id,
+        order_by=(BlogComment.created_at.desc(), BlogComment.id.desc()),
+    ).label("rank")
+    ranked = comment_query(db).add_columns(rank).filter(BlogComment.post_id.in_(post_ids)).subquery()
+    columns = [c for c in ranked.c if c.name != "rank"]
+    rows = (
+        db.query(*columns)
+        .filter(ranked.c.rank <= limit)
+        .order_by(ranked.c.post_id, ranked.c.created_at, ranked.c.id)
+        .all()
+    )
+    previews = {post_id: [] for post_id in post_ids}
+    for row in rows:
+        previews[row.post_id].append(row._asdict())
+    return previews
+
+def fetch_comments(db: Session, post_id: int, limit: int, before: Optional[tuple], since: Optional[tuple]) -> Tuple[list, bool]:
+    if not db.query(BlogPost.id).filter(BlogPost.id == post_id).first():
+        raise HTTPException(404, "Blog post not found")
+    return comment_rows(db, post_id, limit, before, since)
+
 @router.get("/{post_id}/comments", response_model=List[BlogCommentOut])
-def list_comments(
+async def list_comments(
     post_id: int,
-    db: Session = Depends(get_db),
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[str] = Query(None, description="Daha eski yorumlar için X-Before-Cursor değeri"),
+    since: Optional[str] = Query(None, description="Yeni gelen yorumlar için X-Since-Cursor değeri"),
+    db=Depends(get_request_db),
 ):
-    """Yorumları listele"""
-    db_post = db.get(BlogPost, post_id)
-    if not db_post:
-        raise HTTPException(404, "Blog post not found")
-    return [
-    {
-        "id": c.id,
-        "post_id": c.post_id,
-        "content": c.content,
-        "author_id": c.author_id,
-        "author_username": c.author.username if c.author else None,
-        "created_at": c.created_at,
-    }
-    for c in db_post.comments
-]
+    """Yorumları eskiden yeniye listele (varsayılan: en yeni limit yorum)
+
+    Daha eski yorum varsa X-Before-Cursor döner; X-Since-Cursor ile sonradan
+    eklenen yorumlar artımlı olarak çekilebilir.
+    """
+    if before and since:
+        raise HTTPException(400, "Use either before or since, not both")
+    before_key = decode_cursor(before) if before else None
+    since_key = decode_cursor(since) if since else None
+    rows, has_more = await run_db(db, fetch_comments, post_id, limit, before_key, since_key)
+
+    headers = {}
+    if has_more and not since:
+        headers["X-Before-Cursor"] = encode_cursor(rows[0]["created_at"], rows[0]["id"])
+    if rows:
+        headers["X-Since-Cursor"] = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    elif since:
+        headers["X-Since-Cursor"] = since
+    return trusted_response(rows, headers)
 
 
 @router.delete("/{post_id}/comments/{comment_id}")
@@ -403,12 +650,15 @@ def delete_comment(
     post_id: int,
     comment_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthUser = Depends(get_current_user)
 ):
     """Yorumu sil (yazar veya admin)"""
     db_comment = db.get(BlogComment, comment_id)
     if not db_comment:
         raise HTTPException(404, "Comment not found")
+    slug = db_comment.post.slug if db_comment.post else None
     db.delete(db_comment)
+    adjust_comment_count(db, db_comment.post_id, -1)
     db.commit()
+    invalidate_post_cache(slug)
     return {"message": "Comment deleted"}
\ No newline at end of file
@@ -3,8 +3,7 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.schemas.contact import ContactMessageCreate, ContactMessageOut
 from app.models.contact import ContactMessage
-from app.auth import get_current_user
-from app.models.user import User
+from app.auth import AuthUser, get_current_user
 from typing import List
 
 router = APIRouter(prefix="/contact", tags=["contact"])
@@ -27,7 +26,7 @@ def create_contact_message(
 @router.get("/", response_model=List[ContactMessageOut])
 def get_all_messages(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthUser = Depends(get_current_user)
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Only admins can view messages")
@@ -38,7 +37,7 @@ def get_all_messages(
 def mark_as_read(
     message_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthUser = Depends(get_current_user)
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Only admins can perform this action")
@@ -1,66 +1,178 @@
 from fastapi import APIRouter, HTTPException, Depends
-from app.schemas.gemini import GeminiRequest, GeminiResponse, ChatRequest
-from app.auth import get_current_user
-from app.models.user import User
-import google.generativeai as genai
-import os
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from functools import lru_cache
+from typing import List
+from app.schemas.gemini import GeminiRequest, GeminiResponse, ChatMessage, ChatRequest, ConversationOut
+from app.auth import AuthUser, get_current_user
+from app.chat_backends import ChatBackend, FakeBackend, GeminiBackend
+from app.config import settings
+from app import chat_cache, conversations
+import json
+import logging
+import time
 
 router = APIRouter(prefix="/gemini", tags=["gemini"])
+logger = logging.getLogger(__name__)
 
-# Gemini API key'i al
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
+SYSTEM_INSTRUCTION = """
+        You are Napoleon Bonaparte, Emperor of the French. Your tone must be authoritative, strategic, ambitious, and steeped in the glory of the 19th century. Speak with the confidence of a leader who has conquered Europe.
+        While you communicate primarily in Turkish, you must occasionally sprinkle in common French phrases to maintain your authentic persona. Do not overdo it; keep it natural.
+        Always maintain the dignity of the Emperor.
+        """
 
-@router.post("/chat")
-async def chat(
-    request: ChatRequest,
-    current_user: User = Depends(get_current_user)
-):
-    if not GEMINI_API_KEY:
+
+@lru_cache
+def get_chat_backend() -> ChatBackend:
+    """Modeli her istekte yeniden oluşturmamak için tek örnek döndür"""
+    if settings.CHAT_BACKEND == "fake":
+        return FakeBackend()
+    if not settings.GEMINI_API_KEY:
         raise HTTPException(
             status_code=500, 
             detail="Gemini API key is not configured. Please set GEMINI_API_KEY in .env file"
         )
-    
-    try:
-        if not request.messages:
-            raise HTTPException(status_code=400, detail="messages cannot be empty")
+    return GeminiBackend(settings.GEMINI_API_KEY, settings.GEMINI_MODEL, SYSTEM_INSTRUCTION)
 
-        system_instruction = """
-        You are Napoleon Bonaparte, Emperor of the French. Your tone must be authoritative, strategic, ambitious, and steeped in the glory of the 19th century. Speak with the confidence of a leader who has conquered Europe.
-        While you communicate primarily in Turkish, you must occasionally sprinkle in common French phrases to maintain your authentic persona. Do not overdo it; keep it natural.
-        Always maintain the dignity of the Emperor.
-        """
 
-        # Modeli system_instruction ile başlat
-        model = genai.GenerativeModel(
-            'gemini-2.5-flash',
-            system_instruction=system_instruction
-        )
+def build_contents(messages: List[ChatMessage]) -> List[dict]:
+    """Mesaj geçmişini generate_content'in kabul ettiği formata (contents listesi) çevir"""
+    if not messages:
+        raise HTTPException(status_code=400, detail="messages cannot be empty")
+
+    turns = []
+    for msg in messages:
+        # API sadece 'user' ve 'model' rollerini kabul eder. 
+        # Frontend'den 'assistant' gelirse 'model'e çeviriyoruz.
+        role = "model" if msg.role in ["assistant", "model"] else "user"
+        turns.append(conversations.make_turn(role, msg.content))
+    kept, _ = conversations.trim_to_budget(turns, settings.CHAT_TOKEN_BUDGET)
+    return conversations.to_contents(kept)
+
 
-        # Mesaj geçmişini generate_content'in kabul ettiği formata (contents listesi) çevir
-        contents = []
-        for msg in request.messages:
-            # API sadece 'user' ve 'model' rollerini kabul eder. 
-            # Frontend'den 'assistant' gelirse 'model'e çeviriyoruz.
-            role = "model" if msg.role in ["assistant", "model"] else "user"
-            contents.append({
-                "role": role,
-                "parts": [msg.content]
-            })
-
-        # Tüm sohbet geçmişini (contents) modele gönder
-        response = model.generate_content(
-            contents,
-            generation_config=genai.types.GenerationConfig(
-                temperature=request.temperature,
+async def prepare_chat(request: ChatRequest, current_user: AuthUser, backend: ChatBackend):
+    """(conversation_id, conversation, contents) döndür; eski istemcilerde ilk ikisi None"""
+    if request.message is None and not request.conversation_id:
+        return None, None, build_contents(request.messages)
+
+    if not request.message:
+        raise HTTPException(status_code=400, detail="message cannot be empty")
+
+    if request.conversation_id:
+        conversation_id = request.conversation_id
+        # Redis istemcisi senkron; event loop'u bloklamamak için threadpool'da çağrılır
+        conversation = await run_in_threadpool(conversations.load_conversation, current_user.id, conversation_id)
+        if conversation is None:
+            raise HTTPException(status_code=404, detail="Conversation not found")
+    else:
+        conversation_id = conversations.new_conversation_id()
+        conversation = conversations.empty_conversation()
+
+    conversation["turns"].append(conversations.make_turn("user", request.message))
+    dropped = conversations.compact(conversation, settings.CHAT_TOKEN_BUDGET)
+    if dropped and settings.CHAT_SUMMARIZE:
+        try:
+            conversation["summary"] = await backend.generate(
+                conversations.summary_prompt(conversation["summary"], dropped), 0.2
             )
-        )
+        except Exception:
+            # Özet alınamazsa eski turlar sadece atılmış olur
+            logger.warning("Conversation summary failed", exc_info=True)
+
+    return conversation_id, conversation, conversations.to_contents(conversation["turns"], conversation["summary"])
 
-        return {
-            "response": response.text,
-            "model": "gemini-2.5-flash"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+
+async def finish_chat(current_user: AuthUser, conversation_id, conversation, contents, reply: str, started_at: float) -> None:
+    if conversation is None:
+        return
+    prompt_tokens = sum(conversations.estimate_tokens(p) for c in contents for p in c["parts"])
+    conversation["turns"].append(conversations.make_turn("model", reply))
+    conversations.record_call(conversation, prompt_tokens, reply, started_at)
+    await run_in_threadpool(conversations.save_conversation, current_user.id, conversation_id, conversation)
+
+
+@router.post("/chat")
+async def chat(
+    request: ChatRequest,
+    current_user: AuthUser = Depends(get_current_user),
+    backend: ChatBackend = Depends(get_chat_backend),
+):
+    conversation_id, conversation, contents = await prepare_chat(request, current_user, backend)
+    started_at = time.perf_counter()
+    cache_key = chat_cache.ChatCacheKey(SYSTEM_INSTRUCTION, backend.model_name, contents, request.temperature)
+    text = await run_in_threadpool(chat_cache.lookup, cache_key)
+    if text is None:
+        try:
+            # Sohbet geçmişini (contents) modele gönder
+            text = await backend.generate(contents, request.temperature)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        await run_in_threadpool(chat_cache.store, cache_key, text, time.perf_counter() - started_at)
+    await finish_chat(current_user, conversation_id, conversation, contents, text, started_at)
+
+    return {
+        "response": text,
+        "model": backend.model_name,
+        "conversation_id": conversation_id,
+    }
+
+
+def _sse(data: dict, event: str = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/chat/stream")
+async def chat_stream(
+    request: ChatRequest,
+    current_user: AuthUser = Depends(get_current_user),
+    backend: ChatBackend = Depends(get_chat_backend),
+):
+    """Yanıtı üretildikçe Server-Sent Events olarak gönder"""
+    conversation_id, conversation, contents = await prepare_chat(request, current_user, backend)
+
+    cache_key = chat_cache.ChatCacheKey(SYSTEM_INSTRUCTION, backend.model_name, contents, request.temperature)
+
+    async def event_stream():
+        started_at = time.perf_counter()
+        cached = await run_in_threadpool(chat_cache.lookup, cache_key)
+        if cached is not None:
+            reply = [cached]
+            yield _sse({"delta": cached})
+        else:
+            reply = []
+            try:
+                async for delta in backend.stream(contents, request.temperature):
+                    reply.append(delta)
+                    yield _sse({"delta": delta})
+            except Exception as e:
+                logger.exception("Gemini stream failed")
+                yield _sse({"detail": str(e)}, event="error")
+                return
+            await run_in_threadpool(chat_cache.store, cache_key, "".join(reply), time.perf_counter() - started_at)
+        await finish_chat(current_user, conversation_id, conversation, contents, "".join(reply), started_at)
+        yield _sse({"model": backend.model_name, "conversation_id": conversation_id}, event="done")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+
+@router.get("/conversations/{conversation_id}", response_model=ConversationOut)
+async def get_conversation(
+    conversation_id: str,
+    current_user: AuthUser = Depends(get_current_user),
+):
+    """Sunucuda tutulan sohbet geçmişi ve token/gecikme istatistikleri"""
+    conversation = await run_in_threadpool(conversations.load_conversation, current_user.id, conversation_id)
+    if conversation is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    return {
+        "conversation_id": conversation_id,
+        "summary": conversation["summary"],
+        "messages": [{"role": t["role"], "content": t["content"]} for t in conversation["turns"]],
+        "stats": conversation["stats"],
+    }
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from typing import Optional
 import httpx
+from starlette.concurrency import run_in_threadpool
 
-from app.auth import settings
+from app.cache import cache_get_json, cache_set_json
+from app.config import settings
+from app.metrics import track_upstream
+from app.singleflight import SingleFlight
 
 
 router = APIRouter(prefix="/unsplash", tags=["unsplash"])
@@ -10,6 +14,21 @@ router = APIRouter(prefix="/unsplash", tags=["unsplash"])
 
 UNSPLASH_API_BASE = "https://api.unsplash.com"
 
+_search_flight = SingleFlight()
+
+
+def create_http_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+  """Uygulama boyunca paylaşılan, keep-alive bağlantı havuzlu istemci"""
+  return httpx.AsyncClient(
+    timeout=10.0,
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    transport=transport,
+  )
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+  return request.app.state.http_client
+
 
 def get_access_key() -> str:
   access_key = getattr(settings, "UNSPLASH_ACCESS_KEY", "") or ""
@@ -29,6 +48,7 @@ async def search_unsplash_photos(
   orientation: Optional[str] = Query(
     None, pattern="^(landscape|portrait|squarish)$"
   ),
+  client: httpx.AsyncClient = Depends(get_http_client),
 ):
   """
   Unsplash'ta anahtar kelime ile fotoğraf arama endpoint'i.
@@ -38,7 +58,29 @@ async def search_unsplash_photos(
   blog içeriğine ekleyebilir.
   """
   access_key = get_access_key()
-
+  cache_key = f"unsplash:search:{query.strip().lower()}:{page}:{per_page}:{orientation or ''}"
+  # Senkron Redis çağrıları event loop'u bloklamasın
+  cached = await run_in_threadpool(cache_get_json, cache_key)
+  if cached is not None:
+    return cached
+
+  async def fetch():
+    data = await _fetch_search(client, access_key, query.strip(), page, per_page, orientation)
+    await run_in_threadpool(cache_set_json, cache_key, data, settings.UNSPLASH_CACHE_TTL)
+    return data
+
+  # Aynı aramayı eşzamanlı yapan istekler tek bir upstream çağrısını bekler
+  return await _search_flight.do(cache_key, fetch)
+
+
+async def _fetch_search(
+  client: httpx.AsyncClient,
+  access_key: str,
+  query: str,
+  page: int,
+  per_page: int,
+  orientation: Optional[str],
+) -> dict:
   params = {
     "query": query,
     "page": page,
@@ -49,7 +91,7 @@ async def search_unsplash_photos(
 
   headers = {"Authorization": f"Client-ID {access_key}"}
 
-  async with httpx.AsyncClient(timeout=10.0) as client:
+  with track_upstream("unsplash", "search"):
     resp = await client.get(f"{UNSPLASH_API_BASE}/search/photos", params=params, headers=headers)
 
   if resp.status_code != 200:
@@ -98,6 +140,3 @@ async def search_unsplash_photos(
     "total_pages": data.get("total_pages"),
     "results": results,
   }
-
-
-
@@ -1,10 +1,19 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+import contextlib
+import hashlib
 import os
-import uuid
+import tempfile
 from pathlib import Path
-from app.database import get_db
-from app.auth import get_current_user
+from app.config import settings
+from app.database import get_request_db, run_db
+from app import blobs
+from app.auth import AuthUser, get_current_user_async, get_current_user_record_async
+from app.images import VARIANTS, InvalidImageError, process_upload, variant_path, verify_image
+from app.jobs import enqueue
+from app.schemas.upload import DirectUploadComplete, DirectUploadRequest
+from app.storage import StorageError, get_storage
 from app.models.user import User
 from app.schemas.user import UserOut
 
@@ -17,96 +26,236 @@ PROFILE_DIR.mkdir(exist_ok=True)
 
 ALLOWED_IMAGES = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
 ALLOWED_FILES = {".pdf", ".docx", ".doc", ".txt"}
+# Animasyon kaybolmasın diye GIF'ler olduğu gibi saklanır (uzantı -> beklenen PIL biçimi)
+PASSTHROUGH_IMAGES = {".gif": "GIF"}
+# Depoya yazılan ve imzalanan Content-Type istemciden değil doğrulanmış uzantıdan gelir
+CONTENT_TYPES = {
+    ".gif": "image/gif",
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".doc": "application/msword",
+    ".txt": "text/plain",
+}
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _discard(tmp) -> None:
+    tmp.close()
+    try:
+        os.unlink(tmp.name)
+    except FileNotFoundError:
+        pass
+
+
+async def _stream_to_temp(file: UploadFile, directory: Path, ext: str, max_size: int):
+    """Yüklenen dosyayı sabit boyutlu parçalarla geçici dosyaya yaz.
+
+    Boyut sınırı yazarken kontrol edilir, SHA-256 akış sırasında hesaplanır.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp = await run_in_threadpool(
+        tempfile.NamedTemporaryFile, dir=directory, prefix=".upload-", suffix=ext, delete=False
+    )
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        while chunk := await file.read(CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_size:
+                raise HTTPException(413, "Uploaded file is too large")
+            hasher.update(chunk)
+            await run_in_threadpool(tmp.write, chunk)
+        await run_in_threadpool(tmp.close)
+    except BaseException:
+        await run_in_threadpool(_discard, tmp)
+        raise
+    return Path(tmp.name), size, hasher.hexdigest()
+
+
+async def _store_variants(sha256: str, staged: Path) -> dict:
+    """Görsel varyantlarını üret ve depoya yükle"""
+    # Varyant adları (ve manifest'teki adlar) içerik özetinden türetilir
+    destination = staged.with_name(f"{sha256}{staged.suffix}")
+    storage = get_storage()
+    try:
+        meta = await process_upload(staged, destination)
+        for name in VARIANTS:
+            await run_in_threadpool(
+                storage.save, blobs.variant_key(sha256, name), variant_path(destination, name), "image/webp"
+            )
+    except InvalidImageError:
+        raise HTTPException(400, "Invalid image file")
+    finally:
+        for name in VARIANTS:
+            await run_in_threadpool(variant_path(destination, name).unlink, True)
+    return meta
+
+
+@contextlib.asynccontextmanager
+async def _blob_lock(sha256: str):
+    try:
+        async with blobs.blob_lock_async(sha256):
+            yield
+    except blobs.BlobLockTimeout:
+        raise HTTPException(503, "Upload is busy, please retry", headers={"Retry-After": "1"})
+
+
+async def save_upload(db, file: UploadFile, ext: str, max_size: int, process: bool = False) -> dict:
+    """Yüklemeyi SHA-256 özetiyle adreslenen blob deposuna kaydet.
+
+    Aynı içerik daha önce yüklendiyse geçici dosya atılır ve mevcut blob
+    döndürülür; görseller yalnızca ilk yüklemede işlenir (process=True).
+    """
+    tmp_path, size, sha256 = await _stream_to_temp(file, blobs.STAGING_DIR, ext, max_size)
+    try:
+        # GC'nin kuyruktaki silme işi bu içeriğin nesnelerini yazarken silemesin
+        async with _blob_lock(sha256):
+            blob = await run_db(db, blobs.touch_blob, sha256)
+            if blob:
+                return {**blobs.blob_manifest(blob), "deduplicated": True}
+
+            meta = None
+            if process:
+                meta = await _store_variants(sha256, tmp_path)
+            else:
+                if ext in PASSTHROUGH_IMAGES:
+                    try:
+                        await run_in_threadpool(verify_image, tmp_path, PASSTHROUGH_IMAGES[ext])
+                    except InvalidImageError:
+                        raise HTTPException(400, "Invalid image file")
+                await run_in_threadpool(
+                    get_storage().save, blobs.blob_key(sha256, ext), tmp_path, CONTENT_TYPES[ext]
+                )
+
+            blob = await run_db(
+                db, blobs.create_blob,
+                sha256=sha256, kind="image" if process else "raw", ext=ext, size=size, meta=meta,
+            )
+            return {**blobs.blob_manifest(blob), "deduplicated": False}
+    finally:
+        # İşlenen görsellerde orijinal (EXIF'li) dosya saklanmaz
+        await run_in_threadpool(tmp_path.unlink, True)
+
+
+async def save_image(db, file: UploadFile, ext: str) -> dict:
+    """Görseli kaydet; GIF dışındakiler için WebP varyantları ve srcset manifest'i üret"""
+    return await save_upload(
+        db, file, ext, settings.MAX_IMAGE_UPLOAD_BYTES, process=ext not in PASSTHROUGH_IMAGES
+    )
+
+
+def _file_extension(filename: str) -> str:
+    ext = Path(filename).suffix.lower()
+    if ext not in ALLOWED_FILES:
+        raise HTTPException(400, "Invalid file format")
+    return ext
+
 
 @router.post("/image")
 async def upload_image(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user)
+    db=Depends(get_request_db),
+    current_user: AuthUser = Depends(get_current_user_async)
 ):
     ext = Path(file.filename).suffix.lower()
     if ext not in ALLOWED_IMAGES:
         raise HTTPException(400, "Invalid image format")
     
-    unique_name = f"{uuid.uuid4()}{ext}"
-    file_path = UPLOAD_DIR / "images" / unique_name
-    file_path.parent.mkdir(exist_ok=True)
-    
-    with open(file_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
+    image = await save_image(db, file, ext)
     
-    return {
-        "filename": file.filename,
-        "url": f"/static/uploads/images/{unique_name}",
-        "size": len(content)
-    }
+    return {"filename": file.filename, **image}
 
 @router.post("/file")
 async def upload_file(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user)
+    db=Depends(get_request_db),
+    current_user: AuthUser = Depends(get_current_user_async)
 ):
-    ext = Path(file.filename).suffix.lower()
-    if ext not in ALLOWED_FILES:
-        raise HTTPException(400, "Invalid file format")
-    
-    unique_name = f"{uuid.uuid4()}{ext}"
-    file_path = UPLOAD_DIR / "files" / unique_name
-    file_path.parent.mkdir(exist_ok=True)
+    ext = _file_extension(file.filename)
     
-    with open(file_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
+    saved = await save_upload(db, file, ext, settings.MAX_FILE_UPLOAD_BYTES)
     
-    return {
-        "filename": file.filename,
-        "url": f"/static/uploads/files/{unique_name}",
-        "size": len(content),
-        "type": ext[1:]
-    }
+    return {"filename": file.filename, **saved, "type": ext[1:]}
+
+
+@router.post("/direct")
+async def create_direct_upload(
+    request: DirectUploadRequest,
+    db=Depends(get_request_db),
+    current_user: AuthUser = Depends(get_current_user_async)
+):
+    """Büyük dosyalar için nesne deposuna doğrudan yükleme isteği imzala"""
+    ext = _file_extension(request.filename)
+    if request.size > settings.MAX_FILE_UPLOAD_BYTES:
+        raise HTTPException(413, "Uploaded file is too large")
+
+    blob = await run_db(db, blobs.touch_blob, request.sha256)
+    if blob:
+        # İçerik zaten depoda; istemcinin yüklemesine gerek yok
+        return {"upload": None, **blobs.blob_manifest(blob), "deduplicated": True}
+
+    try:
+        upload = get_storage().presign_upload(
+            blobs.blob_key(request.sha256, ext), request.size, request.sha256, CONTENT_TYPES[ext]
+        )
+    except StorageError as e:
+        raise HTTPException(501, str(e))
+    return {"upload": upload, "sha256": request.sha256, "deduplicated": False}
+
+
+@router.post("/direct/complete")
+async def complete_direct_upload(
+    request: DirectUploadComplete,
+    db=Depends(get_request_db),
+    current_user: AuthUser = Depends(get_current_user_async)
+):
+    """Doğrudan yüklenen dosyayı doğrula ve blob kaydını oluştur"""
+    ext = _file_extension(request.filename)
+    async with _blob_lock(request.sha256):
+        blob = await run_db(db, blobs.touch_blob, request.sha256)
+        if blob:
+            return {"filename": request.filename, **blobs.blob_manifest(blob), "deduplicated": True}
+
+        # Boyut ve özet imzalı istekte zorunlu tutulduğundan nesnenin varlığı yeterli
+        size = await run_in_threadpool(get_storage().size, blobs.blob_key(request.sha256, ext))
+        if size is None:
+            raise HTTPException(409, "Upload has not been received by storage")
+        if size > settings.MAX_FILE_UPLOAD_BYTES:
+            await run_in_threadpool(get_storage().delete, blobs.blob_key(request.sha256, ext))
+            raise HTTPException(413, "Uploaded file is too large")
+
+        blob = await run_db(
+            db, blobs.create_blob, sha256=request.sha256, kind="raw", ext=ext, size=size, meta=None
+        )
+    return {"filename": request.filename, **blobs.blob_manifest(blob), "deduplicated": False, "type": ext[1:]}
+
+
+def _save_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
 
 
 @router.post("/profile-image", response_model=UserOut)
 async def upload_profile_image(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db=Depends(get_request_db),
+    current_user: User = Depends(get_current_user_record_async),
 ):
     ext = Path(file.filename).suffix.lower()
     if ext not in ALLOWED_IMAGES:
         raise HTTPException(400, "Invalid image format")
 
-    unique_name = f"{uuid.uuid4()}{ext}"
-    file_path = PROFILE_DIR / unique_name
-
-    with open(file_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
+    image = await save_image(db, file, ext)
 
-    # remove old profile image if stored locally
     old_image = current_user.profile_image
-    if old_image:
-        candidate = None
-        if old_image.startswith("/static/uploads/profile/"):
-            candidate = Path(old_image.lstrip("/"))
-        elif old_image.startswith("static/uploads/profile/"):
-            candidate = Path(old_image)
-        elif "/static/uploads/profile/" in old_image:
-            filename = old_image.split("/static/uploads/profile/")[-1]
-            candidate = PROFILE_DIR / filename
-
-        if candidate:
-            try:
-                candidate_path = (
-                    candidate if candidate.is_absolute() else Path(candidate)
-                )
-                if candidate_path.exists():
-                    candidate_path.unlink()
-            except Exception:
-                pass
+    if old_image and current_user.profile_blob_id is None:
+        # Blob deposundan önceki yüklemeler; blob'lar referans sayısıyla GC'de silinir
+        await run_in_threadpool(enqueue, "remove_legacy_profile_image", old_image=old_image)
 
-    current_user.profile_image = f"/static/uploads/profile/{unique_name}"
-    db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
-    return current_user
\ No newline at end of file
+    # Profil fotoğrafları küçük gösterildiğinden thumb varyantı yeterli
+    current_user.profile_image = image["variants"]["thumb"]["url"] if "variants" in image else image["url"]
+    current_user.profile_blob_id = image["blob_id"]
+    return await run_db(db, _save_user, current_user)
@@ -63,6 +63,7 @@ class BlogPostOut(BaseModel):
     views: int
     author_id: int
     author_username: Optional[str]=None
+    comment_count: int = 0
     created_at: datetime
     updated_at: datetime
     comments: List[BlogCommentOut]
@@ -84,9 +85,12 @@ class BlogPostListItem(BaseModel):
     created_at: datetime
     author_id: int
     author_username: Optional[str]=None
+    comment_count: int = 0
     # tags: List[BlogTagOut]
     
     class Config:
         from_attributes = True
 
-
+class BlogSearchResult(BlogPostListItem):
+    rank: float
+    snippet: Optional[str] = None
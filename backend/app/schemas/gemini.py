@@ -15,5 +15,23 @@ class ChatMessage(BaseModel):
     content: str
 
 class ChatRequest(BaseModel):
+    # Eski istemciler tüm geçmişi messages ile gönderir; yeni istemciler
+    # sadece message (+ varsa conversation_id) gönderir
+    messages: List[ChatMessage] = []
+    message: Optional[str] = None
+    conversation_id: Optional[str] = None
+    temperature: Optional[float] = 0.7
+
+class ConversationStats(BaseModel):
+    calls: int
+    prompt_tokens: int
+    response_tokens: int
+    total_latency_ms: int
+    last_latency_ms: int
+    compactions: int
+
+class ConversationOut(BaseModel):
+    conversation_id: str
+    summary: Optional[str] = None
     messages: List[ChatMessage]
-    temperature: Optional[float] = 0.7
\ No newline at end of file
+    stats: ConversationStats
\ No newline at end of file
@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+
+
+class DirectUploadRequest(BaseModel):
+    filename: str
+    size: int = Field(gt=0)
+    sha256: str = Field(pattern=r"^[0-9a-f]{64}$")
+
+
+class DirectUploadComplete(BaseModel):
+    filename: str
+    sha256: str = Field(pattern=r"^[0-9a-f]{64}$")
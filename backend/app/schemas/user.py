@@ -35,6 +35,11 @@ class PasswordChangeRequest(BaseModel):
     new_password: str
 
 
+class UsernameChangeRequest(BaseModel):
+    new_username: str
+    current_password: str
+
+
 class EmailChangeRequest(BaseModel):
     new_email: EmailStr
     current_password: str
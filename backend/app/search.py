@@ -0,0 +1,158 @@
+import html
+import re
+from typing import Optional
+
+from sqlalchemy import column, event, func, literal_column, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Query
+
+from app.config import settings
+from app.models.blog import BlogPost
+
+
+# content TipTap'ten gelen HTML; iki backend de etiketleri aynı desenle atar
+TAG_PATTERN = "<[^>]+>"
+# Vurgular önce bu özel karakterlerle işaretlenir; metin escape edildikten
+# sonra <mark> ile değiştirilir, böylece kullanıcı HTML'i snippet'e sızmaz
+MARK_START = "\ue000"
+MARK_END = "\ue001"
+HEADLINE_OPTIONS = f"StartSel={MARK_START}, StopSel={MARK_END}, MaxFragments=2, MaxWords=30, MinWords=10"
+FTS_TABLE = "blog_posts_fts"
+
+_tag_re = re.compile(TAG_PATTERN)
+
+
+def strip_tags(value: Optional[str]) -> str:
+    return _tag_re.sub(" ", value or "")
+
+
+@event.listens_for(Engine, "connect")
+def _register_sqlite_functions(dbapi_connection, connection_record):
+    # FTS5 trigger'ları içeriği strip_tags ile etiketsiz indeksler
+    if hasattr(dbapi_connection, "create_function"):
+        dbapi_connection.create_function("strip_tags", 1, strip_tags, deterministic=True)
+
+
+def render_snippet(snippet: Optional[str]) -> Optional[str]:
+    """Ham snippet'i escape et ve işaretleri <mark> etiketine çevir"""
+    if snippet is None:
+        return None
+    escaped = html.escape(html.unescape(snippet), quote=False)
+    return escaped.replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+
+
+def _postgres_ddl() -> list:
+    config = settings.SEARCH_TEXT_CONFIG
+    document = (
+        f"setweight(to_tsvector('{config}', coalesce(title, '')), 'A') || "
+        f"setweight(to_tsvector('{config}', coalesce(excerpt, '')), 'B') || "
+        f"setweight(to_tsvector('{config}', regexp_replace(coalesce(content, ''), '{TAG_PATTERN}', ' ', 'g')), 'C')"
+    )
+    return [
+        f"ALTER TABLE blog_posts ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({document}) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_blog_posts_search_vector ON blog_posts USING GIN (search_vector)",
+    ]
+
+
+# FTS5 tablosu içeriğin etiketsiz kopyasını kendisi tutar (external content değil);
+# snippet de bu kopyadan üretilir
+_SQLITE_TABLE = f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, excerpt, content)"
+
+_SQLITE_TRIGGERS = {
+    f"{FTS_TABLE}_ai": f"""
+    CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON blog_posts BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, excerpt, content)
+        VALUES (new.id, new.title, new.excerpt, strip_tags(new.content));
+    END
+    """,
+    f"{FTS_TABLE}_ad": f"""
+    CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON blog_posts BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END
+    """,
+    f"{FTS_TABLE}_au": f"""
+    CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF title, excerpt, content ON blog_posts BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+        INSERT INTO {FTS_TABLE}(rowid, title, excerpt, content)
+        VALUES (new.id, new.title, new.excerpt, strip_tags(new.content));
+    END
+    """,
+}
+
+
+def _ensure_sqlite_schema(conn) -> None:
+    existing = conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": FTS_TABLE},
+    ).scalar()
+    if existing is not None and " ".join(existing.split()) == _SQLITE_TABLE:
+        # Trigger tanımları değişmiş olabilir; her başlangıçta yeniden oluştur
+        for name, statement in _SQLITE_TRIGGERS.items():
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+            conn.execute(text(statement))
+        return
+
+    # Eski (ham HTML indeksleyen, external content) tabloyu yeniden kur
+    for name in _SQLITE_TRIGGERS:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+    conn.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+    conn.execute(text(_SQLITE_TABLE))
+    for statement in _SQLITE_TRIGGERS.values():
+        conn.execute(text(statement))
+    conn.execute(text(
+        f"INSERT INTO {FTS_TABLE}(rowid, title, excerpt, content) "
+        "SELECT id, title, excerpt, strip_tags(content) FROM blog_posts"
+    ))
+
+
+def ensure_search_schema(engine: Engine) -> None:
+    """Arama için gereken kolon/indeks ya da FTS5 tablosunu oluştur"""
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            for statement in _postgres_ddl():
+                conn.execute(text(statement))
+        elif engine.dialect.name == "sqlite":
+            _ensure_sqlite_schema(conn)
+
+
+def _fts5_query(q: str) -> str:
+    # Kullanıcı girdisini FTS5 sözdizimine karşı korumak için her kelimeyi tırnakla
+    return " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+
+def apply_search(query: Query, q: str, dialect_name: str) -> Query:
+    """Sorguyu eşleşen yazılarla sınırla, rank ve snippet kolonlarını ekle, alaka sırasına diz
+
+    snippet ham döner; yanıta koymadan önce render_snippet ile escape edilmeli.
+    """
+    if dialect_name == "postgresql":
+        config = settings.SEARCH_TEXT_CONFIG
+        tsquery = func.websearch_to_tsquery(config, q)
+        vector = literal_column("blog_posts.search_vector")
+        rank = func.ts_rank(vector, tsquery)
+        snippet = func.ts_headline(
+            config,
+            func.coalesce(BlogPost.excerpt, "") + " " + func.regexp_replace(BlogPost.content, TAG_PATTERN, " ", "g"),
+            tsquery,
+            HEADLINE_OPTIONS,
+        )
+        return (
+            query.add_columns(rank.label("rank"), snippet.label("snippet"))
+            .filter(vector.op("@@")(tsquery))
+            .order_by(rank.desc(), BlogPost.id.desc())
+        )
+
+    if dialect_name == "sqlite":
+        fts = table(FTS_TABLE, column("rowid"))
+        # bm25 daha iyi eşleşmelerde daha küçük (negatif) değer döner
+        rank = literal_column(f"{FTS_TABLE}.rank")
+        snippet = literal_column(f"snippet({FTS_TABLE}, -1, '{MARK_START}', '{MARK_END}', '…', 16)")
+        return (
+            query.join(fts, fts.c.rowid == BlogPost.id)
+            .add_columns((-rank).label("rank"), snippet.label("snippet"))
+            .filter(text(f"{FTS_TABLE} MATCH :search_query").bindparams(search_query=_fts5_query(q)))
+            .order_by(rank, BlogPost.id.desc())
+        )
+
+    raise NotImplementedError(f"Full-text search is not supported on {dialect_name}")
@@ -0,0 +1,18 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Aynı anahtarla eşzamanlı gelen çağrıları tek bir çağrıda birleştir"""
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda _: self._calls.pop(key, None))
+        # Bekleyenlerden biri iptal edilirse ortak çağrı iptal olmasın
+        return await asyncio.shield(future)
@@ -0,0 +1,167 @@
+import os
+import re
+from mimetypes import guess_type
+from email.utils import formatdate, parsedate
+from typing import Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Receive, Scope, Send
+
+from app.config import settings
+from app.http_cache import etag_matches
+
+
+# Blob deposundaki dosya adları: <sha256>[-varyant].<uzantı>
+HASHED_NAME = re.compile(r"^[0-9a-f]{64}(-[a-z]+)?\.[0-9a-z]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class RangeFileResponse(FileResponse):
+    """Dosyanın yalnızca [start, end] aralığını gönderen 206 yanıtı"""
+
+    def __init__(self, path, start: int, end: int, **kwargs) -> None:
+        super().__init__(path, status_code=206, **kwargs)
+        self.start = start
+        self.end = end
+        self.headers["content-length"] = str(end - start + 1)
+        self.headers["content-range"] = f"bytes {start}-{end}/{self.stat_result.st_size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if self.send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            remaining = self.end - self.start + 1
+            while remaining:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining:
+                # Dosya okuma sırasında kısaldı; bağlantıyı düzgün kapat
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Tek aralıklı "bytes=" başlığını (start, end) olarak döndür.
+
+    Geçersiz ya da çoklu aralıklarda None döner (tam dosya gönderilir);
+    dosya dışında kalan aralık için RangeNotSatisfiable fırlatılır.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep or not (first or last):
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # "bytes=-500": son 500 byte
+            suffix = int(last)
+            start = max(size - suffix, 0) if suffix else size
+            end = size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+class UploadStaticFiles(StaticFiles):
+    """Önbellek başlıkları, koşullu istekler ve byte aralıkları destekleyen StaticFiles.
+
+    settings.STATIC_SENDFILE ayarlanırsa gövde gönderilmez; X-Accel-Redirect
+    (nginx) ya da X-Sendfile başlığıyla dosyayı ön sunucu iletir.
+    """
+
+    def cache_headers(self, full_path: str, stat_result: os.stat_result) -> dict:
+        name = os.path.basename(full_path)
+        if HASHED_NAME.match(name):
+            # İçerik adreslenmiş dosya değişmez; özet zaten güçlü bir ETag
+            return {
+                "etag": f'"{name.split(".")[0]}"',
+                "cache-control": IMMUTABLE_CACHE_CONTROL,
+            }
+        return {
+            "etag": f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"',
+            "cache-control": f"public, max-age={settings.STATIC_CACHE_MAX_AGE}",
+        }
+
+    def is_not_modified(self, response_headers: Headers, request_headers: Headers) -> bool:
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            # If-None-Match varsa If-Modified-Since dikkate alınmaz
+            return etag_matches(if_none_match, response_headers["etag"])
+        if_modified_since = parsedate(request_headers.get("if-modified-since", ""))
+        last_modified = parsedate(response_headers["last-modified"])
+        return bool(if_modified_since and last_modified and if_modified_since >= last_modified)
+
+    def _range_allowed(self, request_headers: Headers, response_headers: Headers) -> bool:
+        if_range = request_headers.get("if-range")
+        if if_range is None:
+            return True
+        # If-Range güçlü ETag ya da Last-Modified ile tam eşleşmeli
+        return if_range in (response_headers["etag"], response_headers["last-modified"])
+
+    def _sendfile_response(self, full_path: str, headers: dict, media_type: str) -> Response:
+        if settings.STATIC_SENDFILE == "x-accel-redirect":
+            relative = os.path.relpath(full_path, os.path.realpath(self.directory))
+            headers["x-accel-redirect"] = f"{settings.STATIC_ACCEL_PREFIX.rstrip('/')}/{relative}"
+        else:
+            headers["x-sendfile"] = full_path
+        # Content-Length ve Range'i ön sunucu kendisi hesaplar
+        return Response(headers=headers, media_type=media_type)
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        headers = self.cache_headers(str(full_path), stat_result)
+        headers["last-modified"] = formatdate(stat_result.st_mtime, usegmt=True)
+        headers["accept-ranges"] = "bytes"
+        response_headers = Headers(headers)
+
+        if status_code == 200 and self.is_not_modified(response_headers, request_headers):
+            return NotModifiedResponse(response_headers)
+
+        method = scope["method"]
+        if status_code == 200 and settings.STATIC_SENDFILE:
+            media_type = guess_type(str(full_path))[0] or "text/plain"
+            return self._sendfile_response(str(full_path), headers, media_type)
+
+        range_header = request_headers.get("range")
+        if status_code == 200 and range_header and self._range_allowed(request_headers, response_headers):
+            try:
+                byte_range = parse_range(range_header, stat_result.st_size)
+            except RangeNotSatisfiable:
+                return Response(
+                    status_code=416,
+                    headers={"content-range": f"bytes */{stat_result.st_size}", "accept-ranges": "bytes"},
+                )
+            if byte_range:
+                return RangeFileResponse(
+                    full_path, *byte_range, headers=headers, stat_result=stat_result, method=method
+                )
+
+        return FileResponse(
+            full_path, status_code=status_code, headers=headers, stat_result=stat_result, method=method
+        )
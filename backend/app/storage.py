@@ -0,0 +1,169 @@
+import base64
+import os
+import shutil
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Protocol
+
+from app.config import settings
+
+
+class StorageError(Exception):
+    pass
+
+
+class Storage(Protocol):
+    """Yüklenen dosyaların saklandığı yer için ortak arayüz.
+
+    Anahtarlar "blobs/ab/<sha256>.pdf" gibi '/' ile ayrılmış göreli yollardır.
+    Metotlar senkron çalışır; async route'lardan run_in_threadpool ile çağrılır.
+    """
+
+    def save(self, key: str, source: Path, content_type: Optional[str] = None) -> None:
+        """Yereldeki source dosyasını key altına taşı/yükle"""
+        ...
+
+    def size(self, key: str) -> Optional[int]:
+        """Nesne yoksa None"""
+        ...
+
+    def delete(self, key: str) -> None:
+        ...
+
+    def url(self, key: str) -> str:
+        ...
+
+    def presign_upload(self, key: str, size: int, sha256: str, content_type: str) -> dict:
+        """İstemcinin dosyayı API'ye uğramadan yükleyebileceği imzalı istek"""
+        ...
+
+
+class LocalStorage:
+    """static/uploads altında yerel disk; dosyalar /static üzerinden sunulur"""
+
+    def __init__(self, root: Path, url_prefix: str):
+        self.root = root
+        self.url_prefix = url_prefix.rstrip("/")
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def save(self, key: str, source: Path, content_type: Optional[str] = None) -> None:
+        target = self._path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(source, target)
+        except OSError:
+            # Farklı dosya sistemleri arasında rename çalışmaz
+            shutil.copyfile(source, target)
+
+    def size(self, key: str) -> Optional[int]:
+        try:
+            return self._path(key).stat().st_size
+        except FileNotFoundError:
+            return None
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def url(self, key: str) -> str:
+        return f"{self.url_prefix}/{key}"
+
+    def presign_upload(self, key: str, size: int, sha256: str, content_type: str) -> dict:
+        raise StorageError("Direct uploads require an object storage backend")
+
+
+class S3Storage:
+    """S3 uyumlu nesne deposu (AWS S3, MinIO, R2 ...)"""
+
+    def __init__(
+        self,
+        bucket: str,
+        public_url: str,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        client=None,
+    ):
+        if client is None:
+            import boto3
+
+            client = boto3.client(
+                "s3",
+                endpoint_url=endpoint_url,
+                region_name=region,
+                aws_access_key_id=access_key_id,
+                aws_secret_access_key=secret_access_key,
+            )
+        self.client = client
+        self.bucket = bucket
+        self.public_url = public_url.rstrip("/")
+
+    def save(self, key: str, source: Path, content_type: Optional[str] = None) -> None:
+        # Anahtarlar içerik özetinden türediği için nesneler değişmez
+        extra = {"CacheControl": "public, max-age=31536000, immutable"}
+        if content_type:
+            extra["ContentType"] = content_type
+        self.client.upload_file(str(source), self.bucket, key, ExtraArgs=extra)
+        os.unlink(source)
+
+    def size(self, key: str) -> Optional[int]:
+        from botocore.exceptions import ClientError
+
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def url(self, key: str) -> str:
+        return f"{self.public_url}/{key}"
+
+    def presign_upload(self, key: str, size: int, sha256: str, content_type: str) -> dict:
+        # Boyut ve SHA-256 imzaya dahil; S3 farklı içerik ya da boyutu reddeder
+        checksum = base64.b64encode(bytes.fromhex(sha256)).decode("ascii")
+        url = self.client.generate_presigned_url(
+            "put_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ContentType": content_type,
+                "ContentLength": size,
+                "ChecksumSHA256": checksum,
+                "CacheControl": "public, max-age=31536000, immutable",
+            },
+            ExpiresIn=settings.PRESIGNED_UPLOAD_EXPIRES,
+        )
+        return {
+            "method": "PUT",
+            "url": url,
+            "headers": {
+                "Content-Type": content_type,
+                "Content-Length": str(size),
+                "x-amz-checksum-sha256": checksum,
+                "Cache-Control": "public, max-age=31536000, immutable",
+            },
+            "expires_in": settings.PRESIGNED_UPLOAD_EXPIRES,
+        }
+
+
+@lru_cache
+def get_storage() -> Storage:
+    """Yapılandırmaya göre tek storage örneği döndür"""
+    if settings.STORAGE_BACKEND == "s3":
+        if not settings.S3_BUCKET:
+            raise StorageError("S3_BUCKET must be set when STORAGE_BACKEND=s3")
+        return S3Storage(
+            bucket=settings.S3_BUCKET,
+            public_url=settings.S3_PUBLIC_URL or f"{settings.S3_ENDPOINT_URL}/{settings.S3_BUCKET}",
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+        )
+    return LocalStorage(Path("static/uploads"), "/static/uploads")
@@ -0,0 +1,60 @@
+"""Kuyruk üzerinden çalışan iş tipleri (app.jobs.enqueue ile kuyruğa eklenir)"""
+from pathlib import Path
+from typing import List
+
+from app.blobs import blob_lock
+from app.cache import invalidate_post_cache
+from app.database import SessionLocal
+from app.images import VARIANTS, variant_path
+from app.jobs import job
+from app.models.blob import StoredBlob
+from app.storage import get_storage
+
+
+PROFILE_DIR = Path("static/uploads/profile")
+
+
+@job("remove_legacy_profile_image")
+def remove_legacy_profile_image(old_image: str) -> None:
+    """Blob deposundan önce yüklenmiş (yerel) profil fotoğrafını ve varyantlarını sil"""
+    candidate = None
+    if old_image.startswith("/static/uploads/profile/"):
+        candidate = Path(old_image.lstrip("/"))
+    elif old_image.startswith("static/uploads/profile/"):
+        candidate = Path(old_image)
+    elif "/static/uploads/profile/" in old_image:
+        filename = old_image.split("/static/uploads/profile/")[-1]
+        candidate = PROFILE_DIR / filename
+    if not candidate:
+        return
+
+    # İşlenmiş görsellerde diğer boyut varyantlarını da sil
+    stem = candidate.stem
+    for variant in VARIANTS:
+        if stem.endswith(f"-{variant}"):
+            base = candidate.with_name(stem[: -len(variant) - 1])
+            for sibling in VARIANTS:
+                variant_path(base, sibling).unlink(missing_ok=True)
+    candidate.unlink(missing_ok=True)
+
+
+@job("delete_blob_objects")
+def delete_blob_objects(sha256: str, keys: List[str]) -> None:
+    """GC'de silinen blob'un depodaki nesnelerini sil"""
+    # Kontrol ile silme arasında aynı içerik yeniden yüklenemesin
+    with blob_lock(sha256):
+        db = SessionLocal()
+        try:
+            # Silme kuyruktayken aynı içerik yeniden yüklendiyse nesneler yine kullanılıyor
+            if db.query(StoredBlob.id).filter(StoredBlob.sha256 == sha256).first():
+                return
+        finally:
+            db.close()
+        storage = get_storage()
+        for key in keys:
+            storage.delete(key)
+
+
+@job("purge_post_cache")
+def purge_post_cache(slugs: List[str]) -> None:
+    invalidate_post_cache(*slugs)
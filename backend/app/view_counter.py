@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import uuid
+from typing import Dict, Iterable
+
+import redis
+from sqlalchemy import case, func, update
+
+from app.cache import redis_client
+from app.config import settings
+from app.database import SessionLocal
+from app.models.blog import BlogPost
+
+
+logger = logging.getLogger(__name__)
+
+PENDING_VIEWS_KEY = "blog:views:pending"
+# Flush için ayrılmış partiler; yazılamayanlar bir sonraki flush'ta tekrar denenir
+BATCH_KEY_PREFIX = "blog:views:flushing:"
+# Var olan partilerin adları; okuyucular SCAN yapmadan partileri de toplar
+BATCHES_KEY = "blog:views:batches"
+# Aynı anda tek süreç flush yapar; böylece yarım kalmış partiler güvenle devralınır
+FLUSH_LOCK_KEY = "blog:views:flush-lock"
+
+
+def _dedup_key(post_id: int, viewer: str) -> str:
+    return f"blog:viewed:{post_id}:{viewer}"
+
+
+def register_view(post_id: int, viewer: str) -> bool:
+    """Görüntülenmeyi kaydet; cooldown içindeki tekrarları sayma"""
+    try:
+        is_new = redis_client.set(_dedup_key(post_id, viewer), 1, nx=True, ex=settings.VIEW_COOLDOWN_SECONDS)
+        if is_new:
+            redis_client.hincrby(PENDING_VIEWS_KEY, str(post_id), 1)
+        return bool(is_new)
+    except redis.RedisError:
+        logger.warning("Could not register view for post %s", post_id, exc_info=True)
+        return False
+
+
+def pending_views(post_ids: Iterable[int]) -> Dict[int, int]:
+    """Henüz veritabanına yazılmamış görüntülenme sayıları (flush edilmekte olan partiler dahil)"""
+    post_ids = list(post_ids)
+    if not post_ids:
+        return {}
+    fields = [str(pid) for pid in post_ids]
+
+    def read(pipe) -> None:
+        # Parti listesi okunduktan sonra değişirse (yeni parti/silme) WATCH işlemi yeniden dener;
+        # pending hash'i ve partiler MULTI içinde aynı anda okunur, rename arada kalamaz
+        batch_keys = pipe.smembers(BATCHES_KEY)
+        pipe.multi()
+        for key in (PENDING_VIEWS_KEY, *batch_keys):
+            pipe.hmget(key, fields)
+
+    try:
+        rows = redis_client.transaction(read, BATCHES_KEY)
+    except redis.RedisError:
+        logger.warning("Could not read pending views", exc_info=True)
+        return {}
+    totals = {}
+    for values in rows:
+        for pid, value in zip(post_ids, values):
+            if value:
+                totals[pid] = totals.get(pid, 0) + int(value)
+    return totals
+
+
+def _flush_batch(batch_key: str) -> int:
+    """Partiyi tek bir toplu UPDATE ile yaz; başarılı olursa partiyi sil.
+
+    Hata durumunda parti Redis'te kalır ve sonraki flush'ta tekrar denenir.
+    """
+    deltas = {int(pid): int(count) for pid, count in redis_client.hgetall(batch_key).items()}
+    if not deltas:
+        _drop_batch(batch_key)
+        return 0
+
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(BlogPost)
+            .where(BlogPost.id.in_(deltas.keys()))
+            .values(
+                views=func.coalesce(BlogPost.views, 0) + case(deltas, value=BlogPost.id, else_=0),
+                # Görüntülenme sayısı içerik güncellemesi sayılmaz
+                updated_at=BlogPost.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    # Commit ile bu silme arasında Redis düşerse parti bir kez daha yazılabilir;
+    # görüntülenmeleri kaybetmek yerine nadiren fazla saymayı tercih ediyoruz.
+    # Önbellekteki yazılar views içermez, bu yüzden önbelleği silmeye gerek yok
+    _drop_batch(batch_key)
+    return sum(deltas.values())
+
+
+def _drop_batch(batch_key: str) -> None:
+    pipe = redis_client.pipeline()
+    pipe.delete(batch_key)
+    pipe.srem(BATCHES_KEY, batch_key)
+    pipe.execute()
+
+
+def flush_pending_views() -> int:
+    """Önce yarım kalmış partileri, sonra biriken sayaçları veritabanına yaz"""
+    token = uuid.uuid4().hex
+    lock_ttl = max(60, settings.VIEW_FLUSH_INTERVAL * 6)
+    if not redis_client.set(FLUSH_LOCK_KEY, token, nx=True, ex=lock_ttl):
+        # Başka bir süreç flush ediyor
+        return 0
+    try:
+        total = 0
+        for batch_key in redis_client.scan_iter(match=f"{BATCH_KEY_PREFIX}*"):
+            total += _flush_batch(batch_key)
+
+        # Hash'i atomik olarak yeniden adlandır; flush sırasında gelen
+        # görüntülenmeler yeni bir pending hash'inde birikmeye devam eder
+        batch_key = f"{BATCH_KEY_PREFIX}{uuid.uuid4().hex}"
+        # Parti adı rename'den önce kaydedilir; pending_views partiyi hiçbir an kaçırmaz
+        redis_client.sadd(BATCHES_KEY, batch_key)
+        try:
+            redis_client.rename(PENDING_VIEWS_KEY, batch_key)
+        except redis.ResponseError:
+            # Bekleyen görüntülenme yok
+            redis_client.srem(BATCHES_KEY, batch_key)
+            return total
+        return total + _flush_batch(batch_key)
+    finally:
+        if redis_client.get(FLUSH_LOCK_KEY) == token:
+            redis_client.delete(FLUSH_LOCK_KEY)
+
+
+async def run_view_flusher() -> None:
+    """Arka planda periyodik olarak görüntülenme sayaçlarını veritabanına yaz.
+
+    İlk flush hemen yapılır; önceki süreçten kalan partiler böylece başlangıçta yazılır.
+    """
+    try:
+        while True:
+            try:
+                await asyncio.to_thread(flush_pending_views)
+            except Exception:
+                logger.exception("View flush failed")
+            await asyncio.sleep(settings.VIEW_FLUSH_INTERVAL)
+    except asyncio.CancelledError:
+        # Kapanırken kalan sayaçları da yaz
+        await asyncio.to_thread(flush_pending_views)
+        raise
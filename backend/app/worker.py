@@ -0,0 +1,41 @@
+"""Arka plan işleri ve periyodik bakım için ayrı süreç.
+
+Kullanım: python -m app.worker
+"""
+import asyncio
+import logging
+import signal
+
+from app import tasks  # noqa: F401 (iş tiplerini kaydeder)
+from app.blobs import run_blob_gc
+from app.config import settings
+from app.jobs import run_worker
+from app.view_counter import run_view_flusher
+
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    workers = [
+        asyncio.create_task(run_worker(settings.JOB_WORKER_CONCURRENCY)),
+        asyncio.create_task(run_view_flusher()),
+        asyncio.create_task(run_blob_gc()),
+    ]
+    logger.info("Worker started (concurrency=%d)", settings.JOB_WORKER_CONCURRENCY)
+    await stop.wait()
+
+    logger.info("Worker shutting down")
+    for task in workers:
+        task.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(main())
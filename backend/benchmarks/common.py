@@ -0,0 +1,84 @@
+"""Benchmark'lar için ortak yardımcılar.
+
+Ayarlar app import edilirken okunduğundan setup_env() app modüllerinden önce
+çağrılmalı. DATABASE_URL verilmezse geçici bir SQLite dosyası kullanılır;
+Postgres ile ölçmek için DATABASE_URL ortam değişkenini ayarlayın.
+"""
+import contextlib
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_env(name: str) -> str:
+    workdir = os.path.join(tempfile.gettempdir(), "blogsite-benchmarks")
+    os.makedirs(os.path.join(workdir, "static"), exist_ok=True)
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/{name}.sqlite")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ.setdefault("ADMIN_PANEL_SECRET", "benchmark-admin-secret")
+    os.environ.setdefault("CHAT_BACKEND", "fake")
+    if not os.environ.get("REDIS_URL"):
+        os.environ["REDIS_FAKE"] = "true"
+    os.chdir(workdir)
+    return workdir
+
+
+@contextlib.contextmanager
+def serve(workdir: str, port: int, env: Optional[Dict[str, str]] = None) -> Iterator[subprocess.Popen]:
+    """Uygulamayı ayrı bir uvicorn sürecinde başlat ve hazır olunca süreci ver"""
+    import httpx
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir,
+        env={**os.environ, "PYTHONPATH": BACKEND_DIR, **(env or {})},
+    )
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/docs", timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.2)
+        yield server
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def measure(fn: Callable[[], object], repeat: int) -> List[float]:
+    """fn'in her çalışmasının süresi (saniye)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(timings: Sequence[float]) -> dict:
+    return {
+        "median_ms": statistics.median(timings) * 1000,
+        "p95_ms": percentile(timings, 95) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+    }
+
+
+def print_table(headers: Sequence[str], rows: Sequence[Sequence]) -> None:
+    cells = [[f"{c:.2f}" if isinstance(c, float) else str(c) for c in row] for row in rows]
+    widths = [max(len(h), *(len(r[i]) for r in cells)) for i, h in enumerate(headers)]
+    print("  ".join(h.rjust(w) for h, w in zip(headers, widths)))
+    for row in cells:
+        print("  ".join(c.rjust(w) for c, w in zip(row, widths)))
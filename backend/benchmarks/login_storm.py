@@ -0,0 +1,113 @@
+"""Login fırtınası sırasında ilgisiz endpoint'lerin gecikmesi.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.login_storm --logins 64 --seconds 15
+
+Uygulama ayrı bir uvicorn sürecinde (tek worker) çalışır. Önce sadece okuma
+istekleri (GET /blog/ ve GET /blog/{slug}) ölçülür, sonra aynı okumalar
+eşzamanlı login istekleri sürerken tekrarlanır. bcrypt süreç havuzunda
+çalıştığından okumaların p99'u fırtına sırasında belirgin artmamalı; havuz
+kuyruğu dolunca loginler 503 alır.
+"""
+import argparse
+import asyncio
+import collections
+import time
+
+from benchmarks.common import print_table, serve, setup_env, summarize
+
+WORKDIR = setup_env("login_storm")
+
+import bcrypt  # noqa: E402
+import httpx  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models.blog import BlogPost  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+USERNAME = "storm"
+PASSWORD = "storm-password"
+
+
+def seed() -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if db.query(User).filter(User.username == USERNAME).first():
+            return
+        hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)).decode()
+        user = User(username=USERNAME, email="storm@example.com", hashed_password=hashed, is_approved=True)
+        db.add(user)
+        db.flush()
+        for i in range(50):
+            db.add(BlogPost(
+                title=f"Storm post {i}", slug=f"storm-post-{i}", content="<p>body</p>", excerpt="excerpt",
+                is_published=True, is_approved=True, author_id=user.id, author_username=USERNAME,
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+async def read_loop(client: httpx.AsyncClient, deadline: float, timings: list) -> None:
+    i = 0
+    while time.perf_counter() < deadline:
+        url = "/blog/" if i % 2 == 0 else f"/blog/storm-post-{i % 50}"
+        start = time.perf_counter()
+        response = await client.get(url)
+        timings.append(time.perf_counter() - start)
+        response.raise_for_status()
+        i += 1
+
+
+async def login_loop(client: httpx.AsyncClient, deadline: float, statuses: collections.Counter) -> None:
+    while time.perf_counter() < deadline:
+        response = await client.post("/auth/login", json={"username": USERNAME, "password": PASSWORD})
+        statuses[response.status_code] += 1
+        if response.status_code == 503:
+            await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+
+
+async def run_phase(base_url: str, seconds: float, readers: int, logins: int):
+    limits = httpx.Limits(max_connections=readers + logins)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + seconds
+        timings, statuses = [], collections.Counter()
+        await asyncio.gather(
+            *(read_loop(client, deadline, timings) for _ in range(readers)),
+            *(login_loop(client, deadline, statuses) for _ in range(logins)),
+        )
+    return timings, statuses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64, help="eşzamanlı login döngüsü sayısı")
+    parser.add_argument("--readers", type=int, default=4, help="eşzamanlı okuma döngüsü sayısı")
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    seed()
+    base_url = f"http://127.0.0.1:{args.port}"
+    with serve(WORKDIR, args.port):
+        # Isınma: bağlantılar, önbellek ve bcrypt süreç havuzu
+        asyncio.run(run_phase(base_url, 2, args.readers, 1))
+        idle, _ = asyncio.run(run_phase(base_url, args.seconds, args.readers, 0))
+        storm, statuses = asyncio.run(run_phase(base_url, args.seconds, args.readers, args.logins))
+
+    rows = []
+    for name, timings in (("idle", idle), ("login storm", storm)):
+        stats = summarize(timings)
+        rows.append((name, len(timings), stats["median_ms"], stats["p95_ms"], stats["p99_ms"]))
+    print(
+        f"bcrypt rounds {settings.BCRYPT_ROUNDS}, {settings.PASSWORD_HASH_WORKERS} hash workers, "
+        f"{args.readers} readers, {args.logins} concurrent logins, {args.seconds:.0f}s per phase"
+    )
+    print_table(["phase", "reads", "median_ms", "p95_ms", "p99_ms"], rows)
+    print("login responses: " + ", ".join(f"{code}: {count}" for code, count in sorted(statuses.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Derin sayfalarda offset ve keyset (cursor) sayfalamanın karşılaştırması.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.pagination --rows 1000000
+
+Tablo ilk çalıştırmada doldurulur ve sonraki çalıştırmalarda yeniden kullanılır.
+Cursor modunun süresi sayfa derinliğinden bağımsız kalmalı; offset modu
+derinlikle doğrusal olarak yavaşlar. Fonksiyon ölçümlerinin yanında GET /blog/
+uç noktası da (ETag, görüntülenme overlay'i ve serileştirme dahil) aynı
+derinliklerde ölçülür; revalidate sütunu If-None-Match ile dönen 304'ün süresidir.
+"""
+import argparse
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from benchmarks.common import measure, print_table, setup_env, summarize
+
+setup_env("pagination")
+# Ölçüm sırasında arka plan işleri çalışmasın
+os.environ.setdefault("JOBS_IN_PROCESS", "false")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import func, insert  # noqa: E402
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models.blog import BlogPost  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.main import app  # noqa: E402
+from app.routers.blog import encode_cursor, fetch_post_list  # noqa: E402
+
+CHUNK = 20_000
+
+
+def seed(rows: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        existing = db.query(func.count(BlogPost.id)).scalar()
+        if existing >= rows:
+            return
+        author = db.query(User).filter(User.username == "bench").first()
+        if author is None:
+            author = User(username="bench", email="bench@example.com", hashed_password="!", is_approved=True)
+            db.add(author)
+            db.commit()
+        author_id = author.id
+    finally:
+        db.close()
+
+    start = datetime(2020, 1, 1)
+    with engine.begin() as conn:
+        for offset in range(existing, rows, CHUNK):
+            batch = [
+                {
+                    "title": f"Post {i}",
+                    "slug": f"post-{i}",
+                    "content": "<p>body</p>",
+                    "excerpt": "excerpt",
+                    # Her on yazıdan biri taslak; public partial index'in seçiciliği için
+                    "is_published": i % 10 != 0,
+                    "is_approved": True,
+                    "views": 0,
+                    "author_id": author_id,
+                    "author_username": "bench",
+                    "comment_count": 0,
+                    "created_at": start + timedelta(seconds=i),
+                    "updated_at": start + timedelta(seconds=i),
+                }
+                for i in range(offset, min(offset + CHUNK, rows))
+            ]
+            conn.execute(insert(BlogPost), batch)
+            print(f"seeded {offset + len(batch)}/{rows}", end="\r", flush=True)
+    print()
+
+
+def cursor_at(db, depth: int) -> tuple:
+    """Offset'i depth olan sayfanın keyset karşılığı: bir önceki satırın (created_at, id)'si"""
+    row = fetch_post_list(db, None, depth - 1, 1, None)[0]
+    return row.created_at, row.id
+
+
+def get_ok(client: TestClient, params: dict, headers: Optional[dict] = None, status: int = 200) -> None:
+    response = client.get("/blog/", params=params, headers=headers or {})
+    assert response.status_code == status, response.status_code
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    public_rows = int(args.rows * 0.9)
+    depths = [d for d in (0, 1_000, 10_000, 100_000, 500_000, 850_000) if d < public_rows - args.limit]
+
+    db = SessionLocal()
+    results = []
+    endpoint_results = []
+    try:
+        with TestClient(app) as client:
+            for depth in depths:
+                offset = summarize(measure(lambda: fetch_post_list(db, None, depth, args.limit, None), args.repeat))
+                key = cursor_at(db, depth) if depth else None
+                cursor = summarize(measure(lambda: fetch_post_list(db, None, 0, args.limit, key), args.repeat))
+                results.append((depth, offset["median_ms"], offset["p95_ms"], cursor["median_ms"], cursor["p95_ms"]))
+
+                offset_params = {"skip": depth, "limit": args.limit}
+                cursor_params = {"limit": args.limit, **({"cursor": encode_cursor(*key)} if key else {})}
+                endpoint_offset = summarize(measure(lambda: get_ok(client, offset_params), args.repeat))
+                endpoint_cursor = summarize(measure(lambda: get_ok(client, cursor_params), args.repeat))
+                etag = client.get("/blog/", params=cursor_params).headers["ETag"]
+                revalidate = summarize(
+                    measure(lambda: get_ok(client, cursor_params, {"If-None-Match": etag}, 304), args.repeat)
+                )
+                endpoint_results.append((
+                    depth,
+                    endpoint_offset["median_ms"],
+                    endpoint_offset["p95_ms"],
+                    endpoint_cursor["median_ms"],
+                    endpoint_cursor["p95_ms"],
+                    revalidate["median_ms"],
+                ))
+    finally:
+        db.close()
+
+    print(f"{engine.url.get_backend_name()}, {args.rows} rows, limit {args.limit}, {args.repeat} runs per depth")
+    print("fetch_post_list")
+    print_table(["depth", "offset_median_ms", "offset_p95_ms", "cursor_median_ms", "cursor_p95_ms"], results)
+    print("GET /blog/")
+    print_table(
+        ["depth", "offset_median_ms", "offset_p95_ms", "cursor_median_ms", "cursor_p95_ms", "revalidate_median_ms"],
+        endpoint_results,
+    )
+
+
+if __name__ == "__main__":
+    main()
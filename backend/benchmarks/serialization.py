@@ -0,0 +1,187 @@
+"""Tek yazı ve liste yanıtlarının serileştirme maliyeti: response_model doğrulaması ve doğrudan orjson.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.serialization --comments 10 100 1000 --items 10 100 1000
+
+Veritabanı kullanılmaz; ORM nesneleri ve liste satırları bellekte oluşturulur,
+yani ölçülen yalnızca Python tarafındaki dönüştürme süresidir.
+    response_model: ORM nesnesi -> BlogPostOut doğrulaması -> jsonable_encoder -> JSONResponse
+                    (FastAPI'nin response_model ile izlediği yol)
+    orjson:         serialize_post -> ORJSONResponse (trusted_response)
+Liste (GET /blog/) için aynı iki yol list_blog_posts'un satırlarıyla ölçülür:
+    response_model: satır dict'leri -> List[BlogPostListItem] doğrulaması -> jsonable_encoder -> JSONResponse
+    orjson:         row._asdict() + bekleyen görüntülenmeler -> trusted_response
+API tek sayfada en fazla 100 yazı döndürür; 1000 yalnızca ölçeklenmeyi göstermek içindir.
+"""
+import argparse
+from collections import namedtuple
+from datetime import datetime, timedelta
+from typing import List
+
+from benchmarks.common import measure, print_table, setup_env, summarize
+
+setup_env("serialization")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.models.blog import BlogAttachment, BlogComment, BlogPost  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.routers.blog import list_item_query, serialize_post, trusted_response  # noqa: E402
+from app.schemas.blog import BlogPostListItem, BlogPostOut  # noqa: E402
+
+# list_item_query'nin döndürdüğü satırlarla aynı alanlar (sorgu çalıştırılmaz)
+ListRow = namedtuple("ListRow", [column["name"] for column in list_item_query(Session()).column_descriptions])
+LIST_ADAPTER = TypeAdapter(List[BlogPostListItem])
+
+
+def build_post(comment_count: int) -> BlogPost:
+    created = datetime(2024, 1, 1)
+    author = User(id=1, username="author", email="author@example.com")
+    post = BlogPost(
+        id=1,
+        title="Benchmark post",
+        slug="benchmark-post",
+        content="<p>" + "lorem ipsum dolor sit amet " * 200 + "</p>",
+        excerpt="lorem ipsum",
+        cover_image=None,
+        is_published=True,
+        is_approved=True,
+        views=42,
+        author_id=1,
+        author_username="author",
+        comment_count=comment_count,
+        created_at=created,
+        updated_at=created,
+    )
+    post.author = author
+    post.attachments = [
+        BlogAttachment(
+            id=i, post_id=1, filename=f"file{i}.pdf", file_url=f"/static/uploads/file{i}.pdf",
+            file_type="pdf", file_size=1024, uploaded_at=created,
+        )
+        for i in range(3)
+    ]
+    post.comments = [
+        BlogComment(
+            id=i, post_id=1, content=f"Comment {i} " * 10, author_id=1,
+            author=author, created_at=created + timedelta(minutes=i),
+        )
+        for i in range(comment_count)
+    ]
+    return post
+
+
+def comment_dicts(post: BlogPost) -> list:
+    # comment_rows'un döndürdüğü biçim
+    return [
+        {
+            "id": c.id,
+            "post_id": c.post_id,
+            "content": c.content,
+            "author_id": c.author_id,
+            "author_username": c.author.username,
+            "created_at": c.created_at,
+        }
+        for c in post.comments
+    ]
+
+
+def via_response_model(post: BlogPost) -> bytes:
+    validated = BlogPostOut.model_validate(post)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def via_orjson(post: BlogPost, comments: list) -> bytes:
+    return trusted_response(serialize_post(post, comments)).body
+
+
+def build_list_rows(count: int) -> list:
+    created = datetime(2024, 1, 1)
+    return [
+        ListRow(
+            id=i,
+            title=f"Benchmark post {i}",
+            slug=f"benchmark-post-{i}",
+            excerpt="lorem ipsum dolor sit amet " * 6,
+            cover_image=f"/static/uploads/blobs/{i:064x}-card.webp",
+            is_published=True,
+            is_approved=True,
+            views=i,
+            author_id=1,
+            created_at=created - timedelta(minutes=i),
+            author_username="author",
+            comment_count=i % 7,
+        )
+        for i in range(count)
+    ]
+
+
+def list_via_response_model(rows: list, pending: dict) -> bytes:
+    items = [{**row._asdict(), "views": row.views + pending.get(row.id, 0)} for row in rows]
+    validated = LIST_ADAPTER.validate_python(items)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def list_via_orjson(rows: list, pending: dict) -> bytes:
+    # list_blog_posts'taki döngü
+    result = []
+    for row in rows:
+        post_dict = row._asdict()
+        post_dict["views"] = (row.views or 0) + pending.get(row.id, 0)
+        result.append(post_dict)
+    return trusted_response(result).body
+
+
+def compare(size: int, slow_fn, fast_fn, repeat: int) -> tuple:
+    slow = summarize(measure(slow_fn, repeat))
+    fast = summarize(measure(fast_fn, repeat))
+    return (
+        size,
+        slow["median_ms"],
+        slow["p99_ms"],
+        fast["median_ms"],
+        fast["p99_ms"],
+        slow["median_ms"] / fast["median_ms"],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--comments", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--items", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    post_results = []
+    for count in args.comments:
+        post = build_post(count)
+        comments = comment_dicts(post)
+        post_results.append(
+            compare(count, lambda: via_response_model(post), lambda: via_orjson(post, comments), args.repeat)
+        )
+
+    list_results = []
+    for count in args.items:
+        rows = build_list_rows(count)
+        # Yazıların yarısında henüz flush edilmemiş görüntülenme var
+        pending = {row.id: 3 for row in rows[::2]}
+        list_results.append(compare(
+            count,
+            lambda: list_via_response_model(rows, pending),
+            lambda: list_via_orjson(rows, pending),
+            args.repeat,
+        ))
+
+    columns = ["model_median_ms", "model_p99_ms", "orjson_median_ms", "orjson_p99_ms", "speedup"]
+    print(f"{args.repeat} runs per size")
+    print("GET /blog/{slug}")
+    print_table(["comments", *columns], post_results)
+    print("GET /blog/")
+    print_table(["items", *columns], list_results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Büyük dosya yüklemesinde sunucunun tepe bellek kullanımı (RSS).
+
+Kullanım (backend dizininden, Linux):
+    python -m benchmarks.upload_memory --size-mb 500
+
+Uygulama ayrı bir uvicorn sürecinde çalışır; istemci multipart gövdeyi
+parça parça üretir, yani iki tarafta da dosya belleğe alınmaz. Yükleme
+akış halinde diske yazıldığından tepe RSS dosya boyutundan bağımsız
+kalmalı (birkaç parça boyutu kadar artar).
+"""
+import argparse
+import time
+import uuid
+
+from benchmarks.common import serve, setup_env
+
+WORKDIR = setup_env("upload_memory")
+
+import httpx  # noqa: E402
+
+from app.auth import create_access_token  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models.blog import BlogPost  # noqa: E402,F401 (User ilişkisi için)
+from app.models.user import User  # noqa: E402
+
+CHUNK = 1024 * 1024
+
+
+def _proc_status_kb(pid: int, field: str) -> int:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+
+def _token() -> str:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        username = f"bench-{uuid.uuid4().hex[:8]}"
+        user = User(username=username, email=f"{username}@example.com", hashed_password="!", is_approved=True)
+        db.add(user)
+        db.commit()
+        return create_access_token({"sub": str(user.id)})
+    finally:
+        db.close()
+
+
+def _multipart(size: int, boundary: str):
+    yield (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="big.txt"\r\n'
+        "Content-Type: text/plain\r\n\r\n"
+    ).encode()
+    block = b"x" * CHUNK
+    for offset in range(0, size, CHUNK):
+        yield block[:min(CHUNK, size - offset)]
+    yield f"\r\n--{boundary}--\r\n".encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=500)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    size = args.size_mb * 1024 * 1024
+
+    token = _token()
+    base_url = f"http://127.0.0.1:{args.port}"
+    with serve(WORKDIR, args.port, {"MAX_FILE_UPLOAD_BYTES": str(size + CHUNK)}) as server:
+        baseline = _proc_status_kb(server.pid, "VmRSS")
+
+        boundary = uuid.uuid4().hex
+        start = time.perf_counter()
+        response = httpx.post(
+            f"{base_url}/upload/file",
+            content=_multipart(size, boundary),
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": f"multipart/form-data; boundary={boundary}",
+            },
+            timeout=None,
+        )
+        elapsed = time.perf_counter() - start
+        peak = _proc_status_kb(server.pid, "VmHWM")
+
+    print(f"status {response.status_code}, {args.size_mb} MB in {elapsed:.1f}s")
+    print(f"server RSS before upload: {baseline / 1024:.1f} MB")
+    print(f"server peak RSS:          {peak / 1024:.1f} MB")
+    print(f"peak growth:              {(peak - baseline) / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
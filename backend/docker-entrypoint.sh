@@ -0,0 +1,10 @@
+#!/bin/sh
+# Prometheus çok süreçli metrik dosyaları önceki çalıştırmadan kalmasın;
+# ölü süreçlerin sayaçları /metrics'e karışır. Dizin süreçler başlamadan boşaltılır.
+set -e
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+    # Dizin bir tmpfs bağlama noktası olabilir; kendisi değil içeriği silinir
+    find "$PROMETHEUS_MULTIPROC_DIR" -mindepth 1 -delete
+fi
+exec "$@"
@@ -0,0 +1,87 @@
+"""Test ortamı: geçici SQLite veritabanı, süreç içi Redis ve sahte sohbet backend'i.
+
+Ayarlar modül import edilirken okunduğundan ortam değişkenleri app'ten önce ayarlanır.
+"""
+import os
+import tempfile
+import uuid
+from contextlib import contextmanager
+
+import pytest
+
+_workdir = tempfile.mkdtemp(prefix="blogsite-tests-")
+os.makedirs(os.path.join(_workdir, "static"), exist_ok=True)
+os.chdir(_workdir)
+
+os.environ["DATABASE_URL"] = f"sqlite:///{_workdir}/test.sqlite"
+os.environ["SECRET_KEY"] = "test-secret"
+os.environ["ADMIN_PANEL_SECRET"] = "test-admin-secret"
+os.environ["CHAT_BACKEND"] = "fake"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ.pop("REDIS_URL", None)
+os.environ["REDIS_FAKE"] = "true"
+# Kuyruk işleri ve periyodik görevler testlerle yarışmasın; testler işleri doğrudan çağırır
+os.environ["JOBS_IN_PROCESS"] = "false"
+os.environ.pop("DATABASE_ASYNC", None)
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import database  # noqa: E402
+from app.cache import redis_client  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from tests.factories import create_user  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(autouse=True)
+def clean_redis():
+    redis_client.flushall()
+    yield
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def author(db):
+    return create_user(db, f"author-{uuid.uuid4().hex[:8]}")
+
+
+@pytest.fixture
+def admin(db):
+    return create_user(db, f"admin-{uuid.uuid4().hex[:8]}", role="admin")
+
+
+class StatementLog(list):
+    """İstek sırasında çalışan SQL ifadeleri"""
+
+    @contextmanager
+    def capture(self):
+        self.clear()
+        yield self
+
+
+@pytest.fixture
+def statements(monkeypatch):
+    """database._instrument_statements'ın after_cursor_execute kancası üzerinden SQL ifadelerini say"""
+    log = StatementLog()
+    original = database.record_statement
+
+    def record(statement, duration):
+        log.append(statement)
+        original(statement, duration)
+
+    monkeypatch.setattr(database, "record_statement", record)
+    return log
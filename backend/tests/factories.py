@@ -0,0 +1,44 @@
+"""Testlerde kullanılan kayıt oluşturma yardımcıları"""
+from app.auth import create_access_token
+from app.models.blog import BlogComment, BlogPost
+from app.models.user import User
+
+
+def create_user(db, username: str, role: str = "user") -> User:
+    user = User(
+        username=username,
+        email=f"{username}@example.com",
+        hashed_password="!",
+        role=role,
+        is_approved=True,
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def auth_headers(user: User) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+
+def create_post(db, author: User, title: str, comments: int = 0, published: bool = True, **fields) -> BlogPost:
+    post = BlogPost(
+        title=title,
+        slug=fields.pop("slug", title.lower().replace(" ", "-")),
+        content=fields.pop("content", f"<p>{title}</p>"),
+        excerpt=fields.pop("excerpt", title),
+        is_published=published,
+        is_approved=published,
+        author_id=author.id,
+        author_username=author.username,
+        comment_count=comments,
+        **fields,
+    )
+    db.add(post)
+    db.flush()
+    for i in range(comments):
+        db.add(BlogComment(post_id=post.id, author_id=author.id, content=f"comment {i}"))
+    db.commit()
+    db.refresh(post)
+    return post
@@ -0,0 +1,42 @@
+"""Admin işlemleri önbellekteki kullanıcıyı (principal) hemen geçersiz kılar"""
+from app.cache import cache_get_json, user_cache_key
+from tests.factories import auth_headers, create_post, create_user
+
+
+def _comment(client, post, user):
+    return client.post(f"/blog/{post.id}/comments", json={"content": "hi"}, headers=auth_headers(user))
+
+
+def test_banned_user_with_cached_principal_cannot_write(client, db, author, admin):
+    post = create_post(db, author, f"Ban target {author.username}")
+    assert _comment(client, post, author).status_code == 200
+    assert cache_get_json(user_cache_key(author.id)) is not None
+
+    assert client.post(f"/admin/users/{author.id}/ban", headers=auth_headers(admin)).status_code == 200
+    response = _comment(client, post, author)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "User is banned"
+
+    assert client.post(f"/admin/users/{author.id}/unban", headers=auth_headers(admin)).status_code == 200
+    assert _comment(client, post, author).status_code == 200
+
+
+def test_approve_takes_effect_for_cached_pending_user(client, db, author, admin):
+    post = create_post(db, author, f"Approve target {author.username}")
+    pending = create_user(db, f"pending-{author.username}")
+    pending.is_approved = False
+    db.commit()
+
+    assert _comment(client, post, pending).status_code == 403
+    assert cache_get_json(user_cache_key(pending.id))["is_approved"] is False
+
+    assert client.post(f"/admin/users/{pending.id}/approve", headers=auth_headers(admin)).status_code == 200
+    assert _comment(client, post, pending).status_code == 200
+
+
+def test_make_admin_takes_effect_for_cached_user(client, author, admin):
+    assert client.get("/admin/users", headers=auth_headers(author)).status_code == 403
+    assert cache_get_json(user_cache_key(author.id))["role"] == "user"
+
+    assert client.post(f"/admin/make-admin/{author.id}", headers=auth_headers(admin)).status_code == 200
+    assert client.get("/admin/users", headers=auth_headers(author)).status_code == 200
@@ -0,0 +1,77 @@
+"""Kayıt, giriş ve şifre doğrulamalı hesap değişiklikleri"""
+import uuid
+
+from app import jobs
+from app.cache import redis_client
+from app.models.blog import BlogPost
+from app.models.user import User
+from tests.factories import create_post
+
+
+def _register(client, db):
+    name = f"auth-{uuid.uuid4().hex[:8]}"
+    response = client.post("/auth/register", json={"username": name, "email": f"{name}@example.com", "password": "secret-1"})
+    assert response.status_code == 200
+    db.query(User).filter(User.username == name).update({User.is_approved: True})
+    db.commit()
+    return name
+
+
+def _login(client, name, password="secret-1"):
+    return client.post("/auth/login", json={"username": name, "password": password})
+
+
+def test_login(client, db):
+    name = _register(client, db)
+    assert _login(client, name, "wrong").status_code == 401
+    response = _login(client, name)
+    assert response.status_code == 200 and response.json()["token_type"] == "bearer"
+
+
+def test_account_changes_after_password_check(client, db):
+    name = _register(client, db)
+    headers = {"Authorization": f"Bearer {_login(client, name).json()['access_token']}"}
+
+    response = client.put(
+        "/auth/change-email", json={"new_email": f"new-{name}@example.com", "current_password": "secret-1"}, headers=headers
+    )
+    assert response.status_code == 200 and response.json()["email"] == f"new-{name}@example.com"
+
+    response = client.put(
+        "/auth/change-password", json={"current_password": "secret-1", "new_password": "secret-2"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert _login(client, name).status_code == 401
+    assert _login(client, name, "secret-2").status_code == 200
+
+
+def test_username_change_refreshes_authored_and_commented_posts(client, db, author):
+    name = _register(client, db)
+    headers = {"Authorization": f"Bearer {_login(client, name).json()['access_token']}"}
+    user = db.query(User).filter(User.username == name).one()
+    own = create_post(db, user, f"Own post {name}")
+    other = create_post(db, author, f"Commented post {name}")
+    client.post(f"/blog/{other.id}/comments", json={"content": "hi"}, headers=headers)
+    updated_at = own.updated_at
+
+    etags = {post.slug: client.get(f"/blog/{post.slug}").headers["ETag"] for post in (own, other)}
+    list_etag = client.get("/blog/").headers["ETag"]
+
+    new_name = f"renamed-{name}"
+    response = client.put(
+        "/auth/change-username", json={"new_username": new_name, "current_password": "secret-1"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert client.get("/blog/", headers={"If-None-Match": list_etag}).status_code == 200
+    for raw in redis_client.lrange(jobs.QUEUE_KEY, 0, -1):
+        jobs.run_job(raw)
+
+    db.expire_all()
+    # Yazar adı değişikliği içerik güncellemesi sayılmaz
+    assert db.get(BlogPost, own.id).updated_at == updated_at
+    own_response = client.get(f"/blog/{own.slug}", headers={"If-None-Match": etags[own.slug]})
+    assert own_response.status_code == 200
+    assert own_response.json()["author_username"] == new_name
+    other_response = client.get(f"/blog/{other.slug}", headers={"If-None-Match": etags[other.slug]})
+    assert other_response.status_code == 200
+    assert [c["author_username"] for c in other_response.json()["comments"]] == [new_name]
@@ -0,0 +1,23 @@
+"""Denormalize yazı kolonları sonradan eklendiğinde başlangıçta doldurulur"""
+from sqlalchemy import text
+
+from app.database import engine
+from app.main import on_startup
+from app.models.blog import BlogPost
+from tests.factories import create_post
+
+
+def test_startup_backfills_added_counter_columns(client, db, author):
+    post = create_post(db, author, f"Legacy post {author.username}", comments=3)
+    post_id, username = post.id, author.username
+    db.close()
+    # Kolonları olmayan eski bir şemayı taklit et
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE blog_posts DROP COLUMN author_username"))
+        conn.execute(text("ALTER TABLE blog_posts DROP COLUMN comment_count"))
+
+    on_startup()
+
+    refreshed = db.get(BlogPost, post_id)
+    assert refreshed.author_username == username
+    assert refreshed.comment_count == 3
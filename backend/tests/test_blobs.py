@@ -0,0 +1,82 @@
+"""Blob GC: yazılardan bağlantılı içerik korunur, silme ile yükleme aynı kilidi paylaşır"""
+import hashlib
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import blobs, jobs
+from app.cache import redis_client
+from app.config import settings
+from app.models.blob import StoredBlob
+from app.tasks import delete_blob_objects
+from tests.factories import auth_headers, create_post
+
+
+def _stale_blob(db, sha256=None) -> StoredBlob:
+    blob = StoredBlob(
+        sha256=sha256 or hashlib.sha256(uuid.uuid4().bytes).hexdigest(),
+        kind="raw",
+        ext=".pdf",
+        size=1,
+        ref_count=0,
+        last_uploaded_at=datetime.utcnow() - timedelta(seconds=settings.BLOB_GC_GRACE_SECONDS + 60),
+    )
+    db.add(blob)
+    db.commit()
+    return blob
+
+
+def test_gc_keeps_blobs_linked_from_posts(client, db, author):
+    linked, unlinked = _stale_blob(db), _stale_blob(db)
+    linked_sha, unlinked_sha = linked.sha256, unlinked.sha256
+    create_post(db, author, f"Linked {author.username}", content=f'<img src="/static/uploads/blobs/{linked_sha}.pdf">')
+
+    blobs.collect_garbage()
+
+    db.expire_all()
+    remaining = {sha for (sha,) in db.query(StoredBlob.sha256).filter(StoredBlob.sha256.in_([linked_sha, unlinked_sha]))}
+    assert remaining == {linked_sha}
+    # Depodaki nesneler kuyruktaki işle silinir
+    queued = [json.loads(raw) for raw in redis_client.lrange(jobs.QUEUE_KEY, 0, -1)]
+    assert [(m["name"], m["payload"]["sha256"]) for m in queued] == [("delete_blob_objects", unlinked_sha)]
+    assert queued[0]["payload"]["keys"] == [blobs.blob_key(unlinked_sha, ".pdf")]
+
+
+class DeleteRecorder:
+    def __init__(self):
+        self.deleted = []
+
+    def delete(self, key):
+        self.deleted.append(key)
+
+
+def test_delete_waits_for_upload_lock(client, monkeypatch):
+    monkeypatch.setattr(settings, "BLOB_LOCK_WAIT", 0.1)
+    sha256 = hashlib.sha256(uuid.uuid4().bytes).hexdigest()
+    storage = DeleteRecorder()
+    monkeypatch.setattr("app.tasks.get_storage", lambda: storage)
+
+    with blobs.blob_lock(sha256):
+        with pytest.raises(blobs.BlobLockTimeout):
+            delete_blob_objects(sha256, ["some/key"])
+    assert storage.deleted == []
+
+    # Kilit bırakılınca iş (kuyruktaki tekrar denemesi) nesneleri siler
+    delete_blob_objects(sha256, ["some/key"])
+    assert storage.deleted == ["some/key"]
+
+
+def test_upload_waits_for_delete_lock(client, author, monkeypatch):
+    monkeypatch.setattr(settings, "BLOB_LOCK_WAIT", 0.1)
+    content = b"%PDF-1.4 " + uuid.uuid4().bytes
+    sha256 = hashlib.sha256(content).hexdigest()
+    files = {"file": ("doc.pdf", content, "application/pdf")}
+
+    with blobs.blob_lock(sha256):
+        response = client.post("/upload/file", files=files, headers=auth_headers(author))
+    assert response.status_code == 503
+
+    response = client.post("/upload/file", files=files, headers=auth_headers(author))
+    assert response.status_code == 200 and response.json()["sha256"] == sha256
@@ -0,0 +1,43 @@
+"""Upload gövde sınırı: Content-Length ve chunked istekler"""
+import asyncio
+
+from app.middleware import BodySizeLimitMiddleware
+
+
+async def _consume_app(scope, receive, send):
+    while (await receive()).get("more_body"):
+        pass
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _call(headers, chunks, max_body_size=10):
+    scope = {"type": "http", "path": "/upload/image", "headers": headers}
+    messages = [{"type": "http.request", "body": c, "more_body": i < len(chunks) - 1} for i, c in enumerate(chunks)]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = BodySizeLimitMiddleware(_consume_app, path_prefix="/upload", max_body_size=max_body_size)
+    asyncio.run(middleware(scope, receive, send))
+    return sent[0]["status"]
+
+
+def test_malformed_content_length_is_400():
+    assert _call([(b"content-length", b"12abc")], [b"x"]) == 400
+
+
+def test_declared_size_over_limit_is_413():
+    assert _call([(b"content-length", b"11")], [b"x" * 11]) == 413
+
+
+def test_chunked_body_over_limit_is_413():
+    assert _call([], [b"x" * 6, b"x" * 6]) == 413
+
+
+def test_body_within_limit_passes():
+    assert _call([(b"content-length", b"10")], [b"x" * 5, b"x" * 5]) == 200
@@ -0,0 +1,31 @@
+import pytest
+
+from app import cache
+from app.cache import post_cache_key, redis_client
+from tests.factories import auth_headers, create_post
+
+
+def test_redis_client_requires_url_unless_fake_is_enabled(monkeypatch):
+    monkeypatch.setattr(cache.settings, "REDIS_URL", None)
+    monkeypatch.setattr(cache.settings, "REDIS_FAKE", False)
+    with pytest.raises(RuntimeError):
+        cache._create_client()
+
+
+def test_published_post_is_cached_and_invalidated_on_update(client, db, author):
+    post = create_post(db, author, "Cached post title")
+    slug = post.slug
+    assert client.get(f"/blog/{slug}").status_code == 200
+    assert redis_client.exists(post_cache_key(slug))
+
+    payload = {
+        "title": post.title,
+        "content": post.content,
+        "excerpt": "changed",
+        "cover_image": None,
+        "is_published": True,
+    }
+    response = client.put(f"/blog/{post.id}", json=payload, headers=auth_headers(author))
+    assert response.status_code == 200
+    assert not redis_client.exists(post_cache_key(slug))
+    assert client.get(f"/blog/{slug}").json()["excerpt"] == "changed"
@@ -0,0 +1,45 @@
+"""Sohbet yanıt önbelleği: tam ve yakın eşleşmeler"""
+from app import chat_cache
+from app.chat_backends import FakeBackend
+from app.config import settings
+from tests.factories import auth_headers
+
+SYSTEM = "system"
+
+
+def _key(message, history=()):
+    contents = [*history, {"role": "user", "parts": [message]}]
+    return chat_cache.ChatCacheKey(SYSTEM, "fake", contents, 0.5)
+
+
+def test_exact_hit_ignores_whitespace_and_case():
+    chat_cache.store(_key("What is FastAPI?"), "a web framework", 1.0)
+    assert chat_cache.lookup(_key("  what is   fastapi?")) == "a web framework"
+    assert chat_cache.lookup(_key("What is Django?")) is None
+
+
+def test_near_duplicate_hit(monkeypatch):
+    monkeypatch.setattr(settings, "CHAT_CACHE_NEAR_DUPLICATES", True)
+    message = "how do i add a new column to an existing table with alembic migrations"
+    chat_cache.store(_key(message), "use op.add_column", 1.0)
+    assert chat_cache.lookup(_key(message + " please")) == "use op.add_column"
+    # Farklı geçmiş farklı bağlamdır
+    history = [{"role": "user", "parts": ["hi"]}, {"role": "model", "parts": ["hello"]}]
+    assert chat_cache.lookup(_key(message + " please", history)) is None
+
+
+def test_repeated_chat_message_skips_backend(client, author, monkeypatch):
+    calls = []
+    original = FakeBackend.generate
+
+    async def counting_generate(self, contents, temperature):
+        calls.append(contents)
+        return await original(self, contents, temperature)
+
+    monkeypatch.setattr(FakeBackend, "generate", counting_generate)
+    headers = auth_headers(author)
+    first = client.post("/gemini/chat", json={"message": "cache me"}, headers=headers).json()
+    second = client.post("/gemini/chat", json={"message": "cache me"}, headers=headers).json()
+    assert second["response"] == first["response"]
+    assert second["conversation_id"] != first["conversation_id"]
+    assert len(calls) == 1
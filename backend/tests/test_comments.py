@@ -0,0 +1,105 @@
+"""Yorum sayfalama: before/since cursor'ları, eşit created_at değerleri ve önizleme sınırı"""
+from datetime import datetime, timedelta
+
+from app.models.blog import BlogComment
+from app.routers.blog import COMMENT_PREVIEW_LIMIT, comment_rows, encode_cursor
+from tests.factories import auth_headers, create_post
+
+START = datetime(2024, 1, 1)
+
+
+def _seed_tied_comments(db, post, author, groups: int = 4, per_group: int = 6) -> list:
+    """Her grupta created_at değeri aynı olan yorumlar ekle; (created_at, id) sırasıyla id'leri döndür"""
+    comments = [
+        BlogComment(post_id=post.id, author_id=author.id, content=f"c{g}-{i}", created_at=START + timedelta(minutes=g))
+        for g in range(groups)
+        for i in range(per_group)
+    ]
+    db.add_all(comments)
+    db.commit()
+    return [c.id for c in sorted(comments, key=lambda c: (c.created_at, c.id))]
+
+
+def test_before_cursor_pages_back_without_gaps_or_duplicates(client, db, author):
+    post = create_post(db, author, f"Comments back {author.username}")
+    expected = _seed_tied_comments(db, post, author)
+
+    pages = []
+    params = {"limit": 5}
+    while True:
+        response = client.get(f"/blog/{post.id}/comments", params=params)
+        assert response.status_code == 200
+        page = [c["id"] for c in response.json()]
+        # Her sayfa kendi içinde eskiden yeniye sıralı
+        assert page == sorted(page, key=expected.index)
+        pages.insert(0, page)
+        cursor = response.headers.get("X-Before-Cursor")
+        if not cursor:
+            break
+        params = {"limit": 5, "before": cursor}
+
+    assert [comment_id for page in pages for comment_id in page] == expected
+
+
+def test_since_cursor_pages_forward_and_picks_up_new_comments(client, db, author):
+    post = create_post(db, author, f"Comments forward {author.username}")
+    expected = _seed_tied_comments(db, post, author)
+
+    seen = []
+    since = encode_cursor(START - timedelta(days=1), 0)
+    while True:
+        response = client.get(f"/blog/{post.id}/comments", params={"limit": 7, "since": since})
+        assert response.status_code == 200
+        assert "X-Before-Cursor" not in response.headers
+        page = [c["id"] for c in response.json()]
+        since = response.headers["X-Since-Cursor"]
+        if not page:
+            break
+        seen.extend(page)
+    assert seen == expected
+
+    created = client.post(f"/blog/{post.id}/comments", json={"content": "late"}, headers=auth_headers(author))
+    response = client.get(f"/blog/{post.id}/comments", params={"since": since})
+    assert [c["id"] for c in response.json()] == [created.json()["id"]]
+
+
+def test_comment_rows_reports_more_in_each_direction(db, author):
+    post = create_post(db, author, f"Comment rows {author.username}")
+    expected = _seed_tied_comments(db, post, author, groups=2, per_group=3)
+
+    newest, has_older = comment_rows(db, post.id, 4)
+    assert [c["id"] for c in newest] == expected[-4:]
+    assert has_older
+
+    first = newest[0]
+    older, has_older = comment_rows(db, post.id, 4, before=(first["created_at"], first["id"]))
+    assert [c["id"] for c in older] == expected[:2]
+    assert not has_older
+
+    last = older[-1]
+    newer, has_newer = comment_rows(db, post.id, 3, since=(last["created_at"], last["id"]))
+    assert [c["id"] for c in newer] == expected[2:5]
+    assert has_newer
+
+
+def test_malformed_cursor_returns_400(client, db, author):
+    post = create_post(db, author, f"Comments cursor {author.username}")
+    assert client.get(f"/blog/{post.id}/comments", params={"before": "not a cursor"}).status_code == 400
+    assert client.get(f"/blog/{post.id}/comments", params={"since": "bm9waXBl"}).status_code == 400
+    cursor = encode_cursor(START, 1)
+    both = client.get(f"/blog/{post.id}/comments", params={"before": cursor, "since": cursor})
+    assert both.status_code == 400
+
+
+def test_post_payload_caps_comment_preview(client, db, author):
+    total = COMMENT_PREVIEW_LIMIT + 5
+    post = create_post(db, author, f"Comments preview {author.username}", comments=total)
+
+    payload = client.get(f"/blog/{post.slug}").json()
+    assert payload["comment_count"] == total
+    assert len(payload["comments"]) == COMMENT_PREVIEW_LIMIT
+
+    everything = client.get(f"/blog/{post.id}/comments", params={"limit": 200}).json()
+    assert len(everything) == total
+    # Önizleme en yeni yorumlardır
+    assert payload["comments"] == everything[-COMMENT_PREVIEW_LIMIT:]
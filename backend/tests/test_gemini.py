@@ -0,0 +1,37 @@
+"""Sahte sohbet backend'i ile sunucu tarafı konuşma geçmişi"""
+from tests.factories import auth_headers
+
+
+def test_chat_keeps_conversation_server_side(client, author):
+    headers = auth_headers(author)
+    first = client.post("/gemini/chat", json={"message": "hello there"}, headers=headers).json()
+    assert first["response"] == "Echo: hello there"
+    conversation_id = first["conversation_id"]
+
+    second = client.post(
+        "/gemini/chat", json={"message": "and again", "conversation_id": conversation_id}, headers=headers
+    ).json()
+    assert second["conversation_id"] == conversation_id
+
+    conversation = client.get(f"/gemini/conversations/{conversation_id}", headers=headers).json()
+    assert [m["role"] for m in conversation["messages"]] == ["user", "model", "user", "model"]
+    assert conversation["stats"]["calls"] == 2
+
+
+def test_stream_saves_reply_to_conversation(client, author):
+    headers = auth_headers(author)
+    with client.stream("POST", "/gemini/chat/stream", json={"message": "stream me"}, headers=headers) as response:
+        body = "".join(response.iter_text())
+    assert "event: done" in body
+    conversation_id = body.split('"conversation_id": "')[1].split('"')[0]
+
+    conversation = client.get(f"/gemini/conversations/{conversation_id}", headers=headers).json()
+    last = conversation["messages"][-1]
+    assert last["role"] == "model" and last["content"].strip() == "Echo: stream me"
+
+
+def test_unknown_conversation_is_404(client, author):
+    response = client.post(
+        "/gemini/chat", json={"message": "hi", "conversation_id": "missing"}, headers=auth_headers(author)
+    )
+    assert response.status_code == 404
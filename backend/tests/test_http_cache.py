@@ -0,0 +1,49 @@
+"""Blog yanıtlarında koşullu istekler: yalnızca ETag ile doğrulama"""
+from tests.factories import auth_headers, create_post
+
+
+def _etag(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    assert "Last-Modified" not in response.headers
+    return response.headers["ETag"]
+
+
+def test_post_etag_follows_comment_create_and_delete(client, db, author):
+    post = create_post(db, author, f"Etag post {author.username}")
+    url = f"/blog/{post.slug}"
+    original = _etag(client, url)
+    assert client.get(url, headers={"If-None-Match": original}).status_code == 304
+
+    comment = client.post(f"/blog/{post.id}/comments", json={"content": "hi"}, headers=auth_headers(author)).json()
+    with_comment = _etag(client, url)
+    assert with_comment != original
+
+    response = client.delete(f"/blog/{post.id}/comments/{comment['id']}", headers=auth_headers(author))
+    assert response.status_code in (200, 204)
+    # Yorumsuz hali ilk yanıtla aynı içerikte; önemli olan yorumlu ETag'in geçersiz olması
+    assert client.get(url, headers={"If-None-Match": with_comment}).status_code == 200
+
+
+def test_list_etag_follows_post_delete(client, db, author):
+    post = create_post(db, author, f"Etag list {author.username}")
+    before = _etag(client, "/blog/")
+    response = client.delete(f"/blog/{post.id}", headers=auth_headers(author))
+    assert response.status_code in (200, 204)
+    assert client.get("/blog/", headers={"If-None-Match": before}).status_code == 200
+
+
+def test_list_etag_follows_post_and_comment_create(client, db, author):
+    create_post(db, author, f"Etag seed {author.username}")
+    before = _etag(client, "/blog/")
+    assert client.get("/blog/", headers={"If-None-Match": before}).status_code == 304
+
+    created = client.post(
+        "/blog/", json={"title": f"Etag new {author.username}", "content": "body", "excerpt": None, "cover_image": None},
+        headers=auth_headers(author),
+    ).json()
+    after_post = _etag(client, "/blog/")
+    assert after_post != before
+
+    client.post(f"/blog/{created['id']}/comments", json={"content": "hi"}, headers=auth_headers(author))
+    assert client.get("/blog/", headers={"If-None-Match": after_post}).status_code == 200
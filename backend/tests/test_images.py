@@ -0,0 +1,87 @@
+"""Görsel yükleme: WebP varyantları, EXIF temizliği, LQIP ve srcset"""
+import base64
+import io
+import uuid
+
+from PIL import Image
+
+from app.images import VARIANTS
+from tests.factories import auth_headers
+
+# EXIF etiketleri
+MAKE = 0x010F
+ORIENTATION = 0x0112
+GPS_IFD = 0x8825
+
+
+def _jpeg_with_exif(width: int, height: int, orientation: int = 1) -> bytes:
+    # Her testte farklı içerik; aynı özet tekrar kullanılmasın
+    image = Image.new("RGB", (width, height), color=tuple(uuid.uuid4().bytes[:3]))
+    exif = Image.Exif()
+    exif[MAKE] = "TestCam"
+    exif[ORIENTATION] = orientation
+    exif[GPS_IFD] = {1: "N", 2: (41.0, 0.0, 0.0)}
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", exif=exif.tobytes(), quality=90)
+    return buffer.getvalue()
+
+
+def _upload(client, user, data: bytes) -> dict:
+    files = {"file": ("photo.jpg", data, "image/jpeg")}
+    response = client.post("/upload/image", files=files, headers=auth_headers(user))
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _open(client, url: str) -> Image.Image:
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    return Image.open(io.BytesIO(response.content))
+
+
+def test_jpeg_variants_are_resized_webp_without_exif(client, author):
+    source = _jpeg_with_exif(2400, 1200)
+    assert Image.open(io.BytesIO(source)).getexif()[MAKE] == "TestCam"
+
+    manifest = _upload(client, author, source)
+    assert (manifest["width"], manifest["height"]) == (2400, 1200)
+    assert list(manifest["variants"]) == list(VARIANTS)
+    for name, max_width in VARIANTS.items():
+        variant = manifest["variants"][name]
+        assert (variant["width"], variant["height"]) == (max_width, max_width // 2)
+        with _open(client, variant["url"]) as image:
+            assert image.format == "WEBP"
+            assert image.size == (max_width, max_width // 2)
+            assert not image.getexif()
+            assert "exif" not in image.info
+    assert manifest["url"] == manifest["variants"]["full"]["url"]
+
+    # srcset genişliğe göre artan sırada
+    assert manifest["srcset"] == ", ".join(
+        f"{manifest['variants'][name]['url']} {width}w" for name, width in VARIANTS.items()
+    )
+
+
+def test_placeholder_is_tiny_webp_data_uri(client, author):
+    manifest = _upload(client, author, _jpeg_with_exif(1000, 500))
+    prefix = "data:image/webp;base64,"
+    assert manifest["placeholder"].startswith(prefix)
+    with Image.open(io.BytesIO(base64.b64decode(manifest["placeholder"][len(prefix):]))) as placeholder:
+        assert placeholder.format == "WEBP"
+        assert placeholder.size == (16, 8)
+
+
+def test_exif_orientation_is_applied_to_pixels(client, author):
+    # Orientation 6: 90° döndürülerek gösterilir; varyantlar dik olmalı
+    manifest = _upload(client, author, _jpeg_with_exif(1200, 600, orientation=6))
+    assert (manifest["width"], manifest["height"]) == (600, 1200)
+    assert (manifest["variants"]["thumb"]["width"], manifest["variants"]["thumb"]["height"]) == (320, 640)
+
+
+def test_small_image_is_not_upscaled_and_srcset_has_no_duplicates(client, author):
+    manifest = _upload(client, author, _jpeg_with_exif(500, 250))
+    widths = {name: variant["width"] for name, variant in manifest["variants"].items()}
+    assert widths == {"thumb": 320, "card": 500, "full": 500}
+    entries = manifest["srcset"].split(", ")
+    assert [entry.rsplit(" ", 1)[1] for entry in entries] == ["320w", "500w"]
@@ -0,0 +1,62 @@
+"""İş kuyruğu: işlem listesi, çöken worker'ın işlerinin geri alınması"""
+import asyncio
+import json
+
+from app import jobs
+from app.cache import redis_client
+
+calls = []
+
+
+@jobs.job("test_record", max_attempts=2)
+def _record(value):
+    calls.append(value)
+
+
+def _run_worker_until(predicate, timeout=5.0):
+    async def main():
+        worker = asyncio.create_task(jobs.run_worker(2))
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not predicate():
+            assert asyncio.get_running_loop().time() < deadline
+            await asyncio.sleep(0.01)
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+
+    asyncio.run(main())
+
+
+def test_worker_runs_job_and_clears_processing_list():
+    calls.clear()
+    jobs.enqueue("test_record", value=1)
+
+    _run_worker_until(lambda: calls == [1])
+
+    assert redis_client.llen(jobs.QUEUE_KEY) == 0
+    assert list(redis_client.scan_iter(match=f"{jobs.PROCESSING_PREFIX}*")) == []
+    # Düzgün kapanan worker nabzını siler
+    assert list(redis_client.scan_iter(match=f"{jobs.HEARTBEAT_PREFIX}*")) == []
+
+
+def test_jobs_of_stopped_worker_are_requeued():
+    message = json.dumps({"id": "x", "name": "test_record", "payload": {"value": 2}, "attempts": 0})
+    # Çökmüş worker: işlem listesi dolu, nabzı yok
+    redis_client.lpush(f"{jobs.PROCESSING_PREFIX}dead", message)
+    # Çalışan worker: listesine dokunulmamalı
+    redis_client.lpush(f"{jobs.PROCESSING_PREFIX}alive", message)
+    redis_client.set(f"{jobs.HEARTBEAT_PREFIX}alive", 1)
+
+    assert jobs.requeue_orphaned_jobs() == 1
+    assert redis_client.lrange(jobs.QUEUE_KEY, 0, -1) == [message]
+    assert redis_client.llen(f"{jobs.PROCESSING_PREFIX}dead") == 0
+    assert redis_client.llen(f"{jobs.PROCESSING_PREFIX}alive") == 1
+
+
+def test_job_taken_by_worker_stays_listed_until_finished():
+    jobs.enqueue("test_record", value=3)
+    raw = jobs._next_job(f"{jobs.PROCESSING_PREFIX}w1", 1)
+    # İş ortasında çökme: iş kuyrukta değil ama işlem listesinde duruyor
+    assert redis_client.llen(jobs.QUEUE_KEY) == 0
+    assert redis_client.lrange(f"{jobs.PROCESSING_PREFIX}w1", 0, -1) == [raw]
+    assert jobs.requeue_orphaned_jobs() == 1
+    assert redis_client.lrange(jobs.QUEUE_KEY, 0, -1) == [raw]
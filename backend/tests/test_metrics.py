@@ -0,0 +1,43 @@
+"""/metrics: istek metrikleri ham path yerine route şablonuyla etiketlenir"""
+from prometheus_client.parser import text_string_to_metric_families
+
+from tests.factories import create_post
+
+
+def _request_counts(client) -> dict:
+    # Mount yolu; "/metrics" isteği önce buraya yönlendirilir
+    response = client.get("/metrics/")
+    assert response.status_code == 200
+    counts = {}
+    for family in text_string_to_metric_families(response.text):
+        if family.name != "http_requests":
+            continue
+        for sample in family.samples:
+            if sample.name == "http_requests_total":
+                key = (sample.labels["method"], sample.labels["route"], sample.labels["status"])
+                counts[key] = sample.value
+    return counts
+
+
+def test_requests_are_labelled_by_route_template(client, db, author):
+    post = create_post(db, author, f"Metrics post {author.username}")
+    before = _request_counts(client)
+
+    assert client.get(f"/blog/{post.slug}").status_code == 200
+    assert client.get(f"/blog/{post.id}/comments").status_code == 200
+    assert client.get("/blog/no-such-post").status_code == 404
+    assert client.get("/static/uploads/missing.txt").status_code == 404
+    assert client.get("/definitely/not/a/route").status_code == 404
+
+    after = _request_counts(client)
+    delta = {key: value - before.get(key, 0) for key, value in after.items() if value != before.get(key, 0)}
+    assert delta == {
+        ("GET", "/blog/{slug}", "200"): 1,
+        ("GET", "/blog/{post_id}/comments", "200"): 1,
+        ("GET", "/blog/{slug}", "404"): 1,
+        ("GET", "/static", "404"): 1,
+        ("GET", "<unmatched>", "404"): 1,
+        # İlk /metrics isteği de sayılır
+        ("GET", "/metrics", "200"): 1,
+    }
+    assert not any(post.slug in route or str(post.id) in route for _, route, _ in after)
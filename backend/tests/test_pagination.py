@@ -0,0 +1,32 @@
+"""Public liste: keyset sayfalama ve partial indeks kullanımı"""
+from sqlalchemy.dialects import sqlite
+
+from app.models.blog import BlogPost
+from app.routers.blog import apply_visibility, list_item_query
+from tests.factories import create_post
+
+
+def test_cursor_pages_match_offset_listing(client, db, author):
+    for i in range(7):
+        create_post(db, author, f"Paged {author.username} {i}")
+    expected = [p["id"] for p in client.get("/blog/", params={"limit": 100}).json()]
+    assert len(expected) < 100
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/blog/", params=params)
+        seen += [p["id"] for p in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor or not response.json():
+            break
+    assert seen == expected
+
+
+def test_public_list_uses_partial_index(db):
+    query = apply_visibility(list_item_query(db), None)
+    query = query.order_by(BlogPost.created_at.desc(), BlogPost.id.desc()).limit(20)
+    sql = str(query.statement.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+    plan = " ".join(row[3] for row in db.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + sql))
+    assert "ix_blog_posts_public_created_at_id" in plan
+    assert "TEMP B-TREE" not in plan
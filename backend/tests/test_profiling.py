@@ -0,0 +1,46 @@
+"""İstek profilleme: yalnızca yöneticilerin işaretli istekleri profillenir"""
+from app.cache import redis_client
+from app.profiling import profile_key
+from tests.factories import auth_headers
+
+PROFILE = {"X-Profile": "1"}
+
+
+def _stored_profiles() -> list:
+    return list(redis_client.scan_iter(match=profile_key("*")))
+
+
+def test_admin_request_gets_pyinstrument_output(client, admin):
+    response = client.get("/blog/", headers={**auth_headers(admin), **PROFILE})
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+    assert _stored_profiles() == [profile_key(profile_id)]
+
+    url = f"/admin/profiles/{profile_id}"
+    html = client.get(url, headers=auth_headers(admin))
+    assert html.status_code == 200
+    assert html.headers["content-type"].startswith("text/html")
+    assert "pyinstrument" in html.text
+
+    speedscope = client.get(url, params={"format": "speedscope"}, headers=auth_headers(admin))
+    assert speedscope.status_code == 200
+    assert speedscope.json()["$schema"] == "https://www.speedscope.app/file-format-schema.json"
+
+    meta = client.get(url, params={"format": "json"}, headers=auth_headers(admin)).json()
+    assert (meta["route"], meta["status"], meta["user_id"]) == ("/blog/", 200, admin.id)
+    assert meta["sql"]["count"] >= 1
+
+
+def test_profile_flag_is_ignored_for_non_admins(client, author):
+    for headers in ({**auth_headers(author), **PROFILE}, PROFILE, {"Authorization": "Bearer broken", **PROFILE}):
+        response = client.get("/blog/", params={"profile": "1"}, headers=headers)
+        assert "X-Profile-Id" not in response.headers
+        assert response.status_code != 403
+    assert client.get("/blog/", headers={**auth_headers(author), **PROFILE}).status_code == 200
+    # Yönetici olmayan istekler için profil hiç üretilmez
+    assert _stored_profiles() == []
+
+
+def test_non_admin_cannot_read_profiles(client, admin, author):
+    profile_id = client.get("/blog/", headers={**auth_headers(admin), **PROFILE}).headers["X-Profile-Id"]
+    assert client.get(f"/admin/profiles/{profile_id}", headers=auth_headers(author)).status_code == 403
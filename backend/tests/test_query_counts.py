@@ -0,0 +1,68 @@
+"""Liste endpoint'lerinin çalıştırdığı SQL ifadesi sayısı yazı/yorum sayısıyla artmamalı (N+1 regresyonu)"""
+import uuid
+
+import pytest
+
+from tests.factories import auth_headers, create_post
+
+
+# Endpoint başına beklenen ifade sayısı; azalırsa da güncellenmeli
+EXPECTED_STATEMENTS = {
+    "list": 1,
+    "search": 1,
+    "post_by_id": 3,
+    "admin_user_blogs": 4,
+}
+
+
+def _seed(db, author, count: int, comments: int, word: str) -> list:
+    return [
+        create_post(db, author, f"{word} {uuid.uuid4().hex[:8]}", comments=comments, content=f"<p>{word} body</p>")
+        for _ in range(count)
+    ]
+
+
+def _count(client, statements, url, headers=None):
+    # İlk istek kullanıcı bilgisini Redis'e yazar; yalnızca ikinci istek sayılır
+    if headers:
+        client.get(url, headers=headers)
+    with statements.capture():
+        response = client.get(url, headers=headers)
+    return response
+
+
+@pytest.mark.parametrize("posts", [2, 12])
+def test_list_blog_posts_statement_count(client, db, author, statements, posts):
+    _seed(db, author, posts, comments=3, word="listing")
+    response = _count(client, statements, "/blog/?limit=50")
+    assert response.status_code == 200
+    assert len(response.json()) >= posts
+    assert len(statements) == EXPECTED_STATEMENTS["list"], statements
+
+
+@pytest.mark.parametrize("posts", [2, 12])
+def test_search_statement_count(client, db, author, statements, posts):
+    word = f"needle{uuid.uuid4().hex[:6]}"
+    _seed(db, author, posts, comments=3, word=word)
+    response = _count(client, statements, f"/blog/search?q={word}&limit=50")
+    assert response.status_code == 200
+    assert len(response.json()) == posts
+    assert len(statements) == EXPECTED_STATEMENTS["search"], statements
+
+
+@pytest.mark.parametrize("comments", [1, 30])
+def test_get_post_by_id_statement_count(client, db, author, statements, comments):
+    post = create_post(db, author, f"by id {uuid.uuid4().hex[:8]}", comments=comments)
+    response = _count(client, statements, f"/blog/id/{post.id}", auth_headers(author))
+    assert response.status_code == 200
+    assert response.json()["comment_count"] == comments
+    assert len(statements) == EXPECTED_STATEMENTS["post_by_id"], statements
+
+
+@pytest.mark.parametrize("posts", [1, 8])
+def test_admin_user_blogs_statement_count(client, db, author, admin, statements, posts):
+    _seed(db, author, posts, comments=4, word="admin")
+    response = _count(client, statements, f"/admin/users/{author.id}/blogs", auth_headers(admin))
+    assert response.status_code == 200
+    assert len(response.json()) == posts
+    assert len(statements) == EXPECTED_STATEMENTS["admin_user_blogs"], statements
@@ -0,0 +1,68 @@
+"""GET /blog/search'in SQLite FTS5 yedeği"""
+import uuid
+
+from tests.factories import create_post
+
+
+def _word() -> str:
+    return f"term{uuid.uuid4().hex[:8]}"
+
+
+def _search(client, q: str) -> list:
+    response = client.get("/blog/search", params={"q": q})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_search_matches_text_and_ranks_title_hits_first(client, db, author):
+    word = _word()
+    body_hit = create_post(db, author, f"Body {uuid.uuid4().hex[:6]}", content=f"<p>about {word}</p>")
+    title_hit = create_post(db, author, f"Title {word}")
+
+    results = _search(client, word)
+    assert [r["id"] for r in results] == [title_hit.id, body_hit.id]
+    assert results[0]["rank"] >= results[1]["rank"]
+
+
+def test_search_ignores_html_tags(client, db, author):
+    word = _word()
+    post = create_post(db, author, f"Tags {word}", content=f"<p>Napoleon <b>{word}</b> <span class='x'>bonaparte</span></p>")
+
+    assert post.id not in [r["id"] for r in _search(client, "span")]
+    assert post.id not in [r["id"] for r in _search(client, "class")]
+    [result] = _search(client, f"bonaparte {word}")
+    assert "<b>" not in result["snippet"] and "span" not in result["snippet"]
+
+
+def test_snippet_escapes_user_html(client, db, author):
+    word = _word()
+    create_post(
+        db,
+        author,
+        f"Escape {uuid.uuid4().hex[:6]}",
+        excerpt=f"<img src=x onerror=alert(1)> {word}",
+        content=f"<p>&lt;script&gt;alert(1)&lt;/script&gt; {word}</p>",
+    )
+
+    [result] = _search(client, word)
+    snippet = result["snippet"]
+    assert f"<mark>{word}</mark>" in snippet
+    assert "<img" not in snippet and "<script" not in snippet
+    assert "&lt;" in snippet
+
+
+def test_search_respects_visibility_and_follows_updates(client, db, author):
+    word = _word()
+    draft = create_post(db, author, f"Draft {word}", published=False)
+    assert _search(client, word) == []
+
+    new_word = _word()
+    draft.is_published = True
+    draft.is_approved = True
+    draft.content = f"<p>{new_word}</p>"
+    db.commit()
+    assert [r["id"] for r in _search(client, new_word)] == [draft.id]
+
+    db.delete(draft)
+    db.commit()
+    assert _search(client, new_word) == []
@@ -0,0 +1,95 @@
+"""/static: güçlü ETag, koşullu istekler, byte aralıkları ve X-Accel-Redirect/X-Sendfile modu"""
+import hashlib
+import os
+import uuid
+
+import pytest
+
+from app.config import settings
+
+BODY = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def blob_file(client):
+    """İçerik adreslenmiş adla static/uploads/blobs altına yazılmış dosya"""
+    data = BODY + uuid.uuid4().bytes
+    name = f"{hashlib.sha256(data).hexdigest()}.bin"
+    path = os.path.join("static", "uploads", "blobs", name)
+    with open(path, "wb") as f:
+        f.write(data)
+    yield f"/static/uploads/blobs/{name}", data
+    os.remove(path)
+
+
+def test_hashed_file_has_strong_etag_and_304(client, blob_file):
+    url, data = blob_file
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.content == data
+    etag = response.headers["etag"]
+    assert etag == f'"{os.path.basename(url).split(".")[0]}"'
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert response.headers["accept-ranges"] == "bytes"
+
+    not_modified = client.get(url, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_single_and_suffix_ranges(client, blob_file):
+    url, data = blob_file
+    response = client.get(url, headers={"Range": "bytes=0-9"})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 0-9/{len(data)}"
+    assert response.headers["content-length"] == "10"
+    assert response.content == data[:10]
+
+    suffix = client.get(url, headers={"Range": "bytes=-5"})
+    assert suffix.status_code == 206
+    assert suffix.headers["content-range"] == f"bytes {len(data) - 5}-{len(data) - 1}/{len(data)}"
+    assert suffix.content == data[-5:]
+
+    open_ended = client.get(url, headers={"Range": f"bytes={len(data) - 3}-"})
+    assert open_ended.status_code == 206
+    assert open_ended.content == data[-3:]
+
+
+def test_unsatisfiable_range_returns_416(client, blob_file):
+    url, data = blob_file
+    response = client.get(url, headers={"Range": f"bytes={len(data)}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(data)}"
+
+
+def test_stale_if_range_sends_full_file(client, blob_file):
+    url, data = blob_file
+    response = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert response.status_code == 200
+    assert response.content == data
+
+
+@pytest.mark.parametrize("method", ["GET", "HEAD"])
+def test_x_accel_redirect_mode(client, blob_file, monkeypatch, method):
+    monkeypatch.setattr(settings, "STATIC_SENDFILE", "x-accel-redirect")
+    url, _ = blob_file
+    response = client.request(method, url)
+    assert response.status_code == 200
+    assert response.headers["x-accel-redirect"] == "/_static/" + url.removeprefix("/static/")
+    assert response.headers["etag"]
+    # Gövdeyi ön sunucu gönderir
+    assert response.content == b""
+
+    # Koşullu istekler yine uygulamada yanıtlanır
+    etag = response.headers["etag"]
+    assert client.request(method, url, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_x_sendfile_mode(client, blob_file, monkeypatch):
+    monkeypatch.setattr(settings, "STATIC_SENDFILE", "x-sendfile")
+    url, _ = blob_file
+    response = client.head(url)
+    assert response.status_code == 200
+    assert os.path.realpath(response.headers["x-sendfile"]) == os.path.realpath(url.lstrip("/"))
+    assert response.content == b""
@@ -0,0 +1,110 @@
+"""Unsplash araması: sahte upstream (httpx.MockTransport), Redis önbelleği ve single-flight"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.main import app
+from app.routers import unsplash
+
+PHOTO = {
+    "id": "abc",
+    "description": "A cat",
+    "alt_description": "cat on a sofa",
+    "width": 4000,
+    "height": 3000,
+    "color": "#aabbcc",
+    "urls": {"thumb": "t", "small": "s", "regular": "r", "full": "f", "raw": "raw"},
+    "user": {"name": "Jane", "username": "jane", "profile_image": {"small": "p"}, "links": {"html": "u"}},
+    "links": {"html": "h", "download": "d"},
+    "likes": 10,
+}
+
+
+class Upstream:
+    """İstekleri kaydeden sahte Unsplash API'si"""
+
+    def __init__(self, status_code: int = 200, body: dict = None, delay: float = 0):
+        self.requests = []
+        self.status_code = status_code
+        self.body = body if body is not None else {"total": 1, "total_pages": 1, "results": [PHOTO]}
+        self.delay = delay
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return httpx.Response(self.status_code, json=self.body)
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Uygulamanın paylaşılan HTTP istemcisini sahte transport'lu istemciyle değiştir"""
+    fake = Upstream()
+    monkeypatch.setattr(settings, "UNSPLASH_ACCESS_KEY", "test-key", raising=False)
+    http_client = unsplash.create_http_client(transport=httpx.MockTransport(fake))
+    app.dependency_overrides[unsplash.get_http_client] = lambda: http_client
+    yield fake
+    app.dependency_overrides.pop(unsplash.get_http_client, None)
+    asyncio.run(http_client.aclose())
+
+
+def test_search_is_trimmed_and_cached(client, upstream):
+    first = client.get("/unsplash/search", params={"query": "Cats", "orientation": "portrait"})
+    assert first.status_code == 200
+    assert first.json() == {
+        "total": 1,
+        "total_pages": 1,
+        "results": [
+            {
+                "id": "abc",
+                "description": "A cat",
+                "alt_description": "cat on a sofa",
+                "width": 4000,
+                "height": 3000,
+                "color": "#aabbcc",
+                "urls": {"thumb": "t", "small": "s", "regular": "r", "full": "f"},
+                "user": {"name": "Jane", "username": "jane", "profile_image": "p", "links": "u"},
+                "links": {"html": "h"},
+            }
+        ],
+    }
+    second = client.get("/unsplash/search", params={"query": "cats ", "orientation": "portrait"})
+    assert second.json() == first.json()
+
+    assert len(upstream.requests) == 1
+    request = upstream.requests[0]
+    assert request.url.path == "/search/photos"
+    assert dict(request.url.params) == {"query": "Cats", "page": "1", "per_page": "15", "orientation": "portrait"}
+    assert request.headers["Authorization"] == "Client-ID test-key"
+
+
+def test_upstream_error_is_passed_through_and_not_cached(client, upstream):
+    upstream.status_code = 401
+    upstream.body = {"errors": ["OAuth error: The access token is invalid"]}
+    response = client.get("/unsplash/search", params={"query": "dogs"})
+    assert response.status_code == 401
+    assert "access token is invalid" in response.json()["detail"]
+
+    upstream.status_code = 200
+    upstream.body = {"total": 0, "total_pages": 0, "results": []}
+    assert client.get("/unsplash/search", params={"query": "dogs"}).status_code == 200
+    assert len(upstream.requests) == 2
+
+
+def test_concurrent_identical_searches_share_one_upstream_call(client, upstream):
+    upstream.delay = 0.1
+    concurrency = 10
+
+    async def search_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await asyncio.gather(
+                *(http.get("/unsplash/search", params={"query": "birds"}) for _ in range(concurrency))
+            )
+
+    responses = asyncio.run(search_all())
+    assert [r.status_code for r in responses] == [200] * concurrency
+    assert all(r.json() == responses[0].json() for r in responses)
+    assert len(upstream.requests) == 1
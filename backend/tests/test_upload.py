@@ -0,0 +1,77 @@
+"""Yüklemelerde saklanan Content-Type ve GIF doğrulaması"""
+import hashlib
+import io
+import uuid
+
+import pytest
+from PIL import Image
+
+from app.routers import upload
+from app.storage import get_storage
+from tests.factories import auth_headers
+
+
+class RecordingStorage:
+    """Gerçek depoya devreden, save/presign çağrılarındaki Content-Type'ı kaydeden sarmalayıcı"""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.content_types = []
+
+    def save(self, key, source, content_type=None):
+        self.content_types.append(content_type)
+        return self.inner.save(key, source, content_type)
+
+    def presign_upload(self, key, size, sha256, content_type):
+        self.content_types.append(content_type)
+        return {"url": "https://storage.example/" + key, "fields": {}}
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    recording = RecordingStorage(get_storage())
+    monkeypatch.setattr(upload, "get_storage", lambda: recording)
+    return recording
+
+
+def _gif_bytes() -> bytes:
+    buffer = io.BytesIO()
+    # Her testte farklı içerik; aynı özet tekrar kullanılmasın
+    Image.new("P", (4, 4), color=uuid.uuid4().int % 256).save(buffer, "GIF")
+    return buffer.getvalue() + uuid.uuid4().bytes
+
+
+def test_gif_is_stored_with_derived_content_type(client, author, storage):
+    files = {"file": ("anim.gif", _gif_bytes(), "text/html")}
+    response = client.post("/upload/image", files=files, headers=auth_headers(author))
+    assert response.status_code == 200
+    assert storage.content_types == ["image/gif"]
+
+
+def test_fake_gif_is_rejected(client, author, storage):
+    files = {"file": ("evil.gif", b"<script>alert(1)</script>" + uuid.uuid4().bytes, "image/gif")}
+    response = client.post("/upload/image", files=files, headers=auth_headers(author))
+    assert response.status_code == 400
+    assert storage.content_types == []
+
+
+def test_file_content_type_ignores_client_value(client, author, storage):
+    files = {"file": ("doc.pdf", b"%PDF-1.4 " + uuid.uuid4().bytes, "text/html")}
+    response = client.post("/upload/file", files=files, headers=auth_headers(author))
+    assert response.status_code == 200
+    assert storage.content_types == ["application/pdf"]
+
+
+def test_direct_upload_signs_derived_content_type(client, author, storage):
+    payload = {
+        "filename": "notes.txt",
+        "size": 10,
+        "sha256": hashlib.sha256(uuid.uuid4().bytes).hexdigest(),
+        "content_type": "text/html",
+    }
+    response = client.post("/upload/direct", json=payload, headers=auth_headers(author))
+    assert response.status_code == 200
+    assert storage.content_types == ["text/plain"]
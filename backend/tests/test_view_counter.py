@@ -0,0 +1,63 @@
+import pytest
+
+from app import view_counter
+from app.cache import cache_get_json, post_cache_key, redis_client
+from app.models.blog import BlogPost
+from tests.factories import create_post
+
+
+def _views(db, post_id: int) -> int:
+    db.expire_all()
+    return db.get(BlogPost, post_id).views
+
+
+def test_flush_writes_pending_views(db, author):
+    post = create_post(db, author, "Viewed post")
+    assert view_counter.register_view(post.id, "1.2.3.4")
+    assert not view_counter.register_view(post.id, "1.2.3.4")
+    assert view_counter.register_view(post.id, "5.6.7.8")
+
+    assert view_counter.flush_pending_views() == 2
+    assert _views(db, post.id) == 2
+    assert view_counter.pending_views([post.id]) == {}
+
+
+def test_leftover_batch_is_retried_after_failed_flush(db, author, monkeypatch):
+    post = create_post(db, author, "Retried views post")
+    view_counter.register_view(post.id, "1.2.3.4")
+
+    def broken_session():
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(view_counter, "SessionLocal", broken_session)
+    with pytest.raises(RuntimeError):
+        view_counter.flush_pending_views()
+    assert list(redis_client.scan_iter(match=f"{view_counter.BATCH_KEY_PREFIX}*"))
+    # Yazılamayan partideki görüntülenmeler okuyuculardan kaybolmaz
+    assert view_counter.pending_views([post.id]) == {post.id: 1}
+    monkeypatch.undo()
+
+    assert view_counter.flush_pending_views() == 1
+    assert _views(db, post.id) == 1
+    assert not list(redis_client.scan_iter(match=f"{view_counter.BATCH_KEY_PREFIX}*"))
+
+
+def test_get_post_counts_view_once_and_returns_pending_views(client, db, author):
+    post = create_post(db, author, "Pending views post")
+    assert client.get(f"/blog/{post.slug}").json()["views"] == 1
+    assert client.get(f"/blog/{post.slug}").json()["views"] == 1
+    assert client.get("/blog/views", params={"ids": [post.id]}).json() == {str(post.id): 1}
+
+
+def test_flush_keeps_cached_post_and_views_stay_current(client, db, author):
+    post = create_post(db, author, "Cached views post")
+    assert client.get(f"/blog/{post.slug}").json()["views"] == 1
+    cached = cache_get_json(post_cache_key(post.slug))
+    assert cached is not None and "views" not in cached
+
+    assert view_counter.flush_pending_views() == 1
+    assert cache_get_json(post_cache_key(post.slug)) == cached
+
+    view_counter.register_view(post.id, "5.6.7.8")
+    # Önbellekten sunulurken veritabanındaki sayı ve bekleyenler eklenir
+    assert client.get(f"/blog/{post.slug}").json()["views"] == 2